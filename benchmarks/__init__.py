@@ -0,0 +1,4 @@
+#
+# Benchmarks for threading_tools. Run the whole suite with `python -m benchmarks --help` from the
+# repository root, or a single benchmark with `python -m benchmarks.<module>`.
+#
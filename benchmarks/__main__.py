@@ -0,0 +1,76 @@
+#
+# __main__.py
+# Runs the benchmark suite, optionally saving the results and comparing them against a baseline
+#
+# Usage: python -m benchmarks [--quick] [--only NAME] [--output FILE] [--baseline FILE]
+#                             [--tolerance FRACTION]
+#
+
+import argparse
+import sys
+from benchmarks import harness
+from benchmarks import bench_decorators
+from benchmarks import bench_parallel_map
+from benchmarks import bench_process_synchronized_number
+from benchmarks import bench_rate_limiter
+from benchmarks import bench_scaling
+from benchmarks import bench_striped_number
+from benchmarks import bench_synchronized_number
+from benchmarks import bench_synchronized_number_array
+from benchmarks import bench_work_stealing_pool
+
+# name -> (benchmark module, arguments for a full run, arguments for a --quick run)
+BENCHMARKS = [
+    ('synchronized_number', bench_synchronized_number, (8, 20000), (4, 2000)),
+    ('striped_number', bench_striped_number, (32, 20000), (4, 2000)),
+    ('synchronized_number_array', bench_synchronized_number_array, (10000, 256), (1000, 64)),
+    ('process_synchronized_number', bench_process_synchronized_number, (4, 20000), (2, 1000)),
+    ('decorators', bench_decorators, (2000, 50), (200, 5)),
+    ('parallel_map', bench_parallel_map, (20000,), (2000,)),
+    ('rate_limiter', bench_rate_limiter, (8, 20000), (4, 2000)),
+    ('work_stealing_pool', bench_work_stealing_pool, (4000, 8), (400, 4)),
+    ('scaling', bench_scaling, (8, 20000), (2, 1000)),
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Runs the threading_tools benchmark suite.')
+    parser.add_argument('--quick', action='store_true',
+                        help='use small problem sizes, e.g. to check that the suite runs')
+    parser.add_argument('--only', action='append', metavar='NAME',
+                        choices=[name for name, _, _, _ in BENCHMARKS],
+                        help='only run the named benchmark; may be repeated')
+    parser.add_argument('--output', metavar='FILE', help='save the results as JSON to FILE')
+    parser.add_argument('--baseline', metavar='FILE',
+                        help='compare the results against a JSON file saved with --output, and '
+                             'exit with status 1 if any result regressed')
+    parser.add_argument('--tolerance', type=float, default=0.2, metavar='FRACTION',
+                        help='how much worse than the baseline a result may be before it counts '
+                             'as a regression (default: 0.2)')
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, module, full_args, quick_args in BENCHMARKS:
+        if args.only and name not in args.only:
+            continue
+        module_results = module.run(*(quick_args if args.quick else full_args))
+        harness.print_results(module_results)
+        results.extend(module_results)
+
+    if args.output:
+        harness.save(results, args.output)
+
+    if args.baseline:
+        regressions = harness.compare(results, harness.load(args.baseline), args.tolerance)
+        for result, old, change in regressions:
+            sys.stdout.write('REGRESSION {0}: {1:.1f} -> {2:.1f} {3} ({4:+.0%})\n'.format(
+                result.name, old, result.value, result.unit, change))
+        if regressions:
+            return 1
+        sys.stdout.write('No regressions against {0}\n'.format(args.baseline))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
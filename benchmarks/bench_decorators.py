@@ -0,0 +1,73 @@
+#
+# bench_decorators.py
+# Per-call overhead of threaded_fn and process_fn compared to starting a Thread or Process directly
+#
+# Usage: python -m benchmarks.bench_decorators [num_thread_calls] [num_process_calls]
+#
+
+import multiprocessing
+import sys
+import threading
+from benchmarks import harness
+from threading_tools import threaded_fn, process_fn
+
+
+def noop():
+    pass
+
+
+threaded_noop = threaded_fn(noop)
+pooled_noop = threaded_fn(pool='bench_decorators')(noop)
+process_noop = process_fn(noop)
+pooled_process_noop = process_fn(pool='bench_decorators')(noop)
+
+
+def _raw_thread():
+    thread = threading.Thread(target=noop)
+    thread.start()
+    return thread
+
+
+def _raw_process():
+    process = multiprocessing.Process(target=noop)
+    process.start()
+    return process
+
+
+def _microseconds_per_call(start_one, num_calls):
+    def start_and_join():
+        for _ in range(num_calls):
+            start_one().join()
+
+    return harness.best_time(start_and_join) / num_calls * 1e6
+
+
+def _pooled_microseconds_per_call(submit_one, num_calls):
+    def submit_and_wait():
+        for _ in range(num_calls):
+            submit_one().result()
+
+    return harness.best_time(submit_and_wait) / num_calls * 1e6
+
+
+def run(num_thread_calls=2000, num_process_calls=50):
+    return [
+        harness.Result('threading.Thread start+join',
+                       _microseconds_per_call(_raw_thread, num_thread_calls), 'us/call', False),
+        harness.Result('threaded_fn call+join',
+                       _microseconds_per_call(threaded_noop, num_thread_calls), 'us/call', False),
+        harness.Result('threaded_fn(pool) call+result',
+                       _pooled_microseconds_per_call(pooled_noop, num_thread_calls), 'us/call',
+                       False),
+        harness.Result('multiprocessing.Process start+join',
+                       _microseconds_per_call(_raw_process, num_process_calls), 'us/call', False),
+        harness.Result('process_fn call+join',
+                       _microseconds_per_call(process_noop, num_process_calls), 'us/call', False),
+        harness.Result('process_fn(pool) call+result',
+                       _pooled_microseconds_per_call(pooled_process_noop, num_process_calls),
+                       'us/call', False),
+    ]
+
+
+if __name__ == '__main__':
+    harness.print_results(run(*[int(arg) for arg in sys.argv[1:]]))
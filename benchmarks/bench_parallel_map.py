@@ -0,0 +1,48 @@
+#
+# bench_parallel_map.py
+# Throughput of parallel_map at several chunk sizes, compared to a threaded_fn call per item
+#
+# Usage: python -m benchmarks.bench_parallel_map [num_items]
+#
+
+import sys
+from benchmarks import harness
+from threading_tools import parallel_map, threaded_fn
+
+CHUNK_SIZES = [1, 16, 256]
+
+
+def work(value):
+    return value + 1
+
+
+threaded_work = threaded_fn(work)
+
+
+def _thread_per_item(num_items):
+    threads = [threaded_work(i) for i in range(num_items)]
+    for thread in threads:
+        thread.join()
+
+
+def _parallel_map(num_items, chunk_size, ordered):
+    for _ in parallel_map(work, range(num_items), chunk_size=chunk_size, ordered=ordered):
+        pass
+
+
+def run(num_items=20000):
+    results = [harness.Result(
+        'threaded_fn per item', num_items / harness.best_time(lambda: _thread_per_item(num_items)),
+        'items/s', True)]
+
+    for ordered in (True, False):
+        for chunk_size in CHUNK_SIZES:
+            elapsed = harness.best_time(lambda: _parallel_map(num_items, chunk_size, ordered))
+            results.append(harness.Result(
+                'parallel_map chunk_size={0} ordered={1}'.format(chunk_size, ordered),
+                num_items / elapsed, 'items/s', True))
+    return results
+
+
+if __name__ == '__main__':
+    harness.print_results(run(*[int(arg) for arg in sys.argv[1:]]))
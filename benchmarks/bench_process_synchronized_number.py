@@ -0,0 +1,76 @@
+#
+# bench_process_synchronized_number.py
+# Compares cross-process increment throughput of ProcessSynchronizedNumber, a locked
+# multiprocessing.Value and a Manager proxy
+#
+# Usage: python -m benchmarks.bench_process_synchronized_number [num_processes] [increments]
+#
+
+import multiprocessing
+import sys
+from benchmarks import harness
+from threading_tools import ProcessSynchronizedNumber, process_fn
+
+
+@process_fn
+def increment_sync_number(sync_num, num_increments):
+    increment = sync_num.increment
+    for _ in range(num_increments):
+        increment(1)
+
+
+@process_fn
+def increment_value(shared_value, num_increments):
+    lock = shared_value.get_lock()
+    for _ in range(num_increments):
+        with lock:
+            shared_value.value += 1
+
+
+@process_fn
+def increment_proxy(proxy_value, proxy_lock, num_increments):
+    for _ in range(num_increments):
+        with proxy_lock:
+            proxy_value.value += 1
+
+
+def increments_per_second(start_workers, read_value, num_processes, increments_per_process):
+    def start_and_join():
+        processes = [start_workers() for _ in range(num_processes)]
+        for process in processes:
+            process.join()
+
+    elapsed = harness.best_time(start_and_join, repeat=1)
+
+    assert read_value() == num_processes * increments_per_process
+    return num_processes * increments_per_process / elapsed
+
+
+def run(num_processes=4, increments_per_process=20000):
+    n = increments_per_process
+
+    sync_num = ProcessSynchronizedNumber(0)
+    shared_value = multiprocessing.Value('d', 0)
+    manager = multiprocessing.Manager()
+    proxy_value, proxy_lock = manager.Value('d', 0), manager.Lock()
+
+    results = [
+        ('ProcessSynchronizedNumber',
+         increments_per_second(lambda: increment_sync_number(sync_num, n),
+                               lambda: sync_num.value, num_processes, n)),
+        ('multiprocessing.Value',
+         increments_per_second(lambda: increment_value(shared_value, n),
+                               lambda: shared_value.value, num_processes, n)),
+        ('Manager proxy',
+         increments_per_second(lambda: increment_proxy(proxy_value, proxy_lock, n),
+                               lambda: proxy_value.value, num_processes, n)),
+    ]
+    manager.shutdown()
+
+    return [harness.Result('{0} increment processes={1}'.format(name, num_processes), rate,
+                           'ops/s', True)
+            for name, rate in results]
+
+
+if __name__ == '__main__':
+    harness.print_results(run(*[int(arg) for arg in sys.argv[1:]]))
@@ -0,0 +1,38 @@
+#
+# bench_rate_limiter.py
+# Throughput of RateLimiter.try_acquire at increasing thread counts, and its memory footprint
+#
+# Usage: python -m benchmarks.bench_rate_limiter [max_threads] [ops_per_thread]
+#
+
+import sys
+from benchmarks import harness
+from threading_tools import RateLimiter
+
+NUM_INSTANCES = 10000
+
+
+def run(max_threads=8, ops_per_thread=20000):
+    results = []
+    for num_threads in harness.thread_counts(max_threads):
+        # Large enough that every call is granted, so each one refills and takes tokens
+        limiter = RateLimiter(1e9, capacity=1e9)
+
+        def worker():
+            try_acquire = limiter.try_acquire
+            for _ in range(ops_per_thread):
+                try_acquire()
+
+        elapsed = min(harness.time_threads(worker, num_threads) for _ in range(3))
+        results.append(harness.Result(
+            'RateLimiter.try_acquire threads={0}'.format(num_threads),
+            num_threads * ops_per_thread / elapsed, 'ops/s', True))
+
+    size = harness.bytes_per_object(lambda n: [RateLimiter(10) for _ in range(n)], NUM_INSTANCES)
+    if size is not None:
+        results.append(harness.Result('RateLimiter memory', size, 'bytes/instance', False))
+    return results
+
+
+if __name__ == '__main__':
+    harness.print_results(run(*[int(arg) for arg in sys.argv[1:]]))
@@ -0,0 +1,92 @@
+#
+# bench_scaling.py
+# How throughput grows with the number of threads: counters shared by every thread, counters
+# owned by one thread each, and CPU-bound calls run by threaded_fn on a pool. Only a free-threaded
+# build of CPython can run Python code on several cores at once, so only there should the
+# throughput grow with the thread count
+#
+# Usage: python -m benchmarks.bench_scaling [max_threads] [ops_per_thread]
+#
+
+import sys
+from benchmarks import harness
+from threading_tools import SynchronizedNumber, StripedSynchronizedNumber, threaded_fn, \
+    gil_enabled
+
+REPEAT = 3
+
+# Loop iterations in each CPU-bound call, and how many counter increments one call stands for
+WORK_PER_CALL = 2000
+INCREMENTS_PER_CALL = 100
+
+
+def _busy_work():
+    total = 0
+    for i in range(WORK_PER_CALL):
+        total += i
+    return total
+
+
+def _shared_counter(build):
+    def measure(num_threads, ops_per_thread):
+        number = build()
+
+        def worker():
+            increment = number.increment
+            for _ in range(ops_per_thread):
+                increment(1)
+        return harness.time_threads(worker, num_threads)
+    return measure
+
+
+def _counter_per_thread(num_threads, ops_per_thread):
+    numbers = [SynchronizedNumber(0) for _ in range(num_threads)]
+    next_number = iter(numbers)
+
+    def worker():
+        increment = next(next_number).increment
+        for _ in range(ops_per_thread):
+            increment(1)
+    return harness.time_threads(worker, num_threads)
+
+
+def _threaded_fn_calls(num_threads, calls_per_thread):
+    busy_work = threaded_fn(_busy_work, pool='bench_scaling-{0}'.format(num_threads),
+                            pool_size=num_threads)
+
+    def worker():
+        handles = [busy_work() for _ in range(calls_per_thread)]
+        for handle in handles:
+            handle.result()
+    return harness.time_threads(worker, num_threads)
+
+
+# (name, function timing `num_threads` threads doing `num_ops` operations each, the number
+# `ops_per_thread` is divided by to get `num_ops`)
+BENCHMARKS = [
+    ('SynchronizedNumber.increment, shared', _shared_counter(lambda: SynchronizedNumber(0)), 1),
+    ('StripedSynchronizedNumber.increment, shared',
+     _shared_counter(lambda: StripedSynchronizedNumber(0)), 1),
+    ('SynchronizedNumber.increment, one per thread', _counter_per_thread, 1),
+    ('threaded_fn(pool) CPU-bound calls', _threaded_fn_calls, INCREMENTS_PER_CALL),
+]
+
+
+def run(max_threads=8, ops_per_thread=20000):
+    mode = 'GIL' if gil_enabled() else 'free-threaded'
+    results = []
+    for name, measure, divisor in BENCHMARKS:
+        num_ops = max(1, ops_per_thread // divisor)
+        rates = {}
+        for num_threads in harness.thread_counts(max_threads):
+            elapsed = min(measure(num_threads, num_ops) for _ in range(REPEAT))
+            rates[num_threads] = num_threads * num_ops / elapsed
+            results.append(harness.Result('{0} ({1}) threads={2}'.format(name, mode, num_threads),
+                                          rates[num_threads], 'ops/s', True))
+        results.append(harness.Result('{0} ({1}) speedup at threads={2}'.format(
+            name, mode, max_threads), rates[max_threads] / rates[1], 'x', True))
+    return results
+
+
+if __name__ == '__main__':
+    harness.print_results(run(*[int(arg) for arg in sys.argv[1:]]))
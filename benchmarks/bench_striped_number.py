@@ -0,0 +1,41 @@
+#
+# bench_striped_number.py
+# Compares increment throughput of SynchronizedNumber and StripedSynchronizedNumber
+#
+# Usage: python -m benchmarks.bench_striped_number [max_threads] [increments_per_thread]
+#
+
+import sys
+from benchmarks import harness
+from threading_tools import SynchronizedNumber, StripedSynchronizedNumber
+
+
+def increments_per_second(sync_num, num_threads, increments_per_thread):
+    """
+    Runs `num_threads` threads that each increment `sync_num` `increments_per_thread` times.
+
+    :return: The number of increments per second across all threads.
+    """
+    def worker():
+        increment = sync_num.increment
+        for _ in range(increments_per_thread):
+            increment(1)
+
+    elapsed = harness.time_threads(worker, num_threads)
+    assert sync_num.value == num_threads * increments_per_thread
+    return num_threads * increments_per_thread / elapsed
+
+
+def run(max_threads=32, increments_per_thread=20000):
+    results = []
+    for num_threads in harness.thread_counts(max_threads):
+        for cls in (SynchronizedNumber, StripedSynchronizedNumber):
+            rate = increments_per_second(cls(0), num_threads, increments_per_thread)
+            results.append(harness.Result(
+                '{0}.increment threads={1}'.format(cls.__name__, num_threads), rate, 'ops/s',
+                True))
+    return results
+
+
+if __name__ == '__main__':
+    harness.print_results(run(*[int(arg) for arg in sys.argv[1:]]))
@@ -0,0 +1,125 @@
+#
+# bench_synchronized_number.py
+# Throughput of SynchronizedNumber operations at increasing thread counts, of reads with and
+# without optimistic_reads, and of arithmetic expressions, and its memory footprint
+#
+# Usage: python -m benchmarks.bench_synchronized_number [max_threads] [ops_per_thread]
+#
+
+import sys
+from benchmarks import harness
+from threading_tools import SynchronizedNumber, LessThan
+
+NUM_INSTANCES = 10000
+REPEAT = 3
+
+# In the read-mostly benchmark, one operation in this many is a write
+READS_PER_WRITE = 1000
+
+# Expressions evaluated by the arithmetic benchmark
+NUM_EXPRESSIONS = 20000
+
+
+def _increment(sync_num, num_ops):
+    increment = sync_num.increment
+    for _ in range(num_ops):
+        increment(1)
+
+
+def _increment_if_less_than(sync_num, num_ops):
+    increment_if_less_than = sync_num.increment_if_less_than
+    for _ in range(num_ops):
+        increment_if_less_than(1, sys.maxsize)
+
+
+def _increment_if_satisfies_condition(sync_num, num_ops):
+    condition = LessThan(sys.maxsize)
+    increment_if_satisfies_condition = sync_num.increment_if_satisfies_condition
+    for _ in range(num_ops):
+        increment_if_satisfies_condition(1, condition)
+
+
+def _iadd(sync_num, num_ops):
+    for _ in range(num_ops):
+        sync_num += 1
+
+
+def _read_mostly(sync_num, num_ops):
+    get = sync_num.get
+    increment = sync_num.increment
+    for i in range(num_ops):
+        if i % READS_PER_WRITE:
+            get()
+        else:
+            increment(1)
+
+
+def _time_read_mostly(optimistic_reads, num_threads, ops_per_thread):
+    sync_num = SynchronizedNumber(0, optimistic_reads=optimistic_reads)
+    return harness.time_threads(lambda: _read_mostly(sync_num, ops_per_thread), num_threads)
+
+
+def _snapshot_expressions(sync_num, num_expressions):
+    for _ in range(num_expressions):
+        (sync_num * 2 + 1) / 3 - sync_num
+
+
+def _promoted_expressions(sync_num, num_expressions):
+    # What the operators cost when each of them built a new SynchronizedNumber
+    for _ in range(num_expressions):
+        (SynchronizedNumber(SynchronizedNumber(SynchronizedNumber(sync_num.value * 2).value + 1)
+                            .value / 3).value - sync_num.value)
+
+
+def _time_operation(operation, num_threads, ops_per_thread):
+    sync_num = SynchronizedNumber(0)
+    elapsed = harness.time_threads(lambda: operation(sync_num, ops_per_thread), num_threads)
+    assert sync_num.value == num_threads * ops_per_thread
+    return elapsed
+
+
+OPERATIONS = [
+    ('increment', _increment),
+    ('increment_if_less_than', _increment_if_less_than),
+    ('increment_if_satisfies_condition', _increment_if_satisfies_condition),
+    ('+=', _iadd),
+]
+
+
+def run(max_threads=8, ops_per_thread=20000):
+    results = []
+    for name, operation in OPERATIONS:
+        for num_threads in harness.thread_counts(max_threads):
+            elapsed = min(_time_operation(operation, num_threads, ops_per_thread)
+                          for _ in range(REPEAT))
+            results.append(harness.Result(
+                'SynchronizedNumber.{0} threads={1}'.format(name, num_threads),
+                num_threads * ops_per_thread / elapsed, 'ops/s', True))
+
+    for name, optimistic_reads in (('locked', False), ('optimistic_reads', True)):
+        for num_threads in harness.thread_counts(max_threads):
+            elapsed = min(_time_read_mostly(optimistic_reads, num_threads, ops_per_thread)
+                          for _ in range(REPEAT))
+            results.append(harness.Result(
+                'SynchronizedNumber.get ({0}, read-mostly) threads={1}'.format(name, num_threads),
+                num_threads * ops_per_thread / elapsed, 'ops/s', True))
+
+    sync_num = SynchronizedNumber(10.0)
+    for name, expressions in (('NumberSnapshot', _snapshot_expressions),
+                              ('SynchronizedNumber', _promoted_expressions)):
+        elapsed = harness.best_time(lambda: expressions(sync_num, NUM_EXPRESSIONS), REPEAT)
+        results.append(harness.Result('(x * 2 + 1) / 3 - x with {0} results'.format(name),
+                                      NUM_EXPRESSIONS / elapsed, 'expressions/s', True))
+
+    size = harness.bytes_per_object(lambda n: [SynchronizedNumber(0.0) for _ in range(n)],
+                                    NUM_INSTANCES)
+    if size is not None:
+        results.append(harness.Result('SynchronizedNumber memory', size, 'bytes/instance', False))
+        size = harness.bytes_per_object(lambda n: [sync_num + 1.0 for _ in range(n)],
+                                        NUM_INSTANCES)
+        results.append(harness.Result('NumberSnapshot memory', size, 'bytes/instance', False))
+    return results
+
+
+if __name__ == '__main__':
+    harness.print_results(run(*[int(arg) for arg in sys.argv[1:]]))
@@ -0,0 +1,66 @@
+#
+# bench_synchronized_number_array.py
+# Compares memory per counter and bulk-update throughput of SynchronizedNumberArray against lists
+# of separate SynchronizedNumber and CompactSynchronizedNumber objects
+#
+# Usage: python -m benchmarks.bench_synchronized_number_array [num_counters] [batch_size]
+#
+
+import random
+import sys
+from benchmarks import harness
+from threading_tools import SynchronizedNumber, CompactSynchronizedNumber, SynchronizedNumberArray
+
+NUM_BATCHES = 200
+
+
+def build_list(num_counters):
+    return [SynchronizedNumber(0.0) for _ in range(num_counters)]
+
+
+def build_compact_list(num_counters):
+    return [CompactSynchronizedNumber(0.0) for _ in range(num_counters)]
+
+
+def build_array(num_counters):
+    return SynchronizedNumberArray(num_counters)
+
+
+def run(num_counters=10000, batch_size=256):
+    results = []
+    for name, build in (('list of SynchronizedNumber', build_list),
+                        ('list of CompactSynchronizedNumber', build_compact_list),
+                        ('SynchronizedNumberArray', build_array)):
+        size = harness.bytes_per_object(build, num_counters)
+        if size is not None:
+            results.append(harness.Result('{0} memory'.format(name), size, 'bytes/counter', False))
+
+    batches = []
+    for _ in range(NUM_BATCHES):
+        indices = [random.randrange(num_counters) for _ in range(batch_size)]
+        batches.append((indices, [1.0] * batch_size))
+
+    def list_updater(counter_list):
+        def update_list(indices, amounts):
+            for index, amount in zip(indices, amounts):
+                counter_list[index].increment(amount)
+        return update_list
+
+    counter_array = build_array(num_counters)
+
+    for name, update in (('list of SynchronizedNumber', list_updater(build_list(num_counters))),
+                         ('list of CompactSynchronizedNumber',
+                          list_updater(build_compact_list(num_counters))),
+                         ('SynchronizedNumberArray', counter_array.increment)):
+        def apply_batches():
+            for indices, amounts in batches:
+                update(indices, amounts)
+
+        elapsed = harness.best_time(apply_batches)
+        results.append(harness.Result('{0} bulk increment'.format(name),
+                                      NUM_BATCHES * batch_size / elapsed, 'updates/s', True))
+    return results
+
+
+if __name__ == '__main__':
+    harness.print_results(run(*[int(arg) for arg in sys.argv[1:]]))
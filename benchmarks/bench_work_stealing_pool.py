@@ -0,0 +1,65 @@
+#
+# bench_work_stealing_pool.py
+# Tail latency of urgent calls mixed with a backlog of calls of widely varying length, on a
+# ThreadPool and on a WorkStealingPool that runs the urgent calls first
+#
+# Usage: python -m benchmarks.bench_work_stealing_pool [num_calls] [pool_size]
+#
+
+import random
+import sys
+import time
+from benchmarks import harness
+from threading_tools import ThreadPool, WorkStealingPool
+
+# One call in this many is urgent
+URGENT_EVERY = 20
+
+
+def _started(submitted):
+    return harness._now() - submitted
+
+
+def _measure(pool, num_calls, submit_urgent):
+    # Background calls sleep for between 0 and 2ms, with the occasional 20ms straggler
+    rng = random.Random(0)
+    urgent = []
+    background = []
+    for i in range(num_calls):
+        if i % URGENT_EVERY == 0:
+            urgent.append(submit_urgent(_started, harness._now()))
+        else:
+            duration = 0.02 if rng.random() < 0.02 else rng.random() * 0.002
+            background.append(pool.submit(time.sleep, duration))
+    latencies = sorted(handle.result() for handle in urgent)
+    for handle in background:
+        handle.wait()
+    pool.shutdown()
+    return latencies
+
+
+def _percentile(values, fraction):
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run(num_calls=4000, pool_size=8):
+    thread_pool = ThreadPool(pool_size)
+    work_stealing_pool = WorkStealingPool(pool_size)
+    measurements = [
+        ('ThreadPool', _measure(thread_pool, num_calls, thread_pool.submit)),
+        ('WorkStealingPool', _measure(work_stealing_pool, num_calls,
+                                      lambda *args: work_stealing_pool.submit_with_priority(
+                                          10, *args))),
+    ]
+
+    results = []
+    for name, latencies in measurements:
+        for label, fraction in [('p50', 0.5), ('p99', 0.99)]:
+            results.append(harness.Result(
+                '{0} urgent call {1} start latency'.format(name, label),
+                _percentile(latencies, fraction) * 1000, 'ms', False))
+    return results
+
+
+if __name__ == '__main__':
+    harness.print_results(run(*[int(arg) for arg in sys.argv[1:]]))
@@ -0,0 +1,144 @@
+#
+# harness.py
+# Shared helpers for timing benchmarks, reporting results and comparing them against a baseline
+#
+
+import collections
+import json
+import platform
+import sys
+import threading
+import time
+from threading_tools import gil_enabled
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+_now = getattr(time, 'perf_counter', time.time)
+
+# A single measurement. `higher_is_better` is True for rates and False for costs, and decides which
+# direction counts as a regression.
+Result = collections.namedtuple('Result', ['name', 'value', 'unit', 'higher_is_better'])
+
+
+def thread_counts(max_threads):
+    """
+    :return: 1, 2, 4, ... up to and including `max_threads`.
+    """
+    counts = []
+    num_threads = 1
+    while num_threads < max_threads:
+        counts.append(num_threads)
+        num_threads *= 2
+    counts.append(max_threads)
+    return counts
+
+
+def time_threads(target, num_threads):
+    """
+    Starts `num_threads` threads running `target`, releases them at the same moment and waits for
+    all of them to finish.
+
+    :return: The number of seconds between releasing the threads and the last one finishing.
+    """
+    start_event = threading.Event()
+
+    def worker():
+        start_event.wait()
+        target()
+
+    threads = [threading.Thread(target=worker) for _ in range(num_threads)]
+    for thread in threads:
+        thread.start()
+
+    start = _now()
+    start_event.set()
+    for thread in threads:
+        thread.join()
+    return _now() - start
+
+
+def best_time(fn, repeat=3):
+    """
+    :return: The fastest of `repeat` timed calls to `fn`, in seconds.
+    """
+    best = None
+    for _ in range(repeat):
+        start = _now()
+        fn()
+        elapsed = _now() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bytes_per_object(build, count):
+    """
+    Measures the memory allocated by `build(count)` with `tracemalloc`.
+
+    :return: The number of bytes allocated per object, or None if `tracemalloc` is unavailable
+             (it was added in Python 3.4).
+    """
+    if tracemalloc is None:
+        return None
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = build(count)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    del objects
+    return float(after - before) / count
+
+
+def print_results(results, stream=sys.stdout):
+    for result in results:
+        stream.write('{0:<60} {1:>14.1f} {2}\n'.format(result.name, result.value, result.unit))
+
+
+def to_json(results):
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'gil_enabled': gil_enabled(),
+        'platform': platform.platform(),
+        'results': [result._asdict() for result in results],
+    }
+
+
+def save(results, path):
+    with open(path, 'w') as f:
+        json.dump(to_json(results), f, indent=2, sort_keys=True)
+
+
+def load(path):
+    with open(path) as f:
+        return [Result(**result) for result in json.load(f)['results']]
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compares `results` against `baseline`, matching them by name. Results missing from either side
+    are ignored.
+
+    :param: tolerance - The fraction by which a result may be worse than its baseline before it
+                        counts as a regression, e.g. 0.2 for 20%
+
+    :return: A list of `(result, baseline_value, change)` tuples for every regression, where
+             `change` is the relative change from the baseline value.
+    """
+    baseline_values = dict((result.name, result.value) for result in baseline)
+    regressions = []
+    for result in results:
+        old = baseline_values.get(result.name)
+        if not old:
+            continue
+        change = (result.value - old) / float(old)
+        worse = -change if result.higher_is_better else change
+        if worse > tolerance:
+            regressions.append((result, old, change))
+    return regressions
@@ -39,6 +39,8 @@ setup(
         'License :: OSI Approved :: BSD License',
 
         'Programming Language :: Python :: 2.7',
+        'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: Free Threading :: 2 - Beta',
     ],
 
     # What does your project relate to?
@@ -46,7 +48,7 @@ setup(
 
     # You can just specify the packages manually here if your project is
     # simple. Or you can use find_packages().
-    packages=find_packages(exclude=['contrib', 'docs', 'tests']),
+    packages=find_packages(exclude=['contrib', 'docs', 'tests', 'benchmarks', 'benchmarks.*']),
     install_requires=['nose'],
 
     extras_require={
@@ -0,0 +1,135 @@
+import threading
+import time
+import unittest
+from threading_tools import AsyncSynchronizedNumber, SynchronizedNumber, LessThan, GreaterThan
+from threading_tools import async_threaded_fn, awaitable, threaded_fn
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+NUM_TRIALS = 20
+
+
+@unittest.skipIf(asyncio is None, 'asyncio is not available')
+class TestAsyncSynchronizedNumber(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def run_future(self, future, timeout=5):
+        return self.loop.run_until_complete(asyncio.wait_for(future, timeout))
+
+    def test_operations(self):
+        async_num = AsyncSynchronizedNumber(0)
+
+        assert self.run_future(async_num.increment(5)), 'increment should succeed'
+        assert self.run_future(async_num.decrement(2)), 'decrement should succeed'
+        assert async_num.value == 3, 'Value should be 3. Instead was {0}'.format(async_num)
+        assert self.run_future(async_num.increment_if_less_than(1, 4)), 'The value is below 4'
+        assert not self.run_future(async_num.increment_if_less_than(1, 4)), 'The value is 4'
+        assert not self.run_future(async_num.decrement_if_greater_than(1, 4)), 'The value is 4'
+        assert self.run_future(async_num.decrement_if_greater_than(1, 4, eq_ok=True)), \
+            'eq_ok allows the value to equal 4'
+        assert self.run_future(async_num.operate_if_satisfies_condition(
+            lambda x: x * 10, LessThan(5))), 'The value is below 5'
+        assert async_num.value == 30, 'Value should be 30. Instead was {0}'.format(async_num)
+
+    def test_does_not_block_while_lock_is_held(self):
+        sync_num = SynchronizedNumber(0)
+        async_num = AsyncSynchronizedNumber(number=sync_num)
+        ticks = []
+
+        def tick():
+            ticks.append(None)
+            if len(ticks) < 1000:
+                self.loop.call_soon(tick)
+
+        with sync_num.transaction():
+            future = async_num.increment(1)
+            self.loop.call_soon(tick)
+            self.loop.run_until_complete(asyncio.sleep(0.05))
+            assert not future.done(), 'The increment cannot finish while the lock is held'
+
+        assert self.run_future(future), 'The increment should finish once the lock is released'
+        assert sync_num == 1, 'Value should be 1. Instead was {0}'.format(sync_num)
+        assert len(ticks) > 1, 'The event loop should keep running while the lock is held'
+
+    def test_lock_timeout(self):
+        sync_num = SynchronizedNumber(0)
+        async_num = AsyncSynchronizedNumber(number=sync_num)
+
+        with sync_num.transaction():
+            assert not self.run_future(async_num.increment(1, timeout=0.02)), \
+                'The increment should time out while the lock is held'
+        assert sync_num == 0, 'Value should be 0. Instead was {0}'.format(sync_num)
+
+    def test_wait_until_changed_by_thread(self):
+        for _ in range(NUM_TRIALS):
+            sync_num = SynchronizedNumber(0)
+            async_num = AsyncSynchronizedNumber(number=sync_num)
+
+            @threaded_fn
+            def increment_later():
+                time.sleep(0.001)
+                sync_num.increment(10)
+
+            future = async_num.wait_until(GreaterThan(5))
+            increment_later()
+            assert self.run_future(future), 'wait_until should return True once the value is 10'
+
+    def test_when_operations_are_exclusive(self):
+        for _ in range(NUM_TRIALS):
+            async_num = AsyncSynchronizedNumber(0)
+            futures = [async_num.decrement_when_greater_than(1, 0) for _ in range(10)]
+
+            @threaded_fn
+            def increment_many():
+                for _ in range(10):
+                    async_num.number.increment(1)
+
+            increment_many()
+            results = self.run_future(asyncio.gather(*futures))
+            assert results == [True] * 10, 'Every decrement should succeed'
+            assert async_num.value == 0, 'Value should be 0. Instead was {0}'.format(async_num)
+            assert not async_num.number._waiters, 'No waiters should be left behind'
+
+    def test_when_timeout_unregisters_waiter(self):
+        async_num = AsyncSynchronizedNumber(0)
+        abandoned = async_num.decrement_when_greater_than(1, 0, timeout=0.01)
+        assert not self.run_future(abandoned), 'The decrement should time out'
+        assert not async_num.number._waiters, 'The abandoned waiter should be unregistered'
+
+        waiting = async_num.decrement_when_greater_than(1, 0)
+        assert self.run_future(async_num.increment(1)), 'increment should succeed'
+        assert self.run_future(waiting), 'The remaining waiter should be woken'
+        assert async_num.value == 0, 'Value should be 0. Instead was {0}'.format(async_num)
+
+    def test_async_threaded_fn(self):
+        main_thread = threading.current_thread()
+
+        @async_threaded_fn
+        def blocking_add(arg0, arg1):
+            assert main_thread != threading.current_thread(), 'Should run on a worker thread'
+            time.sleep(0.01)
+            return arg0 + arg1
+
+        @async_threaded_fn(pool='test-async')
+        def blocking_fail():
+            raise ValueError('Intentional failure')
+
+        assert self.run_future(blocking_add(2, 3)) == 5, 'Result should be 5'
+        self.assertRaises(ValueError, self.run_future, blocking_fail())
+
+    def test_awaitable_thread(self):
+        @threaded_fn
+        def add(arg0, arg1):
+            return arg0 + arg1
+
+        assert self.run_future(awaitable(add(2, 3))) == 5, 'Result should be 5'
@@ -0,0 +1,114 @@
+import unittest
+import threading
+from threading_tools import SynchronizedNumber, LockAcquisitionException, GreaterThan
+from threading_tools import atomic, transfer
+
+NUM_TRIALS = 500
+
+
+class TestAtomicOperations(unittest.TestCase):
+
+    def test_transfer(self):
+        for i in range(NUM_TRIALS):
+            reserved = SynchronizedNumber(100.0)
+            used = SynchronizedNumber(0.0)
+            has_capacity = GreaterThan(60, eq_ok=True)
+
+            thread1 = threading.Thread(target=transfer, args=(reserved, used, 60, has_capacity))
+            thread2 = threading.Thread(target=transfer, args=(reserved, used, 60, has_capacity))
+
+            # Start the threads
+            thread1.start()
+            thread2.start()
+
+            # Wait on the threads
+            thread1.join()
+            thread2.join()
+
+            assert reserved == 40, 'Trial {0}: reserved is {1} but must be 40'.format(i, reserved)
+            assert used == 60, 'Trial {0}: used is {1} but must be 60'.format(i, used)
+
+    def test_opposite_lock_order_does_not_deadlock(self):
+        for i in range(NUM_TRIALS):
+            num1 = SynchronizedNumber(100.0)
+            num2 = SynchronizedNumber(100.0)
+
+            thread1 = threading.Thread(target=transfer, args=(num1, num2, 10))
+            thread2 = threading.Thread(target=transfer, args=(num2, num1, 30))
+
+            # Start the threads
+            thread1.start()
+            thread2.start()
+
+            # Wait on the threads
+            thread1.join()
+            thread2.join()
+
+            assert num1 == 120, 'Trial {0}: num1 is {1} but must be 120'.format(i, num1)
+            assert num2 == 80, 'Trial {0}: num2 is {1} but must be 80'.format(i, num2)
+
+    def test_transfer_condition_not_satisfied(self):
+        src = SynchronizedNumber(10.0)
+        dst = SynchronizedNumber(0.0)
+
+        assert not transfer(src, dst, 20, GreaterThan(20, eq_ok=True)), 'transfer should fail'
+        assert src == 10 and dst == 0, 'src is {0} and dst is {1}'.format(src, dst)
+
+    def test_atomic_compare_across(self):
+        num1 = SynchronizedNumber(10.0)
+        num2 = SynchronizedNumber(20.0)
+
+        with atomic(num1, num2) as (tx1, tx2):
+            if tx1.value < tx2.value:
+                tx1.set_value(tx2.value)
+
+        assert num1 == 20, 'num1 is {0} but must be 20'.format(num1)
+        assert not num1._lock.locked() and not num2._lock.locked(), 'The locks should be released'
+
+    def test_atomic_rollback(self):
+        num1 = SynchronizedNumber(10.0)
+        num2 = SynchronizedNumber(20.0)
+
+        try:
+            with atomic(num1, num2, num1) as (tx1, tx2, tx1_again):
+                assert tx1 is tx1_again, 'A repeated number should yield the same transaction'
+                tx1.increment(5)
+                tx2.increment(5)
+                raise ValueError('Abort the atomic operation')
+        except ValueError:
+            pass
+
+        assert num1 == 10 and num2 == 20, 'num1 is {0} and num2 is {1}'.format(num1, num2)
+        assert not num1._lock.locked() and not num2._lock.locked(), 'The locks should be released'
+
+    def test_non_blocking_atomic(self):
+        num1 = SynchronizedNumber(10.0, should_block_thread=False)
+        num2 = SynchronizedNumber(20.0, should_block_thread=False)
+
+        num2._lock.acquire()
+        try:
+            self.assertRaises(LockAcquisitionException, atomic(num1, num2).__enter__)
+            assert not transfer(num1, num2, 5), 'transfer should fail'
+        finally:
+            num2._lock.release()
+
+        assert not num1._lock.locked(), 'num1 should have been released'
+        assert num1 == 10 and num2 == 20, 'num1 is {0} and num2 is {1}'.format(num1, num2)
+
+    def test_atomic_timeout(self):
+        num1 = SynchronizedNumber(10.0)
+        num2 = SynchronizedNumber(20.0)
+
+        num2._lock.acquire()
+        try:
+            try:
+                atomic(num1, num2, timeout=0.02).__enter__()
+                assert False, 'Exception was not thrown, but it should have been thrown'
+            except LockAcquisitionException as e:
+                assert e.waited == 0.02, 'The exception should record the 0.02s wait'
+            assert not transfer(num1, num2, 5, timeout=0.02), 'transfer should time out'
+        finally:
+            num2._lock.release()
+
+        assert not num1._lock.locked(), 'num1 should have been released'
+        self.assertRaises(TypeError, atomic, num1, num2, timeuot=1)
@@ -0,0 +1,75 @@
+import unittest
+import threading
+from threading_tools import CompactSynchronizedNumber, SynchronizedNumber, atomic, transfer
+from threading_tools import compact_synchronized_number
+
+NUM_TRIALS = 2400
+
+
+def make_sharing_pair():
+    """
+    :return: Two compact numbers that share a lock.
+    """
+    first = CompactSynchronizedNumber(0)
+    numbers = [CompactSynchronizedNumber(0)
+               for _ in range(compact_synchronized_number.NUM_LOCK_STRIPES)]
+    second = numbers[-1]
+    assert first._lock is second._lock, 'The numbers should share a lock'
+    return first, second
+
+
+class TestCompactSynchronizedNumber(unittest.TestCase):
+
+    def test_increment(self):
+        counters = [CompactSynchronizedNumber(0) for _ in range(8)]
+
+        def worker():
+            for i in range(NUM_TRIALS):
+                counters[i % len(counters)].increment(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        expected = 4 * NUM_TRIALS // len(counters)
+        for counter in counters:
+            assert counter == expected, 'counter is {0} but must be {1}'.format(counter, expected)
+
+    def test_no_instance_dict(self):
+        for number in (CompactSynchronizedNumber(0), SynchronizedNumber(0)):
+            assert not hasattr(number, '__dict__'), \
+                '{0} should keep its fields in __slots__'.format(type(number).__name__)
+        assert CompactSynchronizedNumber(0)._waiters == (), 'No waiter list should be allocated'
+
+    def test_atomic_with_a_shared_lock(self):
+        first, second = make_sharing_pair()
+        first.set_value(10)
+
+        with atomic(first, second) as (first_tx, second_tx):
+            first_tx.decrement(4)
+            second_tx.increment(4)
+        assert transfer(second, first, 1), 'transfer should take the shared lock once'
+
+        assert first == 7 and second == 3, 'The numbers are {0} and {1}'.format(first, second)
+        assert not first._lock.locked(), 'The shared lock should have been released'
+
+    def test_waiters(self):
+        first, second = make_sharing_pair()
+        results = []
+
+        def consumer():
+            results.append(first.decrement_when_greater_than(1, 0, timeout=5))
+
+        thread = threading.Thread(target=consumer)
+        thread.start()
+        while not first._waiters:
+            pass
+        second.increment(1)
+        first.increment(1)
+        thread.join()
+
+        assert results == [True], 'The consumer should have been woken. results are {0}'.format(
+            results)
+        assert first == 0 and second == 1, 'The numbers are {0} and {1}'.format(first, second)
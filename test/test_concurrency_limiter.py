@@ -0,0 +1,116 @@
+import threading
+import time
+import unittest
+from threading_tools import ConcurrencyLimiter, ConcurrencyLimitExceededException
+from threading_tools import ThreadPool, threaded_fn
+
+NUM_CALLS = 100
+MAX_IN_FLIGHT = 4
+
+
+class TestConcurrencyLimiter(unittest.TestCase):
+
+    def run_calls(self, limiter, num_calls):
+        lock = threading.Lock()
+        running = [0, 0]  # Calls running now, and the most that have run at once
+
+        def call(value):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.001)
+            with lock:
+                running[0] -= 1
+            return value
+
+        handles = [limiter.submit(call, i) for i in range(num_calls)]
+        results = [handle.result(timeout=10) for handle in handles]
+        return results, running[1]
+
+    def test_block(self):
+        limiter = ConcurrencyLimiter(MAX_IN_FLIGHT)
+        results, max_running = self.run_calls(limiter, NUM_CALLS)
+
+        assert results == list(range(NUM_CALLS)), 'Every call should have run'
+        assert max_running <= MAX_IN_FLIGHT, \
+            '{0} calls ran at once, but the limit is {1}'.format(max_running, MAX_IN_FLIGHT)
+        assert limiter.stats() == (0, 0, 0, NUM_CALLS), 'Stats are {0}'.format(limiter.stats())
+
+    def test_block_timeout(self):
+        event = threading.Event()
+        limiter = ConcurrencyLimiter(1, timeout=0.01)
+        handle = limiter.submit(event.wait)
+
+        self.assertRaises(ConcurrencyLimitExceededException, limiter.submit, event.wait)
+        event.set()
+        handle.wait(5)
+        assert limiter.stats().rejected == 1, 'One call should have been rejected'
+
+    def test_reject(self):
+        event = threading.Event()
+        limiter = ConcurrencyLimiter(2, overflow='reject')
+        handles = [limiter.submit(event.wait) for _ in range(2)]
+
+        for _ in range(3):
+            self.assertRaises(ConcurrencyLimitExceededException, limiter.submit, event.wait)
+        assert limiter.in_flight == 2, 'Two calls should be in flight'
+
+        event.set()
+        for handle in handles:
+            handle.wait(5)
+        assert limiter.stats() == (0, 0, 3, 2), 'Stats are {0}'.format(limiter.stats())
+
+    def test_queue(self):
+        event = threading.Event()
+        limiter = ConcurrencyLimiter(1, overflow='queue', queue_size=3)
+        handles = [limiter.submit(event.wait) for _ in range(4)]
+
+        assert limiter.queue_depth == 3, 'Three calls should be queued'
+        self.assertRaises(ConcurrencyLimitExceededException, limiter.submit, event.wait)
+
+        event.set()
+        for handle in handles:
+            assert handle.wait(5), 'Every queued call should run'
+        assert limiter.stats() == (0, 0, 1, 4), 'Stats are {0}'.format(limiter.stats())
+
+    def test_queue_under_load(self):
+        limiter = ConcurrencyLimiter(MAX_IN_FLIGHT, overflow='queue', queue_size=NUM_CALLS)
+        results, max_running = self.run_calls(limiter, NUM_CALLS)
+
+        assert results == list(range(NUM_CALLS)), 'Every call should have run'
+        assert max_running <= MAX_IN_FLIGHT, \
+            '{0} calls ran at once, but the limit is {1}'.format(max_running, MAX_IN_FLIGHT)
+        assert limiter.stats() == (0, 0, 0, NUM_CALLS), 'Stats are {0}'.format(limiter.stats())
+
+    def test_invalid_options(self):
+        self.assertRaises(ValueError, ConcurrencyLimiter, 0)
+        self.assertRaises(ValueError, ConcurrencyLimiter, 1, overflow='drop')
+        self.assertRaises(ValueError, ConcurrencyLimiter, 1, overflow='queue')
+
+    def test_threaded_fn_max_in_flight(self):
+        event = threading.Event()
+
+        @threaded_fn(max_in_flight=2, overflow='reject')
+        def wait_for_event():
+            event.wait()
+            return 'done'
+
+        handles = [wait_for_event() for _ in range(2)]
+        self.assertRaises(ConcurrencyLimitExceededException, wait_for_event)
+        event.set()
+        assert [handle.result(timeout=5) for handle in handles] == ['done', 'done'], \
+            'Both calls should finish'
+        assert wait_for_event.limiter.stats().rejected == 1, 'One call should be rejected'
+
+    def test_threaded_fn_max_in_flight_with_pool(self):
+        pool = ThreadPool(8, name='test-concurrency')
+
+        @threaded_fn(pool=pool, max_in_flight=2, overflow='queue', queue_size=NUM_CALLS)
+        def double(value):
+            time.sleep(0.001)
+            return value * 2
+
+        handles = [double(i) for i in range(20)]
+        assert [handle.result(timeout=5) for handle in handles] == [i * 2 for i in range(20)], \
+            'Every call should run'
+        pool.shutdown()
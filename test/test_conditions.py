@@ -0,0 +1,27 @@
+import unittest
+from threading_tools import LessThan, GreaterThan, Between
+
+
+class TestConditions(unittest.TestCase):
+
+    def test_less_than(self):
+        assert LessThan(10)(9), '9 should be less than 10'
+        assert not LessThan(10)(10), '10 should not be strictly less than 10'
+        assert LessThan(10, eq_ok=True)(10), '10 should satisfy LessThan(10, eq_ok=True)'
+        assert not LessThan(10, eq_ok=True)(11), '11 should not satisfy LessThan(10, eq_ok=True)'
+
+    def test_greater_than(self):
+        assert GreaterThan(10)(11), '11 should be greater than 10'
+        assert not GreaterThan(10)(10), '10 should not be strictly greater than 10'
+        assert GreaterThan(10, eq_ok=True)(10), '10 should satisfy GreaterThan(10, eq_ok=True)'
+        assert not GreaterThan(10, eq_ok=True)(9), \
+            '9 should not satisfy GreaterThan(10, eq_ok=True)'
+
+    def test_between(self):
+        condition = Between(50, 100)
+        assert condition(75), '75 should be between 50 and 100'
+        assert not condition(50), '50 should not be strictly between 50 and 100'
+        assert not condition(100), '100 should not be strictly between 50 and 100'
+        assert Between(50, 100, lower_eq_ok=True)(50), '50 should satisfy an inclusive lower bound'
+        assert Between(50, 100, upper_eq_ok=True)(100), \
+            '100 should satisfy an inclusive upper bound'
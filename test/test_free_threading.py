@@ -0,0 +1,117 @@
+import sys
+import unittest
+import threading
+from threading_tools import SynchronizedNumber, StripedSynchronizedNumber, \
+    CompactSynchronizedNumber, SynchronizedNumberArray, WorkStealingPool, threaded_fn, \
+    gil_enabled
+
+NUM_THREADS = 8
+OPS_PER_THREAD = 2000
+
+
+def run_threads(target):
+    """
+    Runs `target` on `NUM_THREADS` threads released at the same moment. With the GIL, the switch
+    interval is cut so that threads interleave as often as possible, to approximate the races a
+    free-threaded build would expose.
+    """
+    start = threading.Event()
+    errors = []
+
+    def worker():
+        start.wait()
+        try:
+            target()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(NUM_THREADS)]
+    interval = sys.getswitchinterval() if hasattr(sys, 'getswitchinterval') else None
+    if interval is not None:
+        sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        start.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        if interval is not None:
+            sys.setswitchinterval(interval)
+    return errors
+
+
+class TestFreeThreading(unittest.TestCase):
+
+    def test_gil_enabled(self):
+        is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+        expected = True if is_gil_enabled is None else is_gil_enabled()
+        assert gil_enabled() == expected, 'gil_enabled() should be {0}'.format(expected)
+
+    def test_numbers_under_contention(self):
+        numbers = [SynchronizedNumber(0), SynchronizedNumber(0, optimistic_reads=True),
+                   StripedSynchronizedNumber(0), CompactSynchronizedNumber(0)]
+
+        def target():
+            for _ in range(OPS_PER_THREAD):
+                for number in numbers:
+                    number.increment(1)
+                    # Unlocked and optimistic reads must never fail or see torn values
+                    repr(number)
+                    str(number)
+                    number == 0
+                    assert number.value >= 0, 'An unlocked read saw {0}'.format(number.value)
+
+        errors = run_threads(target)
+        assert not errors, 'Threads raised {0}'.format(errors)
+        expected = NUM_THREADS * OPS_PER_THREAD
+        for number in numbers:
+            assert number == expected, '{0} is {1} but must be {2}'.format(
+                type(number).__name__, number, expected)
+
+    def test_read_modify_return_under_contention(self):
+        sync_num = SynchronizedNumber(0)
+        ids = []
+
+        def target():
+            allocated = [sync_num.get_and_add(1) for _ in range(OPS_PER_THREAD)]
+            ids.extend(allocated)
+
+        errors = run_threads(target)
+        assert not errors, 'Threads raised {0}'.format(errors)
+        assert sorted(ids) == list(range(NUM_THREADS * OPS_PER_THREAD)), \
+            'Every id should be allocated exactly once'
+
+    def test_array_snapshots_under_contention(self):
+        counters = SynchronizedNumberArray(32, num_stripes=4, optimistic_reads=True)
+
+        def target():
+            for _ in range(OPS_PER_THREAD // 10):
+                counters.increment(list(range(32)), 1)
+                snapshot = counters.snapshot()
+                assert len(set(snapshot)) == 1, 'A snapshot saw a bulk update half applied'
+
+        errors = run_threads(target)
+        assert not errors, 'Threads raised {0}'.format(errors)
+        assert counters.snapshot().tolist() == [NUM_THREADS * (OPS_PER_THREAD // 10)] * 32, \
+            'Every update should be kept'
+
+    def test_pools_under_contention(self):
+        pool = WorkStealingPool(4, name='test-free-threading')
+        total = SynchronizedNumber(0)
+
+        @threaded_fn(pool='test-free-threading-threads', pool_size=4)
+        def add(amount):
+            total.increment(amount)
+
+        def target():
+            handles = [pool.submit(total.increment, 1) for _ in range(OPS_PER_THREAD // 10)]
+            handles += [add(1) for _ in range(OPS_PER_THREAD // 10)]
+            for handle in handles:
+                handle.result(timeout=10)
+
+        errors = run_threads(target)
+        pool.shutdown()
+        assert not errors, 'Threads raised {0}'.format(errors)
+        expected = 2 * NUM_THREADS * (OPS_PER_THREAD // 10)
+        assert total == expected, 'total is {0} but must be {1}'.format(total, expected)
@@ -0,0 +1,88 @@
+import unittest
+import threading
+import time
+from threading_tools import SynchronizedNumber, InstrumentedLock, LessThan
+
+NUM_TRIALS = 250
+
+
+class TestInstrumentedLock(unittest.TestCase):
+
+    def test_counts_acquisitions_and_rejections(self):
+        for i in range(NUM_TRIALS):
+            sync_num = SynchronizedNumber(0.0, instrument=True)
+            sync_num.reset_stats()  # Don't count the set_value done by __init__
+
+            thread1 = threading.Thread(target=sync_num.increment_if_less_than, args=(100, 100))
+            thread2 = threading.Thread(target=sync_num.increment_if_less_than, args=(100, 100))
+
+            # Start the threads
+            thread1.start()
+            thread2.start()
+
+            # Wait on the threads
+            thread1.join()
+            thread2.join()
+
+            stats = sync_num.stats()
+            assert stats.acquisitions == 2, \
+                'Trial {0}: acquisitions is {1} but must be 2'.format(i, stats.acquisitions)
+            assert stats.rejections == 1, \
+                'Trial {0}: rejections is {1} but must be 1'.format(i, stats.rejections)
+            assert stats.failed_acquisitions == 0, \
+                'Trial {0}: failed_acquisitions is {1} but must be 0'.format(
+                    i, stats.failed_acquisitions)
+
+    def test_records_failed_acquisitions(self):
+        sync_num = SynchronizedNumber(0.0, should_block_thread=False, instrument=True)
+
+        sync_num._lock.acquire()  # Acquire lock on main thread so others can't acquire it
+        thread = threading.Thread(target=sync_num.increment, args=(1, ))
+        thread.start()
+        thread.join()
+        sync_num._lock.release()
+
+        stats = sync_num.stats()
+        assert stats.failed_acquisitions == 1, \
+            'failed_acquisitions is {0} but must be 1'.format(stats.failed_acquisitions)
+        assert sync_num == 0, 'sync_num is {0} but must be 0'.format(sync_num)
+
+    def test_records_hold_time_of_slow_condition(self):
+        sync_num = SynchronizedNumber(0.0, instrument=True)
+
+        def slow_condition(value):
+            time.sleep(0.02)
+            return True
+
+        sync_num.increment_if_satisfies_condition(1, slow_condition)
+        with sync_num.transaction() as tx:
+            tx.increment_if_satisfies_condition(1, LessThan(0))
+
+        stats = sync_num.stats()
+        assert stats.max_hold_time >= 0.02, \
+            'max_hold_time is {0} but must be at least 0.02'.format(stats.max_hold_time)
+        assert stats.hold_time >= stats.max_hold_time, 'hold_time must include the longest hold'
+        assert stats.rejections == 1, 'rejections is {0} but must be 1'.format(stats.rejections)
+
+    def test_records_wait_time(self):
+        lock = InstrumentedLock()
+
+        lock.acquire()
+        timer = threading.Timer(0.02, lock.release)
+        timer.start()
+        with lock:
+            pass
+        timer.join()
+
+        stats = lock.stats()
+        assert stats.acquisitions == 2, 'acquisitions is {0} but must be 2'.format(
+            stats.acquisitions)
+        assert stats.wait_time >= 0.015, 'wait_time is {0} but must be about 0.02'.format(
+            stats.wait_time)
+        assert not lock.locked(), 'The lock should not be locked. It was.'
+
+    def test_not_instrumented_by_default(self):
+        sync_num = SynchronizedNumber(0.0)
+        assert sync_num.stats() is None, 'An uninstrumented number should have no stats'
+        assert not isinstance(sync_num._lock, InstrumentedLock), \
+            'An uninstrumented number should use a plain lock'
@@ -0,0 +1,79 @@
+import itertools
+import threading
+import time
+import unittest
+from threading_tools import parallel_map, threaded_map, process_map, ThreadPool
+
+NUM_ITEMS = 1000
+
+
+def square(value):
+    return value * value
+
+
+@process_map(chunk_size=10)
+def cube(value):
+    return value ** 3
+
+
+class TestParallelMap(unittest.TestCase):
+
+    def test_ordered(self):
+        for chunk_size in (1, 7, 100, 2000):
+            results = list(parallel_map(square, range(NUM_ITEMS), chunk_size=chunk_size))
+            assert results == [i * i for i in range(NUM_ITEMS)], \
+                'Results are out of order or wrong with chunk_size={0}'.format(chunk_size)
+
+    def test_completion_order(self):
+        def sleep_for(seconds):
+            time.sleep(seconds)
+            return seconds
+
+        pool = ThreadPool(2)
+        results = list(parallel_map(sleep_for, [0.2, 0.01], ordered=False, pool=pool))
+        pool.shutdown()
+        assert results == [0.01, 0.2], 'The faster call should be yielded first, not {0}'.format(
+            results)
+
+        results = sorted(parallel_map(square, range(NUM_ITEMS), chunk_size=9, ordered=False))
+        assert results == [i * i for i in range(NUM_ITEMS)], 'Results are missing or wrong'
+
+    def test_bounded_in_flight(self):
+        lock = threading.Lock()
+        calls = []
+
+        def record(value):
+            with lock:
+                calls.append(value)
+            return value
+
+        # The input is unbounded, so only the bound on in-flight chunks stops it being consumed
+        results = parallel_map(record, itertools.count(), chunk_size=10, max_in_flight=3)
+        first = list(itertools.islice(results, 5))
+        time.sleep(0.05)
+
+        assert first == [0, 1, 2, 3, 4], 'The first results are {0}'.format(first)
+        assert len(calls) <= 40, \
+            'At most 4 chunks should have been dispatched, but {0} calls were made'.format(
+                len(calls))
+
+    def test_exception_is_raised(self):
+        def fail_on_five(value):
+            if value == 5:
+                raise ValueError('Intentional failure')
+            return value
+
+        results = parallel_map(fail_on_five, range(10), chunk_size=2)
+        assert [next(results) for _ in range(4)] == [0, 1, 2, 3], 'The first chunks should succeed'
+        self.assertRaises(ValueError, list, results)
+
+    def test_threaded_map(self):
+        @threaded_map(chunk_size=3)
+        def double(value):
+            return value * 2
+
+        assert list(double(range(10))) == [i * 2 for i in range(10)], 'Results are wrong'
+
+    def test_process_map(self):
+        results = list(cube(range(100)))
+        assert results == [i ** 3 for i in range(100)], 'Results are wrong'
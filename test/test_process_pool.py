@@ -0,0 +1,77 @@
+import multiprocessing
+import os
+import sys
+import unittest
+from threading_tools import ProcessPool, process_fn
+
+NUM_TASKS = 50
+
+
+@process_fn(pool='test-process-pool', pool_size=2)
+def square(value):
+    return value * value
+
+
+@process_fn(pool='test-process-pool')
+def fail():
+    raise ValueError('Intentional failure')
+
+
+def get_pid():
+    return os.getpid()
+
+
+def is_imported(module):
+    return module in sys.modules
+
+
+class TestProcessPool(unittest.TestCase):
+
+    def test_results_are_returned(self):
+        handles = [square(i) for i in range(NUM_TASKS)]
+        results = [handle.result(timeout=30) for handle in handles]
+
+        assert results == [i * i for i in range(NUM_TASKS)], 'Results are {0}'.format(results)
+        assert square.__name__ == 'square', 'The wrapper should keep the name of square'
+
+    def test_exception_is_captured(self):
+        handle = fail()
+        assert isinstance(handle.exception(timeout=30), ValueError), \
+            'The exception should be a ValueError. Instead was {0}'.format(handle.exception())
+        self.assertRaises(ValueError, handle.result)
+        assert square(3).result(timeout=30) == 9, 'The pool should still be usable'
+
+    def test_workers_are_reused(self):
+        pool = ProcessPool(1)
+        pids = set(pool.submit(get_pid).result(timeout=30) for _ in range(10))
+        pool.shutdown()
+
+        assert len(pids) == 1, 'A single worker should run every call, but {0} did'.format(pids)
+        assert os.getpid() not in pids, 'Calls should not run in the parent process'
+
+    def test_workers_are_recycled(self):
+        pool = ProcessPool(1, max_tasks_per_child=2)
+        pids = [pool.submit(get_pid).result(timeout=30) for _ in range(6)]
+        pool.shutdown()
+
+        assert len(set(pids)) == 3, \
+            'Each worker should run 2 calls, so 3 workers should have run, not {0}'.format(pids)
+
+    def test_preload(self):
+        pool = ProcessPool(1, preload=['fractions'])
+        assert pool.submit(is_imported, 'fractions').result(timeout=30), \
+            'fractions should have been imported by the worker'
+        pool.shutdown()
+
+    @unittest.skipIf(not hasattr(multiprocessing, 'get_context'),
+                     'start_method requires Python 3.4+')
+    def test_spawn_start_method(self):
+        pool = ProcessPool(1, start_method='spawn')
+        assert pool.submit(get_pid).result(timeout=60) != os.getpid(), \
+            'Calls should not run in the parent process'
+        pool.shutdown()
+
+    def test_submit_after_shutdown(self):
+        pool = ProcessPool(1)
+        pool.shutdown()
+        self.assertRaises(RuntimeError, pool.submit, get_pid)
@@ -0,0 +1,60 @@
+import unittest
+from threading_tools import ProcessSynchronizedNumber, LessThan, process_fn
+
+NUM_TRIALS = 20
+NUM_INCREMENTS = 500
+
+
+@process_fn
+def increment_many(sync_num, num_increments):
+    for _ in range(num_increments):
+        sync_num.increment(1)
+
+
+@process_fn
+def increment_if_less_than(sync_num, incr_value, limit):
+    sync_num.increment_if_less_than(incr_value, limit)
+
+
+class TestProcessSynchronizedNumber(unittest.TestCase):
+
+    def test_increment_across_processes(self):
+        for i in range(NUM_TRIALS):
+            sync_num = ProcessSynchronizedNumber(0.0)
+
+            process1 = increment_many(sync_num, NUM_INCREMENTS)
+            process2 = increment_many(sync_num, NUM_INCREMENTS)
+
+            # Wait on the processes
+            process1.join()
+            process2.join()
+
+            expected = 2 * NUM_INCREMENTS
+            assert sync_num == expected, \
+                'Trial {0}: sync_num is {1} but must be {2}'.format(i, sync_num, expected)
+
+    def test_increment_if_less_than_across_processes(self):
+        for i in range(NUM_TRIALS):
+            sync_num = ProcessSynchronizedNumber(0.0)
+
+            process1 = increment_if_less_than(sync_num, 100, 100)
+            process2 = increment_if_less_than(sync_num, 100, 100)
+
+            # Wait on the processes
+            process1.join()
+            process2.join()
+
+            assert sync_num == 100, 'Trial {0}: sync_num is {1} but must be 100'.format(i, sync_num)
+
+    def test_synchronized_number_api(self):
+        sync_num = ProcessSynchronizedNumber(10, typecode='l')
+
+        sync_num += 5
+        sync_num *= 2
+        assert sync_num.increment_if_satisfies_condition(1, LessThan(31)), \
+            'increment_if_satisfies_condition should succeed'
+        with sync_num.transaction() as tx:
+            tx.decrement(11)
+
+        assert sync_num == 20, 'sync_num is {0} but must be 20'.format(sync_num)
+        assert isinstance(sync_num.value, int), 'A typecode of "l" should hold an integer'
@@ -0,0 +1,89 @@
+import threading
+import time
+import unittest
+from threading_tools import RateLimiter, RateLimitExceededException, SynchronizedNumber
+from threading_tools import rate_limited, threaded_fn
+
+NUM_THREADS = 8
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_try_acquire_burst(self):
+        limiter = RateLimiter(1, capacity=5)
+
+        granted = [limiter.try_acquire() for _ in range(10)]
+        assert granted == [True] * 5 + [False] * 5, \
+            'Only the first 5 calls fit in the bucket. Instead granted {0}'.format(granted)
+        assert not limiter.try_acquire(), 'The bucket should still be empty'
+        assert limiter.available() < 1, 'Less than one token should be available'
+
+    def test_refill(self):
+        limiter = RateLimiter(100, capacity=2)
+        assert limiter.try_acquire(2), 'The bucket starts full'
+        assert not limiter.try_acquire(), 'The bucket should be empty'
+
+        time.sleep(0.05)
+        assert limiter.try_acquire(2), 'The bucket should have refilled'
+        assert not limiter.try_acquire(3), 'More tokens than the capacity are never available'
+
+    def test_concurrent_try_acquire(self):
+        limiter = RateLimiter(0.001, capacity=100)
+        granted = SynchronizedNumber(0)
+
+        @threaded_fn
+        def take_many():
+            for _ in range(50):
+                if limiter.try_acquire():
+                    granted.increment(1)
+
+        threads = [take_many() for _ in range(NUM_THREADS)]
+        for thread in threads:
+            thread.join()
+
+        assert granted == 100, 'Exactly 100 tokens should be granted, not {0}'.format(granted)
+
+    def test_acquire_waits(self):
+        limiter = RateLimiter(50, capacity=1)
+        start = time.time()
+        for _ in range(6):
+            assert limiter.acquire(), 'acquire without a timeout should always succeed'
+        elapsed = time.time() - start
+
+        assert elapsed >= 0.09, '6 tokens at 50/s from a bucket of 1 take 0.1s, not {0}'.format(
+            elapsed)
+
+    def test_acquire_timeout(self):
+        limiter = RateLimiter(1, capacity=1)
+        assert limiter.acquire(timeout=0), 'The bucket starts full'
+
+        start = time.time()
+        assert not limiter.acquire(timeout=0.1), 'The next token is 1s away'
+        assert time.time() - start < 0.05, 'acquire should give up without waiting'
+        self.assertRaises(ValueError, limiter.acquire, 2)
+
+    def test_rate_limited(self):
+        calls = []
+
+        @rate_limited(RateLimiter(1, capacity=3), timeout=0)
+        def call(value):
+            calls.append(value)
+            return value
+
+        assert [call(i) for i in range(3)] == [0, 1, 2], 'The first 3 calls should go through'
+        self.assertRaises(RateLimitExceededException, call, 3)
+        assert calls == [0, 1, 2], 'The rejected call should not have run'
+
+    def test_rate_limited_dispatch(self):
+        main_thread = threading.current_thread()
+        run_on = []
+
+        @rate_limited(100)
+        @threaded_fn
+        def dispatched():
+            run_on.append(threading.current_thread())
+
+        for thread in [dispatched() for _ in range(5)]:
+            thread.join()
+        assert len(run_on) == 5 and main_thread not in run_on, \
+            'Every call should run on a separate thread'
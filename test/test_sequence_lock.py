@@ -0,0 +1,114 @@
+import unittest
+import threading
+from threading_tools import SequenceLock, SynchronizedNumber, SynchronizedNumberArray, \
+    InstrumentedLock, LockAcquisitionException
+from threading_tools.sequence_lock import read_optimistically
+
+NUM_TRIALS = 250
+
+
+class TestSequenceLock(unittest.TestCase):
+
+    def test_sequence_is_odd_while_held(self):
+        lock = SequenceLock(threading.Lock())
+        assert lock.sequence == 0, 'The sequence should start at 0'
+
+        with lock:
+            assert lock.sequence == 1 and lock.locked(), 'The sequence should be odd while held'
+        assert lock.sequence == 2 and not lock.locked(), 'The sequence should be even once released'
+
+        lock.acquire()
+        assert not lock.acquire(False), 'The lock should not be acquired twice'
+        assert lock.sequence == 3, 'A failed acquisition should not change the sequence'
+        lock.release()
+
+    def test_passes_attributes_through(self):
+        lock = SequenceLock(InstrumentedLock())
+        with lock:
+            lock.record_rejection()
+        stats = lock.stats()
+        assert stats.acquisitions == 1 and stats.rejections == 1, 'Stats are {0}'.format(stats)
+
+    def test_read_optimistically_detects_writers(self):
+        lock = SequenceLock(threading.Lock())
+        assert read_optimistically([lock], lambda: 5) == (5,), 'An idle lock should be read'
+
+        with lock:
+            assert read_optimistically([lock], lambda: 5) is None, \
+                'A held lock should never be read'
+
+        def write_during_read():
+            with lock:
+                pass
+            return 5
+
+        assert read_optimistically([lock], write_during_read) is None, \
+            'A read that overlaps a write should be retried and then given up'
+
+    def test_optimistic_get_never_sees_a_transaction_in_progress(self):
+        sync_num = SynchronizedNumber(0, optimistic_reads=True)
+        seen = []
+        done = threading.Event()
+
+        def reader():
+            while not done.is_set():
+                seen.append(sync_num.get())
+
+        readers = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in readers:
+            thread.start()
+        for _ in range(NUM_TRIALS):
+            with sync_num.transaction() as tx:
+                tx.increment(1)
+                tx.increment(1)
+            sync_num.apply_many([(lambda x: x + 1, None), (lambda x: x + 1, None)])
+        done.set()
+        for thread in readers:
+            thread.join()
+
+        assert seen and all(value % 2 == 0 for value in seen), \
+            'get() saw a transaction half applied'
+        assert sync_num == 4 * NUM_TRIALS, 'sync_num is {0} but must be {1}'.format(
+            sync_num, 4 * NUM_TRIALS)
+
+    def test_optimistic_get_falls_back_to_the_lock(self):
+        sync_num = SynchronizedNumber(10, should_block_thread=False, optimistic_reads=True)
+        assert sync_num._lock.sequence == 2, 'Creating the number should have written it once'
+
+        sync_num._lock.acquire()
+        try:
+            self.assertRaises(LockAcquisitionException, sync_num.get)
+        finally:
+            sync_num._lock.release()
+        assert sync_num.get() == 10, 'get() should read the value once the lock is free'
+
+    def test_optimistic_reads_with_instrumentation(self):
+        sync_num = SynchronizedNumber(0, instrument=True, optimistic_reads=True)
+        sync_num.reset_stats()
+        sync_num.increment_if_less_than(1, 0)
+        sync_num.increment(1)
+
+        assert sync_num.get() == 1, 'sync_num is {0} but must be 1'.format(sync_num)
+        stats = sync_num.stats()
+        assert stats.acquisitions == 2 and stats.rejections == 1, \
+            'Optimistic reads should not acquire the lock. Stats are {0}'.format(stats)
+
+    def test_optimistic_array_snapshot(self):
+        counters = SynchronizedNumberArray(64, num_stripes=4, optimistic_reads=True)
+        snapshots = []
+        done = threading.Event()
+
+        def reader():
+            while not done.is_set():
+                snapshots.append(counters.snapshot())
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        for _ in range(NUM_TRIALS):
+            counters.increment(list(range(64)), 1)
+        done.set()
+        thread.join()
+
+        for snapshot in snapshots:
+            assert len(set(snapshot)) == 1, 'A snapshot saw a bulk update half applied'
+        assert counters.snapshot().tolist() == [NUM_TRIALS] * 64, 'Every update should be kept'
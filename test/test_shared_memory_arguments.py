@@ -0,0 +1,91 @@
+import array
+import os
+import unittest
+from threading_tools import ProcessPool
+
+try:
+    from multiprocessing import shared_memory
+    from threading_tools.shared_memory_arguments import share_arguments, restore_arguments, \
+        close_segments, release_segments
+except ImportError:
+    shared_memory = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+THRESHOLD = 1024
+
+
+def describe(value, scale=1):
+    if numpy is not None and isinstance(value, numpy.ndarray):
+        return 'ndarray', value.shape, float(value.sum()) * scale
+    return type(value).__name__, len(value), sum(bytearray(memoryview(value).cast('B')))
+
+
+def list_segments():
+    # Semaphores, which the pool itself creates, are also listed
+    return set(name for name in os.listdir('/dev/shm') if not name.startswith('sem.'))
+
+
+@unittest.skipIf(shared_memory is None, 'shared memory requires Python 3.8+')
+class TestSharedMemoryArguments(unittest.TestCase):
+
+    def test_small_arguments_are_not_shared(self):
+        args, kwargs, segments = share_arguments((b'small', 5, 'text'), {'data': b'x'},
+                                                 THRESHOLD)
+        assert args == (b'small', 5, 'text') and kwargs == {'data': b'x'}, \
+            'Small arguments should be passed unchanged'
+        assert segments == [], 'No segments should have been created'
+
+    def test_round_trip(self):
+        data = b'a' * THRESHOLD
+        values = array.array('d', range(THRESHOLD))
+        args, kwargs, segments = share_arguments((data, 5), {'values': values}, THRESHOLD)
+        assert len(segments) == 2, 'Both large arguments should be shared'
+
+        restored_args, restored_kwargs, attached = restore_arguments(args, kwargs)
+        assert bytes(restored_args[0]) == data, 'The bytes should be restored'
+        assert restored_args[1] == 5, 'Other arguments should be passed unchanged'
+        restored_values = restored_kwargs['values']
+        assert restored_values.format == 'd' and restored_values.tolist() == values.tolist(), \
+            'The array should be restored with its format'
+
+        del restored_args, restored_kwargs, restored_values
+        close_segments(attached)
+        release_segments(segments)
+        self.assertRaises(FileNotFoundError, shared_memory.SharedMemory, segments[0].name)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_numpy_round_trip(self):
+        matrix = numpy.arange(THRESHOLD, dtype=numpy.float32).reshape(32, 32)[:, ::2]
+        args, kwargs, segments = share_arguments((matrix,), {}, THRESHOLD)
+
+        restored_args, _, attached = restore_arguments(args, kwargs)
+        restored = restored_args[0]
+        assert restored.dtype == matrix.dtype and (restored == matrix).all(), \
+            'A non-contiguous array should be restored with its dtype and values'
+
+        del restored_args, restored
+        close_segments(attached)
+        release_segments(segments)
+
+    @unittest.skipIf(not os.path.isdir('/dev/shm'), 'segments are only listed on Linux')
+    def test_process_pool(self):
+        pool = ProcessPool(1, start_method='spawn', shared_memory_threshold=THRESHOLD)
+        before = list_segments()
+
+        data = bytearray(range(256)) * 16
+        result = pool.submit(describe, data).result(timeout=60)
+        assert result == ('memoryview', len(data), sum(data)), 'Result is {0}'.format(result)
+        assert pool.submit(describe, b'small').result(timeout=60)[0] == 'bytes', \
+            'Small arguments should be passed unchanged'
+
+        if numpy is not None:
+            matrix = numpy.ones((64, 64))
+            result = pool.submit(describe, matrix, scale=2).result(timeout=60)
+            assert result == ('ndarray', (64, 64), 8192.0), 'Result is {0}'.format(result)
+
+        pool.shutdown()
+        assert list_segments() == before, 'Every segment should have been destroyed'
@@ -0,0 +1,138 @@
+import threading
+import time
+import unittest
+from threading_tools import single_flight, threaded_fn, process_fn, SynchronizedNumber
+
+NUM_THREADS = 20
+
+
+@single_flight
+@process_fn(pool='test-single-flight', pool_size=1)
+def square_in_process(value):
+    time.sleep(0.05)
+    return value * value
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_calls_are_coalesced(self):
+        event = threading.Event()
+        num_runs = SynchronizedNumber(0)
+
+        @single_flight
+        def expensive(key):
+            num_runs.increment(1)
+            event.wait()
+            return key * 2
+
+        results = []
+
+        @threaded_fn
+        def call():
+            results.append(expensive(21))
+
+        threads = [call() for _ in range(NUM_THREADS)]
+        while expensive.stats().coalesced < NUM_THREADS - 1:
+            time.sleep(0.001)
+        event.set()
+        for thread in threads:
+            thread.join()
+
+        assert num_runs == 1, 'The function should run once, not {0} times'.format(num_runs)
+        assert results == [42] * NUM_THREADS, 'Every caller should get the result'
+        assert expensive.stats() == (0, 1, NUM_THREADS - 1, 0), \
+            'Stats are {0}'.format(expensive.stats())
+
+        assert expensive(21) == 42, 'Without a cache, a later call should run again'
+        assert num_runs == 2, 'The function should have run twice, not {0} times'.format(num_runs)
+
+    def test_exception_is_shared(self):
+        event = threading.Event()
+
+        @single_flight(cache_size=10)
+        def fail():
+            event.wait()
+            raise ValueError('Intentional failure')
+
+        errors = []
+
+        @threaded_fn
+        def call():
+            try:
+                fail()
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [call() for _ in range(5)]
+        while fail.stats().coalesced < 4:
+            time.sleep(0.001)
+        event.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(errors) == 5, 'Every caller should see the exception'
+        assert fail.stats().size == 0, 'Exceptions should not be cached'
+
+    def test_lru_cache(self):
+        calls = []
+
+        @single_flight(cache_size=2)
+        def double(value, factor=2):
+            calls.append(value)
+            return value * factor
+
+        assert [double(1), double(2), double(1), double(1, factor=3)] == [2, 4, 2, 3], \
+            'Results are wrong'
+        assert calls == [1, 2, 1], 'Calls are {0}'.format(calls)
+
+        # 2 is now the least recently used, so it was evicted by (1, factor=3)
+        double(1)
+        double(2)
+        assert calls == [1, 2, 1, 2], 'Calls are {0}'.format(calls)
+        assert double.stats() == (2, 4, 0, 2), 'Stats are {0}'.format(double.stats())
+
+        double.clear()
+        assert double.stats() == (0, 0, 0, 0), 'Stats are {0}'.format(double.stats())
+
+    def test_ttl(self):
+        calls = []
+
+        @single_flight(ttl=0.05)
+        def identity(value):
+            calls.append(value)
+            return value
+
+        identity(None)
+        identity(None)
+        assert calls == [None], 'The second call should be answered from the cache'
+        time.sleep(0.06)
+        identity(None)
+        assert calls == [None, None], 'The cached result should have expired'
+
+    def test_threaded_fn_handles_are_shared(self):
+        event = threading.Event()
+
+        @single_flight(cache_size=10)
+        @threaded_fn
+        def fetch(key):
+            event.wait()
+            return key.upper()
+
+        first = fetch('a')
+        second = fetch('a')
+        assert first is second, 'Concurrent calls should share one thread'
+        other = fetch('b')
+        assert other is not first, 'Calls with other arguments should not be coalesced'
+
+        event.set()
+        # Joining also waits for the done callbacks, which run on the thread
+        first.join()
+        other.join()
+        assert first.result() == 'A', 'Result should be A'
+        assert fetch('a') is first, 'The finished handle should be cached'
+        assert fetch.stats() == (1, 2, 1, 2), 'Stats are {0}'.format(fetch.stats())
+
+    def test_process_fn_handles_are_shared(self):
+        handles = [square_in_process(7) for _ in range(5)]
+        assert all(handle is handles[0] for handle in handles), 'Calls should share one handle'
+        assert handles[0].result(timeout=30) == 49, 'Result should be 49'
@@ -0,0 +1,125 @@
+import unittest
+import threading
+from threading_tools import StripedSynchronizedNumber, SynchronizedNumber, LockAcquisitionException
+
+NUM_TRIALS = 250
+NUM_THREADS = 8
+NUM_INCREMENTS = 50
+
+
+class TestStripedSynchronizedNumber(unittest.TestCase):
+
+    def test_increment(self):
+        for i in range(NUM_TRIALS):
+            sync_num = StripedSynchronizedNumber(0.0, num_stripes=4)
+
+            def incr_wrapper():
+                for _ in range(NUM_INCREMENTS):
+                    sync_num.increment(1)
+
+            threads = [threading.Thread(target=incr_wrapper) for _ in range(NUM_THREADS)]
+
+            # Start the threads
+            for thread in threads:
+                thread.start()
+
+            # Wait on the threads
+            for thread in threads:
+                thread.join()
+
+            expected = NUM_THREADS * NUM_INCREMENTS
+            assert sync_num == expected, \
+                'Trial {0}: sync_num is {1} but must be {2}'.format(i, sync_num, expected)
+
+    def test_decrement(self):
+        for i in range(NUM_TRIALS):
+            sync_num = StripedSynchronizedNumber(150.0, num_stripes=4)
+
+            thread1 = threading.Thread(target=sync_num.decrement, args=(50, ))
+            thread2 = threading.Thread(target=sync_num.decrement, args=(100, ))
+
+            # Start the threads
+            thread1.start()
+            thread2.start()
+
+            # Wait on the threads
+            thread1.join()
+            thread2.join()
+
+            assert sync_num == 0, 'Trial {0}: sync_num is {1} but must be 0'.format(i, sync_num)
+
+    def test_iadd_isub_success(self):
+        for i in range(NUM_TRIALS):
+            sync_num = StripedSynchronizedNumber(100.0, num_stripes=2)
+
+            def incr_wrapper(sync_num, amt):
+                sync_num += amt
+
+            def decr_wrapper(sync_num, amt):
+                sync_num -= amt
+
+            thread1 = threading.Thread(target=incr_wrapper, args=(sync_num, 50))
+            thread2 = threading.Thread(target=decr_wrapper, args=(sync_num, 25))
+
+            # Start the threads
+            thread1.start()
+            thread2.start()
+
+            # Wait on the threads
+            thread1.join()
+            thread2.join()
+
+            assert sync_num == 125, 'Trial {0}: sync_num is {1} but must be 125'.format(i, sync_num)
+
+    def test_contended_cell_moves_to_another_cell(self):
+        sync_num = StripedSynchronizedNumber(0.0, num_stripes=2, should_block_thread=False)
+
+        # Hold one cell's lock; the increment must land in the other cell instead of failing
+        sync_num._locks[0].acquire()
+        try:
+            assert sync_num.increment(5), 'Increment should succeed using the uncontended cell'
+        finally:
+            sync_num._locks[0].release()
+
+        assert sync_num == 5, 'sync_num is {0} but must be 5'.format(sync_num)
+
+    def test_non_blocking_iadd(self):
+        sync_num = StripedSynchronizedNumber(10.0, num_stripes=2, should_block_thread=False)
+
+        for lock in sync_num._locks:
+            lock.acquire()
+        try:
+            sync_num += 5.0
+            assert False, 'Exception was not thrown, but it should have been thrown'
+        except Exception as e:
+            assert isinstance(e, LockAcquisitionException), \
+                'The exception should be a LockAcquisitionException. Instead was a {0}. {1}' \
+                .format(type(e), e)
+        finally:
+            for lock in sync_num._locks:
+                lock.release()
+
+        assert sync_num == 10, 'sync_num is {0} but must be 10'.format(sync_num)
+
+    def test_set_value_and_consistent_value(self):
+        sync_num = StripedSynchronizedNumber(0.0, num_stripes=4)
+        threads = [threading.Thread(target=sync_num.increment, args=(1, )) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sync_num.consistent_value() == 20, \
+            'sync_num is {0} but must be 20'.format(sync_num.consistent_value())
+        assert sync_num.set_value(7), 'set_value should succeed'
+        assert sync_num.consistent_value() == 7, \
+            'sync_num is {0} but must be 7'.format(sync_num.consistent_value())
+        assert not any(lock.locked() for lock in sync_num._locks), 'No lock should stay locked'
+
+    def test_eq_synchronized_number(self):
+        sync_num = StripedSynchronizedNumber(10.0)
+        assert sync_num == SynchronizedNumber(10.0), 'Equal values should compare equal'
+        assert sync_num != SynchronizedNumber(11.0), 'Different values should not compare equal'
+
+    def test_invalid_num_stripes(self):
+        self.assertRaises(ValueError, StripedSynchronizedNumber, 0.0, 0)
@@ -1,5 +1,5 @@
 import unittest
-from threading_tools import SynchronizedNumber
+from threading_tools import SynchronizedNumber, NumberSnapshot
 
 NUM_TRIALS = 2500
 
@@ -178,3 +178,52 @@ class TestSynchronizedBasicMath(unittest.TestCase):
         res_sync_num = 5 % sync_num1
         assert res_sync_num == 1, 'The sum should be 1. Instead it is {0}'.format(res_sync_num)
         assert res_sync_num is not sync_num1, 'The result obj should not be the divisor obj.'
+
+    #
+    # testing NumberSnapshot
+    #
+
+    def test_operators_return_snapshots(self):
+        sync_num1 = SynchronizedNumber(10.0)
+
+        results = [sync_num1 + 1, 1 + sync_num1, sync_num1 - 1, 1 - sync_num1, sync_num1 * 2,
+                   sync_num1 / 2, sync_num1 ** 2, sync_num1 % 3, -sync_num1]
+        for result in results:
+            assert isinstance(result, NumberSnapshot), \
+                'Operators should return a NumberSnapshot, not {0}'.format(type(result))
+        assert [result.value for result in results] == [11, 11, 9, -9, 20, 5, 100, 1, -10], \
+            'The results are {0}'.format(results)
+
+    def test_snapshot_arithmetic_and_comparisons(self):
+        sync_num1 = SynchronizedNumber(10.0)
+
+        res_snapshot = (sync_num1 * 2 + sync_num1) / 3 - 1
+        assert isinstance(res_snapshot, NumberSnapshot), 'Chained results should be snapshots'
+        assert res_snapshot == 9 and res_snapshot == SynchronizedNumber(9.0), \
+            'The result should be 9. Instead it is {0}'.format(res_snapshot)
+        assert res_snapshot != 10 and 8 < res_snapshot <= 9 and res_snapshot > sync_num1 - 2, \
+            'Snapshots should compare like numbers'
+        assert hash(res_snapshot) == hash(9.0) and float(res_snapshot) == 9.0, \
+            'Snapshots should hash and convert like their value'
+        assert str(res_snapshot) == '9.0', 'str should show the value, not {0}'.format(
+            res_snapshot)
+
+    def test_snapshot_is_immutable(self):
+        res_snapshot = SynchronizedNumber(10.0) + 5
+
+        def assign():
+            res_snapshot.value = 0
+
+        self.assertRaises(AttributeError, assign)
+        assert res_snapshot == 15, 'The snapshot should still be 15, not {0}'.format(res_snapshot)
+
+    def test_promote(self):
+        sync_num1 = SynchronizedNumber(10.0)
+
+        promoted = (sync_num1 + 5).promote(should_block_thread=False)
+        assert isinstance(promoted, SynchronizedNumber), \
+            'promote should return a SynchronizedNumber'
+        assert not promoted.should_block_thread, 'promote should pass its options on'
+        promoted += 5
+        assert promoted == 20 and sync_num1 == 10, 'Only the promoted number should change'
+        assert sync_num1.snapshot() == 10, 'snapshot() should return the current value'
@@ -1,6 +1,7 @@
 import unittest
 import threading
-from threading_tools import SynchronizedNumber, LockAcquisitionException
+import time
+from threading_tools import SynchronizedNumber, LockAcquisitionException, LessThan, GreaterThan
 
 NUM_TRIALS = 2500
 
@@ -470,3 +471,335 @@ class TestSynchronizedNumber(unittest.TestCase):
 
             thread.join()
             sync_num._lock.release()
+
+    def test_increment_if_satisfies_reusable_condition(self):
+        less_than_limit = LessThan(100)
+        for i in range(NUM_TRIALS):
+            sync_num = SynchronizedNumber(0.0)
+
+            thread1 = threading.Thread(
+                target=sync_num.increment_if_satisfies_condition, args=(100, less_than_limit))
+            thread2 = threading.Thread(
+                target=sync_num.increment_if_satisfies_condition, args=(100, less_than_limit))
+
+            # Start the threads
+            thread1.start()
+            thread2.start()
+
+            # Wait on the threads
+            thread1.join()
+            thread2.join()
+
+            assert sync_num == 100, 'Trial {0}: sync_num is {1} but must be 100'.format(i, sync_num)
+
+    def test_apply_many(self):
+        for i in range(NUM_TRIALS):
+            sync_num = SynchronizedNumber(0.0)
+            operations = [(lambda x: x + 10, None), (lambda x: x * 2, LessThan(100))]
+
+            thread1 = threading.Thread(target=sync_num.apply_many, args=(operations, ))
+            thread2 = threading.Thread(target=sync_num.apply_many, args=(operations, ))
+
+            # Start the threads
+            thread1.start()
+            thread2.start()
+
+            # Wait on the threads
+            thread1.join()
+            thread2.join()
+
+            # Each batch is atomic, so the result is ((0 + 10) * 2 + 10) * 2 regardless of order
+            assert sync_num == 60, 'Trial {0}: sync_num is {1} but must be 60'.format(i, sync_num)
+
+    def test_apply_many_results_and_rollback(self):
+        sync_num = SynchronizedNumber(95.0)
+
+        results = sync_num.apply_many([(lambda x: x + 10, LessThan(100)),
+                                       (lambda x: x + 10, LessThan(100))])
+        assert results == [True, False], 'Results are {0} but must be [True, False]'.format(results)
+        assert sync_num == 105, 'sync_num is {0} but must be 105'.format(sync_num)
+
+        self.assertRaises(TypeError, sync_num.apply_many,
+                          [(lambda x: x + 10, None), (lambda x: 'string' + x, None)])
+        assert sync_num == 105, 'sync_num is {0} but must have been rolled back'.format(sync_num)
+        assert not sync_num._lock.locked(), 'The lock should not be locked. It was.'
+
+    def test_non_blocking_apply_many(self):
+        sync_num = SynchronizedNumber(10.0, should_block_thread=False)
+
+        sync_num._lock.acquire()
+        try:
+            results = sync_num.apply_many([(lambda x: x + 10, None)])
+        finally:
+            sync_num._lock.release()
+
+        assert results is None, 'Results are {0} but must be None'.format(results)
+        assert sync_num == 10, 'sync_num is {0} but must be 10'.format(sync_num)
+
+    def test_transaction(self):
+        for i in range(NUM_TRIALS):
+            sync_num = SynchronizedNumber(0.0)
+
+            def transaction_wrapper():
+                with sync_num.transaction() as tx:
+                    tx.increment(50)
+                    tx.imultiply_if_satisfies_condition(2, LessThan(150))
+                    tx.decrement_if_greater_than(100, 0)
+
+            thread1 = threading.Thread(target=transaction_wrapper)
+            thread2 = threading.Thread(target=transaction_wrapper)
+
+            # Start the threads
+            thread1.start()
+            thread2.start()
+
+            # Wait on the threads
+            thread1.join()
+            thread2.join()
+
+            assert sync_num == 0, 'Trial {0}: sync_num is {1} but must be 0'.format(i, sync_num)
+
+    def test_transaction_results_and_rollback(self):
+        sync_num = SynchronizedNumber(10.0)
+
+        with sync_num.transaction() as tx:
+            tx.increment(5)
+            tx.increment_if_less_than(5, 15)
+            tx.set_value(tx.value * 2)
+        assert tx.results == [True, False, True], \
+            'Results are {0} but must be [True, False, True]'.format(tx.results)
+        assert sync_num == 30, 'sync_num is {0} but must be 30'.format(sync_num)
+
+        try:
+            with sync_num.transaction() as tx:
+                tx.increment(5)
+                raise ValueError('Abort the transaction')
+        except ValueError:
+            pass
+        assert sync_num == 30, 'sync_num is {0} but must have been rolled back'.format(sync_num)
+        assert not sync_num._lock.locked(), 'The lock should not be locked. It was.'
+        self.assertRaises(RuntimeError, tx.increment, 5)
+
+    def test_non_blocking_transaction(self):
+        sync_num = SynchronizedNumber(10.0, should_block_thread=False)
+
+        sync_num._lock.acquire()
+        try:
+            self.assertRaises(LockAcquisitionException, sync_num.transaction().__enter__)
+        finally:
+            sync_num._lock.release()
+
+    def test_decrement_when_greater_than(self):
+        for i in range(NUM_TRIALS // 10):
+            sync_num = SynchronizedNumber(0.0)
+            results = []
+
+            def consumer():
+                results.append(sync_num.decrement_when_greater_than(1, 0, eq_ok=False, timeout=5))
+
+            consumers = [threading.Thread(target=consumer) for _ in range(5)]
+
+            # Start the consumers, which block until there is something to consume
+            for thread in consumers:
+                thread.start()
+
+            for _ in range(5):
+                sync_num.increment(1)
+
+            # Wait on the consumers
+            for thread in consumers:
+                thread.join()
+
+            assert results == [True] * 5, 'Trial {0}: results are {1}'.format(i, results)
+            assert sync_num == 0, 'Trial {0}: sync_num is {1} but must be 0'.format(i, sync_num)
+            assert sync_num._waiters == [], 'Trial {0}: no waiters should remain'.format(i)
+
+    def test_increment_when_less_than_timeout(self):
+        sync_num = SynchronizedNumber(100.0)
+
+        assert not sync_num.increment_when_less_than(1, 100, timeout=0.05), \
+            'increment_when_less_than should time out'
+        assert sync_num == 100, 'sync_num is {0} but must be 100'.format(sync_num)
+        assert sync_num._waiters == [], 'The timed out waiter should have been removed'
+
+        assert sync_num.increment_when_less_than(1, 100, eq_ok=True, timeout=0.05), \
+            'increment_when_less_than should succeed immediately'
+        assert sync_num == 101, 'sync_num is {0} but must be 101'.format(sync_num)
+
+    def test_wait_until(self):
+        sync_num = SynchronizedNumber(0.0)
+        results = []
+
+        def waiter():
+            results.append(sync_num.wait_until(GreaterThan(2), timeout=5))
+
+        waiters = [threading.Thread(target=waiter) for _ in range(3)]
+        for thread in waiters:
+            thread.start()
+
+        with sync_num.transaction() as tx:
+            tx.increment(1)
+            tx.increment(2)
+
+        for thread in waiters:
+            thread.join()
+
+        assert results == [True] * 3, 'results are {0}'.format(results)
+        assert sync_num == 3, 'sync_num is {0} but must be 3'.format(sync_num)
+
+    def test_only_satisfied_waiters_are_woken(self):
+        sync_num = SynchronizedNumber(0.0)
+        thread = threading.Thread(target=sync_num.decrement_when_greater_than,
+                                  args=(10, 10), kwargs={'eq_ok': True, 'timeout': 5})
+        thread.start()
+
+        # Wait for the consumer to register itself
+        while not sync_num._waiters:
+            pass
+        waiter = sync_num._waiters[0]
+
+        sync_num.increment(5)
+        assert not waiter.event.is_set(), 'The waiter should not be woken before 10 is reached'
+        sync_num.increment(5)
+        thread.join()
+
+        assert waiter.event.is_set(), 'The waiter should have been woken'
+        assert sync_num == 0, 'sync_num is {0} but must be 0'.format(sync_num)
+
+    def test_wake_up_is_passed_on_after_timeout(self):
+        sync_num = SynchronizedNumber(0.0)
+        results = {}
+
+        def consumer(name, timeout):
+            results[name] = sync_num.decrement_when_greater_than(1, 0, timeout=timeout)
+
+        first = threading.Thread(target=consumer, args=('first', 0.1))
+        first.start()
+        while len(sync_num._waiters) < 1:
+            pass
+        second = threading.Thread(target=consumer, args=('second', 5))
+        second.start()
+        while len(sync_num._waiters) < 2:
+            pass
+
+        # Wake only the first consumer, and hold the lock until it has timed out
+        sync_num._lock.acquire()
+        sync_num.value = 1.0
+        sync_num._notify_waiters()
+        time.sleep(0.3)
+        sync_num._lock.release()
+        first.join()
+        second.join()
+
+        assert results == {'first': False, 'second': True}, 'results are {0}'.format(results)
+        assert sync_num == 0, 'sync_num is {0} but must be 0'.format(sync_num)
+
+    def test_timeout_iadd(self):
+        sync_num = SynchronizedNumber(10.0, timeout=0.05)
+
+        sync_num._lock.acquire()  # Acquire lock on main thread so others can't acquire it
+        start = time.time()
+        try:
+            sync_num += 5.0
+            assert False, 'Exception was not thrown, but it should have been thrown'
+        except LockAcquisitionException as e:
+            assert e.waited == 0.05, 'The exception should record the 0.05s wait, not {0}'.format(
+                e.waited)
+        finally:
+            sync_num._lock.release()
+
+        assert time.time() - start >= 0.05, 'The operation should have waited for the timeout'
+        assert sync_num == 10, 'sync_num is {0} but must be 10'.format(sync_num)
+
+    def test_timeout_waits_for_lock(self):
+        sync_num = SynchronizedNumber(10.0, should_block_thread=False)
+
+        sync_num._lock.acquire()  # Acquire lock on main thread so others can't acquire it
+        timer = threading.Timer(0.02, sync_num._lock.release)
+        timer.start()
+
+        assert sync_num.increment(5, timeout=5), 'increment should wait for the lock to be released'
+        timer.join()
+        assert sync_num == 15, 'sync_num is {0} but must be 15'.format(sync_num)
+
+    def test_per_call_timeout_overrides_default(self):
+        sync_num = SynchronizedNumber(10.0, timeout=5)
+
+        sync_num._lock.acquire()  # Acquire lock on main thread so others can't acquire it
+        try:
+            assert not sync_num.increment_if_less_than(5, 100, timeout=0), \
+                'increment_if_less_than should fail without waiting'
+            assert not sync_num.decrement(5, timeout=0.01), 'decrement should time out'
+            assert sync_num.apply_many([(lambda x: x + 1, None)], timeout=0.01) is None, \
+                'apply_many should time out'
+            try:
+                sync_num.transaction(timeout=0.01).__enter__()
+                assert False, 'Exception was not thrown, but it should have been thrown'
+            except LockAcquisitionException as e:
+                assert e.waited == 0.01, 'The exception should record the 0.01s wait'
+        finally:
+            sync_num._lock.release()
+
+        assert sync_num == 10, 'sync_num is {0} but must be 10'.format(sync_num)
+
+    def test_get_and_add_allocates_unique_ids(self):
+        sync_num = SynchronizedNumber(0)
+        ids = []
+
+        def allocate():
+            for _ in range(NUM_TRIALS):
+                ids.append(sync_num.get_and_add(1))
+
+        threads = [threading.Thread(target=allocate) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(ids) == list(range(4 * NUM_TRIALS)), 'Every id should be allocated once'
+        assert sync_num.get() == 4 * NUM_TRIALS, 'sync_num is {0} but must be {1}'.format(
+            sync_num, 4 * NUM_TRIALS)
+
+    def test_read_modify_return(self):
+        sync_num = SynchronizedNumber(10)
+
+        assert sync_num.add_and_get(5) == 15, 'add_and_get should return the new value'
+        assert sync_num.get_and_set(3) == 15, 'get_and_set should return the old value'
+        assert sync_num.update_and_get(lambda x: x * 7) == 21, \
+            'update_and_get should return the new value'
+        assert not sync_num.compare_and_set(20, 0), 'compare_and_set should fail unless equal'
+        assert sync_num.compare_and_set(21, 0), 'compare_and_set should succeed when equal'
+        assert sync_num == 0, 'sync_num is {0} but must be 0'.format(sync_num)
+
+    def test_read_modify_return_lock_failure(self):
+        sync_num = SynchronizedNumber(10.0, should_block_thread=False)
+
+        sync_num._lock.acquire()
+        try:
+            self.assertRaises(LockAcquisitionException, sync_num.get)
+            self.assertRaises(LockAcquisitionException, sync_num.get_and_add, 1)
+            self.assertRaises(LockAcquisitionException, sync_num.compare_and_set, 10, 0, 0.01)
+        finally:
+            sync_num._lock.release()
+
+        assert sync_num == 10, 'sync_num is {0} but must be 10'.format(sync_num)
+
+    def test_get_never_sees_a_transaction_in_progress(self):
+        sync_num = SynchronizedNumber(0)
+        seen = []
+        done = threading.Event()
+
+        def reader():
+            while not done.is_set():
+                seen.append(sync_num.get())
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        for _ in range(NUM_TRIALS // 10):
+            with sync_num.transaction() as tx:
+                tx.increment(1)
+                tx.increment(1)
+        done.set()
+        thread.join()
+
+        assert all(value % 2 == 0 for value in seen), 'get() saw a transaction half applied'
@@ -0,0 +1,128 @@
+import unittest
+import threading
+from threading_tools import SynchronizedNumberArray
+from threading_tools import synchronized_number_array
+
+NUM_TRIALS = 250
+NUM_THREADS = 4
+
+
+class TestSynchronizedNumberArray(unittest.TestCase):
+
+    def test_bulk_increment(self):
+        for i in range(NUM_TRIALS):
+            sync_array = SynchronizedNumberArray(8, num_stripes=3)
+
+            def incr_wrapper():
+                sync_array.increment([0, 1, 2, 3, 4, 5, 6, 7, 0], 1)
+
+            threads = [threading.Thread(target=incr_wrapper) for _ in range(NUM_THREADS)]
+
+            # Start the threads
+            for thread in threads:
+                thread.start()
+
+            # Wait on the threads
+            for thread in threads:
+                thread.join()
+
+            expected = [2.0 * NUM_THREADS] + [1.0 * NUM_THREADS] * 7
+            assert list(sync_array.snapshot()) == expected, \
+                'Trial {0}: sync_array is {1} but must be {2}'.format(
+                    i, list(sync_array.snapshot()), expected)
+
+    def test_increment_and_decrement_single_index(self):
+        sync_array = SynchronizedNumberArray(4, initial_value=10)
+
+        assert sync_array.increment(2, 5), 'increment should succeed'
+        assert sync_array.decrement(3, 4), 'decrement should succeed'
+        assert sync_array.decrement([0, 1], [1, 2]), 'decrement should succeed'
+        assert list(sync_array.snapshot()) == [9.0, 8.0, 15.0, 6.0], \
+            'sync_array is {0}'.format(list(sync_array.snapshot()))
+
+    def test_increment_if_less_than(self):
+        for i in range(NUM_TRIALS):
+            sync_array = SynchronizedNumberArray(2, num_stripes=2)
+
+            def incr_wrapper():
+                sync_array.increment_if_less_than([0, 1], [100, 100], 100)
+
+            thread1 = threading.Thread(target=incr_wrapper)
+            thread2 = threading.Thread(target=incr_wrapper)
+
+            # Start the threads
+            thread1.start()
+            thread2.start()
+
+            # Wait on the threads
+            thread1.join()
+            thread2.join()
+
+            assert list(sync_array.snapshot()) == [100.0, 100.0], \
+                'Trial {0}: sync_array is {1} but must be [100.0, 100.0]'.format(
+                    i, list(sync_array.snapshot()))
+
+    def test_conditional_results(self):
+        sync_array = SynchronizedNumberArray(3, initial_value=50)
+
+        results = sync_array.increment_if_less_than([0, 0, 1], 50, 100)
+        assert results == [True, False, True], \
+            'Results are {0} but must be [True, False, True]'.format(results)
+
+        results = sync_array.decrement_if_greater_than([0, 2], 50, 50, eq_ok=True)
+        assert results == [True, True], 'Results are {0} but must be [True, True]'.format(results)
+        assert list(sync_array.snapshot()) == [50.0, 100.0, 0.0], \
+            'sync_array is {0}'.format(list(sync_array.snapshot()))
+
+    def test_non_blocking_increment(self):
+        sync_array = SynchronizedNumberArray(4, num_stripes=2, should_block_thread=False)
+
+        sync_array._locks[1].acquire()
+        try:
+            assert not sync_array.increment([0, 1], 1), 'increment should fail'
+            assert sync_array.increment_if_less_than(3, 1, 10) is None, \
+                'increment_if_less_than should fail'
+            assert sync_array.increment(2, 1), 'increment of an unlocked stripe should succeed'
+        finally:
+            sync_array._locks[1].release()
+
+        assert not sync_array._locks[0].locked(), 'The lock should not be locked. It was.'
+        assert list(sync_array.snapshot()) == [0.0, 0.0, 1.0, 0.0], \
+            'sync_array is {0}'.format(list(sync_array.snapshot()))
+
+    def test_invalid_arguments(self):
+        sync_array = SynchronizedNumberArray(4)
+        self.assertRaises(IndexError, sync_array.increment, 4, 1)
+        self.assertRaises(IndexError, sync_array.increment, [0, -1], 1)
+        self.assertRaises(ValueError, sync_array.increment, [0, 1], [1])
+        self.assertRaises(ValueError, SynchronizedNumberArray, 4, num_stripes=0)
+
+    def test_tuple_indices_and_integer_typecodes(self):
+        for use_numpy in (False, True):
+            if use_numpy and synchronized_number_array.numpy is None:
+                continue
+            sync_array = SynchronizedNumberArray(4, typecode='i', num_stripes=2)
+            if not use_numpy:
+                sync_array._view = None
+
+            assert sync_array.increment((0, 2, 2), (1, 2, 3)), 'increment should succeed'
+            assert sync_array.decrement((1, 3), 4), 'decrement should succeed'
+            assert list(sync_array.snapshot()) == [1, -4, 5, -4], \
+                'numpy={0}: sync_array is {1}'.format(use_numpy, list(sync_array.snapshot()))
+
+            self.assertRaises(TypeError, sync_array.increment, (0, 1), [1, 1.5])
+            self.assertRaises(TypeError, sync_array.increment, 3, 0.5)
+            self.assertRaises(TypeError, sync_array.increment_if_less_than, (0, 1), 0.5, 10)
+            assert list(sync_array.snapshot()) == [1, -4, 5, -4], \
+                'numpy={0}: Float amounts should change nothing'.format(use_numpy)
+
+    @unittest.skipIf(synchronized_number_array.numpy is None, 'NumPy is not installed')
+    def test_numpy_snapshot(self):
+        sync_array = SynchronizedNumberArray(3, initial_value=1)
+        sync_array.increment([0, 2, 2], [1, 2, 3])
+
+        snapshot = sync_array.numpy_snapshot()
+        assert snapshot.tolist() == [2.0, 1.0, 6.0], 'snapshot is {0}'.format(snapshot)
+
+        sync_array.increment(0, 1)
+        assert snapshot.tolist() == [2.0, 1.0, 6.0], 'The snapshot should be a copy'
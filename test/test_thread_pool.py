@@ -0,0 +1,73 @@
+import unittest
+import threading
+import time
+from threading_tools import ThreadPool, TaskTimeoutException, SynchronizedNumber
+
+NUM_TASKS = 500
+
+
+class TestThreadPool(unittest.TestCase):
+
+    def test_runs_every_task_with_bounded_threads(self):
+        pool = ThreadPool(4, name='test-bounded')
+        sync_num = SynchronizedNumber(0)
+        thread_names = set()
+
+        def task(amount):
+            thread_names.add(threading.current_thread().name)
+            sync_num.increment(amount)
+            return amount * 2
+
+        handles = [pool.submit(task, i) for i in range(NUM_TASKS)]
+        results = [handle.result(timeout=5) for handle in handles]
+        pool.shutdown()
+
+        assert results == [i * 2 for i in range(NUM_TASKS)], 'Results are out of order or wrong'
+        expected = sum(range(NUM_TASKS))
+        assert sync_num == expected, 'sync_num is {0} but must be {1}'.format(sync_num, expected)
+        assert len(thread_names) <= 4, \
+            '{0} threads ran tasks, but the pool has 4'.format(len(thread_names))
+
+    def test_exception_is_captured(self):
+        pool = ThreadPool(1, name='test-exception')
+
+        def fail():
+            raise ValueError('Intentional failure')
+
+        handle = pool.submit(fail)
+        assert isinstance(handle.exception(timeout=5), ValueError), \
+            'The exception should be a ValueError. Instead was {0}'.format(handle.exception())
+        self.assertRaises(ValueError, handle.result)
+        assert pool.submit(lambda: 5).result(timeout=5) == 5, 'The worker should still be usable'
+        pool.shutdown()
+
+    def test_result_timeout(self):
+        pool = ThreadPool(1, name='test-timeout')
+        event = threading.Event()
+
+        handle = pool.submit(event.wait)
+        self.assertRaises(TaskTimeoutException, handle.result, 0.01)
+        assert not handle.done(), 'The task should still be running'
+        event.set()
+        handle.wait(5)
+        pool.shutdown()
+
+    def test_done_callback(self):
+        pool = ThreadPool(2, name='test-callback')
+        finished = []
+
+        handle = pool.submit(time.sleep, 0.01)
+        handle.add_done_callback(finished.append)
+        handle.wait(5)
+        handle.add_done_callback(finished.append)
+        pool.shutdown()
+
+        assert finished == [handle, handle], 'Both callbacks should have been called'
+
+    def test_shutdown_finishes_queued_tasks(self):
+        pool = ThreadPool(1, name='test-shutdown')
+        handles = [pool.submit(time.sleep, 0.001) for _ in range(10)]
+        pool.shutdown(wait=True)
+
+        assert all(handle.done() for handle in handles), 'Every queued task should have run'
+        self.assertRaises(RuntimeError, pool.submit, time.sleep, 0)
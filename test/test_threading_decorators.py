@@ -1,7 +1,30 @@
+import os
+import signal
+import time
 import unittest
 import threading
-from threading_tools import SynchronizedNumber
-from threading_tools import threaded_fn
+from threading_tools import SynchronizedNumber, ProcessExitedException, TaskTimeoutException
+from threading_tools import threaded_fn, process_fn
+
+
+@process_fn
+def add_in_process(arg0, arg1, kwarg0=5):
+    return arg0 + arg1 + kwarg0
+
+
+@process_fn
+def fail_in_process():
+    raise ValueError('Intentional failure')
+
+
+@process_fn
+def make_large_result(size):
+    return b'x' * size
+
+
+@process_fn
+def sleep_in_process(seconds):
+    time.sleep(seconds)
 
 
 class TestThreadingDecorators(unittest.TestCase):
@@ -20,3 +43,102 @@ class TestThreadingDecorators(unittest.TestCase):
         function_to_thread(main_thread, 5, 6, kwarg0=7, kwarg1=8)
         assert main_thread == threading.current_thread(), \
             'Outside function_to_thread, main_thread should be the current thread'
+
+    def test_pooled_threaded_fn(self):
+        main_thread = threading.current_thread()
+
+        @threaded_fn(pool='test-decorators', pool_size=2)
+        def function_to_thread(arg0, arg1, kwarg0=5):
+            assert main_thread != threading.current_thread(), \
+                'Inside function_to_thread main_thread should NOT be the current thread'
+            return arg0 + arg1 + kwarg0
+
+        handles = [function_to_thread(i, 6, kwarg0=7) for i in range(20)]
+        results = [handle.result(timeout=5) for handle in handles]
+        assert results == [i + 13 for i in range(20)], 'Results are {0}'.format(results)
+
+        @threaded_fn(pool='test-decorators')
+        def other_function():
+            pass
+
+        assert other_function.pool is function_to_thread.pool, \
+            'Decorators naming the same pool should share it'
+        assert function_to_thread.__name__ == 'function_to_thread', \
+            'The wrapper should keep the name of the decorated function'
+
+    def test_threaded_fn_result(self):
+        @threaded_fn
+        def add(arg0, arg1, kwarg0=5):
+            return arg0 + arg1 + kwarg0
+
+        @threaded_fn
+        def fail():
+            raise ValueError('Intentional failure')
+
+        thread = add(5, 6, kwarg0=7)
+        assert thread.result(timeout=5) == 18, 'Result should be 18. Instead was {0}'.format(
+            thread.result())
+        assert thread.exception() is None, 'add should not have raised an exception'
+
+        thread = fail()
+        thread.join()
+        assert thread.done(), 'The thread should be done after being joined'
+        assert isinstance(thread.exception(), ValueError), \
+            'The exception should be a ValueError. Instead was {0}'.format(thread.exception())
+        self.assertRaises(ValueError, thread.result)
+
+    def test_threaded_fn_done_callback(self):
+        event = threading.Event()
+        finished = []
+
+        @threaded_fn
+        def wait_for_event():
+            event.wait()
+            return 'done'
+
+        thread = wait_for_event()
+        thread.add_done_callback(lambda handle: finished.append(handle.result()))
+        self.assertRaises(TaskTimeoutException, thread.result, 0.01)
+        event.set()
+        thread.join()
+
+        assert finished == ['done'], 'The callback should have been called once with the result'
+
+    def test_process_fn_result(self):
+        process = add_in_process(5, 6, kwarg0=7)
+        assert process.result(timeout=30) == 18, 'Result should be 18. Instead was {0}'.format(
+            process.result())
+        process.join()
+        assert process.exitcode == 0, 'The process should have exited cleanly'
+
+        process = fail_in_process()
+        assert isinstance(process.exception(timeout=30), ValueError), \
+            'The exception should be a ValueError. Instead was {0}'.format(process.exception())
+        self.assertRaises(ValueError, process.result)
+        process.join()
+
+    def test_process_fn_large_result(self):
+        size = 10 * 1024 * 1024
+        process = make_large_result(size)
+
+        # The result is larger than a pipe buffer, so joining must read it before waiting
+        process.join()
+        assert len(process.result()) == size, 'The whole result should have been received'
+
+    def test_process_fn_killed(self):
+        process = sleep_in_process(30)
+        finished = []
+        process.add_done_callback(finished.append)
+        self.assertRaises(TaskTimeoutException, process.result, 0.01)
+
+        os.kill(process.pid, signal.SIGTERM)
+        assert isinstance(process.exception(timeout=30), ProcessExitedException), \
+            'The exception should be a ProcessExitedException. Instead was {0}'.format(
+                process.exception())
+        process.join()
+
+        for _ in range(100):
+            if finished:
+                break
+            time.sleep(0.01)
+        assert len(finished) == 1, 'The callback should have been called once'
@@ -0,0 +1,120 @@
+import unittest
+import threading
+import time
+from threading_tools import WorkStealingPool, ThreadPool, TaskHandle, SynchronizedNumber, \
+    threaded_fn
+
+NUM_TASKS = 500
+
+
+class TestWorkStealingPool(unittest.TestCase):
+
+    def test_runs_every_task(self):
+        pool = WorkStealingPool(4, name='test-ws-every')
+        sync_num = SynchronizedNumber(0)
+
+        def task(amount):
+            sync_num.increment(amount)
+            return amount * 2
+
+        handles = [pool.submit(task, i) for i in range(NUM_TASKS)]
+        results = pool.gather(handles, timeout=5)
+        pool.shutdown()
+
+        assert results == [i * 2 for i in range(NUM_TASKS)], 'Results are out of order or wrong'
+        expected = sum(range(NUM_TASKS))
+        assert sync_num == expected, 'sync_num is {0} but must be {1}'.format(sync_num, expected)
+
+    def test_runs_by_priority(self):
+        pool = WorkStealingPool(1, name='test-ws-priority')
+        started = threading.Event()
+        release = threading.Event()
+        order = []
+
+        def block():
+            started.set()
+            release.wait()
+
+        pool.submit(block)
+        started.wait(5)
+        handles = [pool.submit_with_priority(priority, order.append, name)
+                   for priority, name in [(0, 'low-1'), (5, 'high-1'), (1, 'mid'), (0, 'low-2'),
+                                          (5, 'high-2')]]
+        release.set()
+        pool.gather(handles, timeout=5)
+        pool.shutdown()
+
+        assert order == ['high-1', 'high-2', 'mid', 'low-1', 'low-2'], \
+            'Calls ran in the order {0}'.format(order)
+
+    def test_subtasks(self):
+        pool = WorkStealingPool(2, name='test-ws-subtasks')
+        priorities = []
+
+        def fib(n):
+            priorities.append(pool._local.priority)
+            if n < 2:
+                return n
+            return sum(pool.gather([pool.submit(fib, n - 1), pool.submit(fib, n - 2)]))
+
+        # With two workers, waiting for subtasks would deadlock unless waiting workers run them
+        result = pool.submit_with_priority(3, fib, 12).result(timeout=10)
+        pool.shutdown()
+
+        assert result == 144, 'fib(12) is 144, not {0}'.format(result)
+        assert set(priorities) == set([3]), 'Subtasks should inherit their priority'
+
+    def test_idle_workers_steal_subtasks(self):
+        pool = WorkStealingPool(4, name='test-ws-steal')
+        thread_names = set()
+
+        def subtask():
+            thread_names.add(threading.current_thread().name)
+            time.sleep(0.005)
+
+        def task():
+            pool.gather([pool.submit(subtask) for _ in range(40)])
+
+        pool.submit(task).result(timeout=10)
+        pool.shutdown()
+
+        assert len(thread_names) > 1, \
+            'Subtasks should have been stolen by idle workers, but ran on {0}'.format(thread_names)
+
+    def test_shutdown_finishes_queued_tasks(self):
+        pool = WorkStealingPool(2, name='test-ws-shutdown')
+        handles = [pool.submit(time.sleep, 0.001) for _ in range(20)]
+        pool.shutdown(wait=True)
+
+        assert all(handle.done() for handle in handles), 'Every queued task should have run'
+        self.assertRaises(RuntimeError, pool.submit, time.sleep, 0)
+
+    def test_threaded_fn_priority(self):
+        pool = WorkStealingPool(1, name='test-ws-decorator')
+        started = threading.Event()
+        release = threading.Event()
+        order = []
+
+        @threaded_fn(pool=pool)
+        def block():
+            started.set()
+            release.wait()
+
+        @threaded_fn(pool=pool, priority=10)
+        def urgent(name):
+            order.append(name)
+
+        @threaded_fn(pool=pool)
+        def normal(name):
+            order.append(name)
+
+        block()
+        started.wait(5)
+        handles = [normal('normal'), urgent('urgent')]
+        assert isinstance(handles[0], TaskHandle), 'Pooled calls should return a TaskHandle'
+        release.set()
+        pool.gather(handles, timeout=5)
+        pool.shutdown()
+
+        assert order == ['urgent', 'normal'], 'Calls ran in the order {0}'.format(order)
+        self.assertRaises(ValueError, threaded_fn, len, pool=ThreadPool(1), priority=1)
@@ -1,3 +1,28 @@
-from synchronized_number import SynchronizedNumber
-from lock_acquisition_exception import LockAcquisitionException
-from threading_decorators import threaded_fn, process_fn
+from .synchronized_number import SynchronizedNumber, NumberSnapshot
+from .striped_synchronized_number import StripedSynchronizedNumber
+from .compact_synchronized_number import CompactSynchronizedNumber
+from .synchronized_number_array import SynchronizedNumberArray
+from .process_synchronized_number import ProcessSynchronizedNumber
+from .atomic_operations import atomic, transfer
+from .conditions import LessThan, GreaterThan, Between
+from .instrumented_lock import InstrumentedLock, LockStats
+from .sequence_lock import SequenceLock
+from .lock_acquisition_exception import LockAcquisitionException
+from .task_handle import TaskHandle
+from .task_timeout_exception import TaskTimeoutException
+from .process_exited_exception import ProcessExitedException
+from .result_thread import ResultThread
+from .result_process import ResultProcess
+from .thread_pool import ThreadPool, get_thread_pool
+from .work_stealing_pool import WorkStealingPool, get_work_stealing_pool
+from .process_pool import ProcessPool, get_process_pool
+from .rate_limit_exceeded_exception import RateLimitExceededException
+from .concurrency_limit_exceeded_exception import ConcurrencyLimitExceededException
+from .concurrency_limiter import ConcurrencyLimiter, ConcurrencyStats
+from .threading_decorators import threaded_fn, process_fn
+from .parallel_map import parallel_map, threaded_map, process_map
+from .rate_limiter import RateLimiter, rate_limited
+from .single_flight import single_flight, CacheStats
+from .async_synchronized_number import AsyncSynchronizedNumber
+from .async_decorators import async_threaded_fn, awaitable
+from .runtime import gil_enabled
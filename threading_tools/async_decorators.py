@@ -0,0 +1,79 @@
+#
+# async_decorators.py
+# Decorators and helpers for calling blocking functions from asyncio code
+#
+
+import functools
+from .thread_pool import ThreadPool, get_thread_pool
+
+try:
+    import asyncio
+    import concurrent.futures
+except ImportError:
+    asyncio = None
+
+
+def awaitable(handle, loop=None):
+    """
+    Wraps a `TaskHandle`, a `ResultThread` or `ResultProcess` returned by `threaded_fn` or
+    `process_fn`, or a `concurrent.futures.Future`, in an `asyncio.Future` that can be awaited
+    without blocking the event loop.
+
+    :param: loop [optional] - The event loop of the returned future. Defaults to
+                              `asyncio.get_event_loop()`
+    """
+    if asyncio is None:
+        raise ImportError('awaitable requires asyncio (Python 3.4+)')
+    if loop is None:
+        loop = asyncio.get_event_loop()
+    if isinstance(handle, concurrent.futures.Future):
+        return asyncio.wrap_future(handle, loop=loop)
+
+    future = loop.create_future()
+
+    def copy_outcome(task_handle):
+        if future.done():
+            return
+        exception = task_handle.exception()
+        if exception is None:
+            future.set_result(task_handle.result())
+        else:
+            future.set_exception(exception)
+
+    def on_done(task_handle):
+        try:
+            loop.call_soon_threadsafe(copy_outcome, task_handle)
+        except RuntimeError:
+            # The event loop has been closed, so nothing is waiting for this any more
+            pass
+
+    handle.add_done_callback(on_done)
+    return future
+
+
+def async_threaded_fn(func=None, pool=None, pool_size=None):
+    """
+    A decorator for a blocking function that needs to be called from asyncio code. Each call runs
+    the function on a worker thread and returns an `asyncio.Future` for its return value, so the
+    event loop keeps running while the function blocks.
+
+    Used as `@async_threaded_fn`, calls run on the event loop's default executor. Used as
+    `@async_threaded_fn(pool='name', pool_size=N)`, they run on the shared `ThreadPool` of that
+    name, as with `threaded_fn`. Calls must be made from the thread running the event loop.
+    """
+    if asyncio is None:
+        raise ImportError('async_threaded_fn requires asyncio (Python 3.4+)')
+    if func is None:
+        return functools.partial(async_threaded_fn, pool=pool, pool_size=pool_size)
+
+    if pool is not None and not isinstance(pool, ThreadPool):
+        pool = get_thread_pool(pool, pool_size)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        loop = asyncio.get_event_loop()
+        if pool is None:
+            return loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+        return awaitable(pool.submit(func, *args, **kwargs), loop)
+    wrapper.pool = pool
+    return wrapper
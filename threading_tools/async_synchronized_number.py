@@ -0,0 +1,268 @@
+#
+# async_synchronized_number.py
+# An asyncio interface to SynchronizedNumber whose operations never block the event loop
+#
+
+import operator
+from .lock_utils import _now
+from .synchronized_number import SynchronizedNumber, _Waiter, _add, _sub, _replace, _apply, \
+    _satisfies
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+# The longest the event loop waits between attempts to take a lock that another thread holds
+_MAX_POLL_INTERVAL = 0.05
+
+
+def _when_locked(loop, lock, timeout, future, on_locked):
+    """
+    Calls `on_locked()` on the event loop with `lock` held, without blocking the loop. If the lock
+    is taken, retries with an exponentially increasing delay, capped at 50ms, as `acquire_lock`
+    does for locks without timeout support.
+
+    :param: timeout - Seconds to keep retrying. 0 tries once, and a negative timeout retries
+                      until the lock is acquired
+    :param: future - If given, retrying stops once it is done, `on_locked` is skipped if it is
+                     done by the time the lock is acquired, and its result is set to False if the
+                     timeout expires. Exceptions raised by `on_locked` are set on it.
+    """
+    deadline = None if timeout < 0 else _now() + timeout
+    delay = [0.0005]
+
+    def attempt():
+        if future is not None and future.done():
+            return
+        if lock.acquire(False):
+            try:
+                on_locked()
+            except Exception as e:
+                if future is None or future.done():
+                    raise
+                future.set_exception(e)
+            finally:
+                lock.release()
+            return
+
+        remaining = None if deadline is None else deadline - _now()
+        if remaining is not None and remaining <= 0:
+            if future is not None:
+                future.set_result(False)
+            return
+        delay[0] = min(delay[0] * 2, _MAX_POLL_INTERVAL)
+        if remaining is not None:
+            delay[0] = min(delay[0], remaining)
+        loop.call_later(delay[0], attempt)
+
+    attempt()
+
+
+class _AsyncWait(object):
+    """
+    A coroutine waiting in one of the `*_when_*` methods or in `wait_until`. It registers a
+    `_Waiter` whose event is this object, so that when a thread or coroutine changes the number
+    and satisfies the check, `set()` schedules another attempt on the event loop instead of waking
+    a thread.
+    """
+
+    def __init__(self, number, loop, binary_operator, operand, check, check_arg, timeout):
+        self.number = number
+        self.loop = loop
+        self.binary_operator = binary_operator
+        self.operand = operand
+        self.check = check
+        self.check_arg = check_arg
+        self.future = loop.create_future()
+        self.waiter = None
+        self.timer = None
+        if timeout is not None:
+            self.timer = loop.call_later(timeout, self._expire)
+        self.future.add_done_callback(self._on_done)
+
+    def start(self):
+        self._attempt()
+        return self.future
+
+    def set(self):
+        # Called by `SynchronizedNumber._notify_waiters`, on any thread, with the lock held
+        self.waiter = None
+        try:
+            self.loop.call_soon_threadsafe(self._woken)
+        except RuntimeError:
+            # The event loop has been closed, so nothing is waiting for this any more
+            pass
+
+    def _attempt(self):
+        _when_locked(self.loop, self.number._lock, -1, self.future, self._on_locked)
+
+    def _on_locked(self):
+        number = self.number
+        if not self.check(number.value, self.check_arg):
+            self.waiter = _Waiter(self.check, self.check_arg, self.binary_operator is not None,
+                                  self)
+            number._add_waiter(self.waiter)
+            return
+
+        if self.binary_operator is not None:
+            number.value = self.binary_operator(number.value, self.operand)
+            if number._waiters:
+                number._notify_waiters()
+        self.future.set_result(True)
+
+    def _woken(self):
+        if not self.future.done():
+            self._attempt()
+        elif self.binary_operator is not None:
+            # We were woken after giving up, so pass the wake-up on to another waiter
+            _when_locked(self.loop, self.number._lock, -1, None, self._notify_others)
+
+    def _notify_others(self):
+        if self.number._waiters:
+            self.number._notify_waiters()
+
+    def _expire(self):
+        if not self.future.done():
+            self.future.set_result(False)
+
+    def _on_done(self, future):
+        if self.timer is not None:
+            self.timer.cancel()
+        if self.waiter is not None:
+            _when_locked(self.loop, self.number._lock, -1, None, self._unregister)
+
+    def _unregister(self):
+        # If the waiter is no longer registered it has been woken, and `_woken` will pass the
+        # wake-up on
+        if self.waiter is not None and self.waiter in self.number._waiters:
+            self.number._waiters.remove(self.waiter)
+
+
+class AsyncSynchronizedNumber(object):
+    """
+    An asyncio interface to a `SynchronizedNumber`. Every method returns an `asyncio.Future` to be
+    awaited, and none of them blocks the event loop: if another thread holds the lock, the loop
+    retries later instead of waiting for it, and the `*_when_*` methods and `wait_until` are woken
+    through the event loop when the value changes.
+
+    Each method takes the same arguments as the `SynchronizedNumber` method of the same name, and
+    the future's result is what that method would return. The number can be shared with threads
+    that use the `SynchronizedNumber` directly, through the `number` attribute.
+
+    Methods must be called from the thread running the event loop, which is found with
+    `asyncio.get_event_loop()`.
+    """
+
+    def __init__(self, initial_value=0, should_block_thread=True, timeout=None, number=None):
+        """
+        :param: number [optional] - An existing `SynchronizedNumber` to wrap. If None, a new one
+                                    is created with the other arguments
+        """
+        if asyncio is None:
+            raise ImportError('AsyncSynchronizedNumber requires asyncio (Python 3.4+)')
+        if number is None:
+            number = SynchronizedNumber(initial_value, should_block_thread, timeout)
+        self.number = number
+
+    @property
+    def value(self):
+        return self.number.value
+
+    def set_value(self, new_value, timeout=None):
+        return self._operate(_replace, new_value, timeout=timeout)
+
+    def increment(self, incr_value, timeout=None):
+        return self._operate(_add, incr_value, timeout=timeout)
+
+    def decrement(self, decr_value, timeout=None):
+        return self._operate(_sub, decr_value, timeout=timeout)
+
+    def increment_if_less_than(self, incr_value, limit, eq_ok=False, timeout=None):
+        return self._operate(_add, incr_value, operator.le if eq_ok else operator.lt, limit,
+                             timeout=timeout)
+
+    def decrement_if_greater_than(self, decr_value, limit, eq_ok=False, timeout=None):
+        return self._operate(_sub, decr_value, operator.ge if eq_ok else operator.gt, limit,
+                             timeout=timeout)
+
+    def increment_if_satisfies_condition(self, incr_value, satisfaction_condition, timeout=None):
+        return self._operate(_add, incr_value, _satisfies, satisfaction_condition,
+                             timeout=timeout)
+
+    def decrement_if_satisfies_condition(self, decr_value, satisfaction_condition, timeout=None):
+        return self._operate(_sub, decr_value, _satisfies, satisfaction_condition,
+                             timeout=timeout)
+
+    def operate_if_satisfies_condition(self, operator, satisfaction_condition, timeout=None):
+        return self._operate(_apply, operator, _satisfies, satisfaction_condition,
+                             timeout=timeout)
+
+    def wait_until(self, satisfaction_condition, timeout=None):
+        """
+        Waits, without blocking the event loop, until the value satisfies
+        `satisfaction_condition`. The future's result is True once it does, or False if `timeout`
+        seconds pass first.
+        """
+        return self._operate_when(None, None, _satisfies, satisfaction_condition, timeout)
+
+    def increment_when_less_than(self, incr_value, limit, eq_ok=False, timeout=None):
+        return self._operate_when(_add, incr_value, operator.le if eq_ok else operator.lt, limit,
+                                  timeout)
+
+    def decrement_when_greater_than(self, decr_value, limit, eq_ok=False, timeout=None):
+        return self._operate_when(_sub, decr_value, operator.ge if eq_ok else operator.gt, limit,
+                                  timeout)
+
+    def increment_when_satisfies_condition(self, incr_value, satisfaction_condition,
+                                           timeout=None):
+        return self._operate_when(_add, incr_value, _satisfies, satisfaction_condition, timeout)
+
+    def decrement_when_satisfies_condition(self, decr_value, satisfaction_condition,
+                                           timeout=None):
+        return self._operate_when(_sub, decr_value, _satisfies, satisfaction_condition, timeout)
+
+    def operate_when_satisfies_condition(self, operator, satisfaction_condition, timeout=None):
+        return self._operate_when(_apply, operator, _satisfies, satisfaction_condition, timeout)
+
+    def _operate(self, binary_operator, operand, check=None, check_arg=None, timeout=None):
+        """
+        The asyncio counterpart of `SynchronizedNumber._operate`, with the same lock timeout
+        rules.
+        """
+        number = self.number
+        if timeout is None:
+            timeout = number.timeout
+        if timeout is None:
+            timeout = -1 if number.should_block_thread else 0
+
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+
+        def on_locked():
+            if check is None or check(number.value, check_arg):
+                number.value = binary_operator(number.value, operand)
+                if number._waiters:
+                    number._notify_waiters()
+                future.set_result(True)
+            else:
+                if number._instrumented:
+                    number._lock.record_rejection()
+                future.set_result(False)
+
+        _when_locked(loop, number._lock, timeout, future, on_locked)
+        return future
+
+    def _operate_when(self, binary_operator, operand, check, check_arg, timeout):
+        """
+        The asyncio counterpart of `SynchronizedNumber._operate_when`.
+        """
+        loop = asyncio.get_event_loop()
+        return _AsyncWait(self.number, loop, binary_operator, operand, check, check_arg,
+                          timeout).start()
+
+    def __str__(self):
+        return str(self.number.value)
+
+    def __repr__(self):
+        return str(self.number.value)
@@ -0,0 +1,107 @@
+#
+# atomic_operations.py
+# Atomic operations that span several SynchronizedNumbers
+#
+
+from .lock_acquisition_exception import LockAcquisitionException
+from .lock_utils import _now
+from .synchronized_number import SynchronizedNumberTransaction
+
+
+def atomic(*numbers, **kwargs):
+    """
+    Returns a context manager that holds the locks of all of `numbers` at once. See
+    `AtomicGroup`.
+
+    :param: timeout [optional, keyword only] - Seconds to wait for all of the locks together,
+                                               overriding each number's default timeout
+    """
+    timeout = kwargs.pop('timeout', None)
+    if kwargs:
+        raise TypeError('Unexpected keyword arguments: {0}'.format(', '.join(sorted(kwargs))))
+    return AtomicGroup(numbers, timeout)
+
+
+class AtomicGroup:
+    """
+    A context manager that holds the locks of several `SynchronizedNumber` objects at once and
+    yields one transaction per number, in the order the numbers were given:
+
+        with atomic(reserved, used) as (reserved_tx, used_tx):
+            if reserved_tx.decrement_if_greater_than(5, 5, eq_ok=True):
+                used_tx.increment(5)
+
+    Locks are always acquired in the same global order (by the id of the lock), whatever order the
+    numbers are passed in, so two threads locking overlapping sets of numbers cannot deadlock. A
+    lock shared by several numbers, as with `CompactSynchronizedNumber`, is acquired once. Passing
+    the same number more than once yields the same transaction for each occurrence. If the block
+    raises, every number is rolled back to its value on entry.
+
+    Entering raises a `LockAcquisitionException` if any of the locks cannot be acquired, in which
+    case none of them are held.
+    """
+
+    def __init__(self, numbers, timeout=None):
+        self._timeout = timeout
+
+        transactions = {}
+        for number in numbers:
+            if id(number) not in transactions:
+                transactions[id(number)] = SynchronizedNumberTransaction(number)
+
+        self._transactions = tuple(transactions[id(number)] for number in numbers)
+        self._ordered = sorted(transactions.values(),
+                               key=lambda transaction: id(transaction._number._lock))
+        # The first transaction of each distinct lock, whose number acquires the lock for the rest
+        self._locking = []
+        for transaction in self._ordered:
+            if not self._locking or \
+                    self._locking[-1]._number._lock is not transaction._number._lock:
+                self._locking.append(transaction)
+
+    def __enter__(self):
+        deadline = None if self._timeout is None else _now() + self._timeout
+        for i, transaction in enumerate(self._locking):
+            remaining = None if deadline is None else max(deadline - _now(), 0)
+            if not transaction._number._acquire(remaining):
+                for acquired in self._locking[:i]:
+                    acquired._number._lock.release()
+                raise transaction._number._lock_failure('the atomic operation', self._timeout)
+
+        for transaction in self._ordered:
+            transaction._begin()
+        return self._transactions
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for transaction in self._ordered:
+            transaction._end(rollback=exc_type is not None)
+        for transaction in reversed(self._locking):
+            transaction._number._lock.release()
+        return False
+
+
+def transfer(src, dst, amount, satisfaction_condition=None, timeout=None):
+    """
+    Atomically moves `amount` from `src` to `dst`, i.e. decrements `src` and increments `dst` by
+    `amount` as one step, only if the value of `src` satisfies `satisfaction_condition`.
+
+    :param: src - The `SynchronizedNumber` to decrement
+    :param: dst - The `SynchronizedNumber` to increment
+    :param: amount - The quantity to move
+    :param: satisfaction_condition [optional] - A function that takes in the current value of
+                                                `src` and returns True if the transfer may happen.
+                                                If None, the transfer always happens.
+    :param: timeout [optional] - Seconds to wait for both locks, overriding the default timeouts
+
+    :return: True if the quantity was moved, False if a lock could not be acquired or the
+             condition was not satisfied.
+    """
+    try:
+        with AtomicGroup((src, dst), timeout) as (src_tx, dst_tx):
+            if satisfaction_condition is not None and not satisfaction_condition(src_tx.value):
+                return False
+            src_tx.decrement(amount)
+            dst_tx.increment(amount)
+            return True
+    except LockAcquisitionException:
+        return False
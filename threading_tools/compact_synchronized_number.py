@@ -0,0 +1,46 @@
+#
+# compact_synchronized_number.py
+# A SynchronizedNumber that shares its lock with other numbers, for holding millions of counters
+#
+
+import itertools
+import threading
+from .synchronized_number import SynchronizedNumber
+
+# The number of locks shared by every CompactSynchronizedNumber. Numbers are given locks in turn,
+# so two numbers only share a lock if they were created a multiple of this many numbers apart
+NUM_LOCK_STRIPES = 1024
+
+_lock_stripes = [threading.Lock() for _ in range(NUM_LOCK_STRIPES)]
+_next_stripe = itertools.count()
+
+# Shared by every compact number with no waiters, instead of an empty list each
+_NO_WAITERS = ()
+
+
+class CompactSynchronizedNumber(SynchronizedNumber):
+    """
+    A `SynchronizedNumber` for when there are very many of them, such as a counter per entity.
+    Instead of creating its own lock, each number uses one of a fixed pool of `NUM_LOCK_STRIPES`
+    locks shared with other compact numbers. Like every `SynchronizedNumber` it keeps its fields
+    in `__slots__`, so it has no instance `__dict__`, and it allocates no list for blocked
+    waiters until a thread waits on it. See `python -m benchmarks.bench_synchronized_number` for
+    the bytes used per number.
+
+    Every method works as on a `SynchronizedNumber`. Instrumentation and optimistic reads are not
+    supported. Because the lock may be shared, don't use another number while holding one
+    number's lock in a `transaction()`: that may try to take the same lock again and deadlock.
+    Use `atomic(...)` to change several numbers at once instead, which takes each shared lock
+    only once.
+    """
+    __slots__ = ()
+
+    def __init__(self, initial_value=0, should_block_thread=True, timeout=None):
+        self.should_block_thread = should_block_thread
+        self.timeout = timeout
+        self._lock = _lock_stripes[next(_next_stripe) % NUM_LOCK_STRIPES]
+        self._waiters = _NO_WAITERS
+        self._instrumented = False
+        self._optimistic_reads = False
+        # No other thread can see this number yet, so the value is set without the lock
+        self.value = initial_value
@@ -0,0 +1,11 @@
+#
+# concurrency_limit_exceeded_exception.py
+#
+
+
+class ConcurrencyLimitExceededException(Exception):
+    """
+    Raised when a call is dispatched while the maximum number of calls are already in flight, and
+    the overflow policy does not allow it to wait.
+    """
+    pass
@@ -0,0 +1,146 @@
+#
+# concurrency_limiter.py
+# Bounds the number of dispatched calls running at once, with a policy for calls over the limit
+#
+
+import collections
+import threading
+from .concurrency_limit_exceeded_exception import ConcurrencyLimitExceededException
+from .synchronized_number import SynchronizedNumber
+from .task_handle import TaskHandle
+
+BLOCK = 'block'
+REJECT = 'reject'
+QUEUE = 'queue'
+
+ConcurrencyStats = collections.namedtuple('ConcurrencyStats', [
+    'in_flight',    # Calls running now
+    'queued',       # Calls waiting in the queue
+    'rejected',     # Calls rejected because the limit was reached (and the queue was full)
+    'completed',    # Calls that have finished
+])
+
+
+def _start_thread(run):
+    threading.Thread(target=run).start()
+
+
+class ConcurrencyLimiter(object):
+    """
+    Runs calls on new threads (or with another `start` function), with at most `max_in_flight`
+    of them running at once. The number in flight is a `SynchronizedNumber`, incremented with
+    `increment_if_less_than` when a call is dispatched and decremented when it finishes.
+
+    When the limit is reached, `overflow` decides what happens to a new call:
+
+    * 'block' - The caller waits until a call finishes, or at most `timeout` seconds
+    * 'reject' - `ConcurrencyLimitExceededException` is raised
+    * 'queue' - The call waits in a queue of at most `queue_size` calls, and is run by the next
+                thread to finish. Calls are rejected when the queue is full
+    """
+
+    def __init__(self, max_in_flight, overflow=BLOCK, queue_size=None, timeout=None,
+                 start=_start_thread):
+        """
+        :param: max_in_flight - The most calls that may run at once
+        :param: overflow [optional] - 'block', 'reject' or 'queue'
+        :param: queue_size [optional] - The most calls that may wait, with overflow='queue'
+        :param: timeout [optional] - The longest a caller waits, with overflow='block'. Waits
+                                     forever if None
+        :param: start [optional] - A function that runs its argument, a function with no
+                                   arguments, elsewhere. Defaults to starting a new thread
+        """
+        if max_in_flight < 1:
+            raise ValueError('max_in_flight must be at least 1, not {0}'.format(max_in_flight))
+        if overflow not in (BLOCK, REJECT, QUEUE):
+            raise ValueError("overflow must be 'block', 'reject' or 'queue', not {0!r}".format(
+                overflow))
+        if overflow == QUEUE and (queue_size is None or queue_size < 1):
+            raise ValueError("overflow='queue' needs a queue_size of at least 1")
+
+        self.max_in_flight = max_in_flight
+        self.overflow = overflow
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._start = start
+        self._in_flight = SynchronizedNumber(0)
+        # Only changed while holding the lock of `_in_flight`
+        self._queue = collections.deque()
+        self._rejected = 0
+        self._completed = 0
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Dispatches `func(*args, **kwargs)`, or waits, queues or rejects it, depending on the
+        overflow policy.
+
+        :return: A `TaskHandle` for the call.
+        """
+        task = (TaskHandle(), func, args, kwargs)
+        if self.overflow == BLOCK:
+            if not self._in_flight.increment_when_less_than(1, self.max_in_flight,
+                                                            timeout=self.timeout):
+                self._reject_after_timeout()
+        else:
+            with self._in_flight.transaction() as transaction:
+                if not transaction.increment_if_less_than(1, self.max_in_flight):
+                    if self.overflow == QUEUE and len(self._queue) < self.queue_size:
+                        self._queue.append(task)
+                        return task[0]
+                    self._rejected += 1
+                    raise ConcurrencyLimitExceededException(
+                        'Already running {0} calls'.format(self.max_in_flight))
+
+        try:
+            self._start(lambda: self._run(task))
+        except Exception:
+            self._in_flight.decrement(1)
+            raise
+        return task[0]
+
+    def stats(self):
+        """
+        :return: A `ConcurrencyStats` snapshot.
+        """
+        with self._in_flight.transaction() as transaction:
+            return ConcurrencyStats(int(transaction.value), len(self._queue), self._rejected,
+                                    self._completed)
+
+    @property
+    def in_flight(self):
+        return int(self._in_flight.value)
+
+    @property
+    def queue_depth(self):
+        return len(self._queue)
+
+    def _reject_after_timeout(self):
+        with self._in_flight.transaction():
+            self._rejected += 1
+        raise ConcurrencyLimitExceededException(
+            'Timed out waiting for one of {0} running calls to finish'.format(self.max_in_flight))
+
+    def _run(self, task):
+        # Runs `task`, then any calls that were queued meanwhile, on the same thread. The number
+        # in flight only goes down once the queue is empty, so a queued call is never stranded.
+        # Each handle is completed after the bookkeeping, so that `stats()` already counts a call
+        # by the time its caller sees it finish.
+        while task is not None:
+            handle, func, args, kwargs = task
+            try:
+                outcome = (True, func(*args, **kwargs))
+            except Exception as e:
+                outcome = (False, e)
+
+            with self._in_flight.transaction() as transaction:
+                self._completed += 1
+                if self._queue:
+                    task = self._queue.popleft()
+                else:
+                    task = None
+                    transaction.decrement(1)
+
+            if outcome[0]:
+                handle._set_result(outcome[1])
+            else:
+                handle._set_exception(outcome[1])
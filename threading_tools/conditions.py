@@ -0,0 +1,64 @@
+#
+# conditions.py
+# Reusable satisfaction conditions for the *_if_satisfies_condition methods
+#
+
+
+class LessThan(object):
+    """
+    A satisfaction condition that is met when the value is less than `limit` (or equal to it, if
+    `eq_ok` is True). Create one up front and pass it to every call, instead of building a new
+    lambda each time.
+    """
+    __slots__ = ('limit', 'eq_ok')
+
+    def __init__(self, limit, eq_ok=False):
+        self.limit = limit
+        self.eq_ok = eq_ok
+
+    def __call__(self, value):
+        return value <= self.limit if self.eq_ok else value < self.limit
+
+    def __repr__(self):
+        return 'LessThan({0!r}, eq_ok={1!r})'.format(self.limit, self.eq_ok)
+
+
+class GreaterThan(object):
+    """
+    A satisfaction condition that is met when the value is greater than `limit` (or equal to it,
+    if `eq_ok` is True). Create one up front and pass it to every call, instead of building a new
+    lambda each time.
+    """
+    __slots__ = ('limit', 'eq_ok')
+
+    def __init__(self, limit, eq_ok=False):
+        self.limit = limit
+        self.eq_ok = eq_ok
+
+    def __call__(self, value):
+        return value >= self.limit if self.eq_ok else value > self.limit
+
+    def __repr__(self):
+        return 'GreaterThan({0!r}, eq_ok={1!r})'.format(self.limit, self.eq_ok)
+
+
+class Between(object):
+    """
+    A satisfaction condition that is met when `lower < value < upper`. Either bound can be made
+    inclusive with `lower_eq_ok` and `upper_eq_ok`.
+    """
+    __slots__ = ('lower', 'upper', 'lower_eq_ok', 'upper_eq_ok')
+
+    def __init__(self, lower, upper, lower_eq_ok=False, upper_eq_ok=False):
+        self.lower = lower
+        self.upper = upper
+        self.lower_eq_ok = lower_eq_ok
+        self.upper_eq_ok = upper_eq_ok
+
+    def __call__(self, value):
+        above = value >= self.lower if self.lower_eq_ok else value > self.lower
+        return above and (value <= self.upper if self.upper_eq_ok else value < self.upper)
+
+    def __repr__(self):
+        return 'Between({0!r}, {1!r}, lower_eq_ok={2!r}, upper_eq_ok={3!r})'.format(
+            self.lower, self.upper, self.lower_eq_ok, self.upper_eq_ok)
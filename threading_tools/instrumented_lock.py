@@ -0,0 +1,101 @@
+#
+# instrumented_lock.py
+# A lock wrapper that records how contended a lock is and how long it is held
+#
+
+import collections
+import threading
+from .lock_utils import acquire_lock, _now
+
+LockStats = collections.namedtuple('LockStats', [
+    'acquisitions',          # Successful acquisitions
+    'failed_acquisitions',   # Non-blocking or timed acquisitions that gave up
+    'wait_time',             # Total seconds spent waiting to acquire, including failed attempts
+    'hold_time',             # Total seconds the lock was held
+    'max_hold_time',         # Longest single hold, in seconds
+    'rejections',            # Operations whose satisfaction condition was not met
+])
+
+
+class InstrumentedLock(object):
+    """
+    Wraps a lock (anything with `acquire` and `release`, such as a `threading.Lock`) and records
+    acquisition counts, time spent waiting for it and time spent holding it. It can be used
+    anywhere the wrapped lock can.
+
+    Statistics for successful acquisitions are updated while the wrapped lock is held, so they
+    need no extra locking. Failed acquisitions are recorded under a separate, private lock.
+    """
+
+    def __init__(self, lock=None):
+        self._lock = threading.Lock() if lock is None else lock
+        self._stats_lock = threading.Lock()
+        self._acquired_at = None
+        self.reset_stats()
+
+    def acquire(self, blocking=True, timeout=-1):
+        start = _now()
+        if not blocking:
+            acquired = self._lock.acquire(False)
+        else:
+            acquired = acquire_lock(self._lock, timeout)
+        acquired_at = _now()
+
+        if acquired:
+            self._acquisitions += 1
+            self._wait_time += acquired_at - start
+            self._acquired_at = acquired_at
+        else:
+            with self._stats_lock:
+                self._failed_acquisitions += 1
+                self._failed_wait_time += acquired_at - start
+        return acquired
+
+    def release(self):
+        held = _now() - self._acquired_at
+        self._hold_time += held
+        if held > self._max_hold_time:
+            self._max_hold_time = held
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+        return False
+
+    def record_rejection(self):
+        """
+        Records an operation whose satisfaction condition was not met. Must be called while
+        holding this lock.
+        """
+        self._rejections += 1
+
+    def stats(self):
+        """
+        Returns the statistics recorded so far. The snapshot is taken without acquiring the
+        wrapped lock, so while the lock is in use its fields may be a few operations apart.
+
+        :return: A `LockStats` snapshot.
+        """
+        with self._stats_lock:
+            failed_acquisitions = self._failed_acquisitions
+            failed_wait_time = self._failed_wait_time
+        return LockStats(self._acquisitions, failed_acquisitions,
+                         self._wait_time + failed_wait_time, self._hold_time, self._max_hold_time,
+                         self._rejections)
+
+    def reset_stats(self):
+        self._acquisitions = 0
+        self._wait_time = 0.0
+        self._hold_time = 0.0
+        self._max_hold_time = 0.0
+        self._rejections = 0
+        with self._stats_lock:
+            self._failed_acquisitions = 0
+            self._failed_wait_time = 0.0
@@ -4,4 +4,11 @@
 
 
 class LockAcquisitionException(Exception):
-    pass
+    """
+    Raised when a lock could not be acquired. `waited` is the number of seconds that were spent
+    waiting for the lock before giving up (0 for a non-blocking attempt), or None if unknown.
+    """
+
+    def __init__(self, message='', waited=None):
+        super(LockAcquisitionException, self).__init__(message)
+        self.waited = waited
@@ -0,0 +1,46 @@
+#
+# lock_utils.py
+# Helpers for acquiring locks with a timeout
+#
+
+import time
+
+_now = getattr(time, 'monotonic', time.time)
+
+# The longest we sleep between attempts when a lock has no native timeout support
+_MAX_POLL_INTERVAL = 0.05
+
+
+def acquire_lock(lock, timeout):
+    """
+    Acquires `lock`, waiting at most `timeout` seconds. A `timeout` of 0 does not wait at all, and
+    a negative `timeout` waits forever, as with `threading.Lock.acquire` in Python 3.
+
+    Locks whose `acquire` doesn't take a timeout (such as `threading.Lock` in Python 2) are polled
+    with an exponentially increasing sleep, capped at 50ms, the same way Python 2 implements
+    `threading.Condition.wait` with a timeout.
+
+    :return: True if the lock was acquired, False if the timeout expired first.
+    """
+    if timeout < 0:
+        return lock.acquire(True)
+    if timeout == 0:
+        return lock.acquire(False)
+
+    try:
+        return lock.acquire(True, timeout)
+    except TypeError:
+        pass
+
+    if lock.acquire(False):
+        return True
+    deadline = _now() + timeout
+    delay = 0.0005
+    while True:
+        remaining = deadline - _now()
+        if remaining <= 0:
+            return False
+        delay = min(delay * 2, remaining, _MAX_POLL_INTERVAL)
+        time.sleep(delay)
+        if lock.acquire(False):
+            return True
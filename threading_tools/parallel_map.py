@@ -0,0 +1,148 @@
+#
+# parallel_map.py
+# A lazy, chunked map over an iterable that runs on a thread pool or a process pool
+#
+
+import collections
+import functools
+import itertools
+import multiprocessing
+from .process_pool import ProcessPool, get_process_pool, _resolve, _mark_process_dispatcher
+from .thread_pool import ThreadPool, get_thread_pool
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+# The name of the shared pool used when no pool is given
+DEFAULT_POOL = 'parallel_map'
+
+
+def _run_chunk(func, chunk):
+    return [func(item) for item in chunk]
+
+
+def _run_chunk_by_name(module, name, chunk):
+    return _run_chunk(_resolve(module, name), chunk)
+
+
+def _chunks(iterable, chunk_size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parallel_map(func, iterable, chunk_size=1, max_in_flight=None, ordered=True, pool=None,
+                 processes=False):
+    """
+    Calls `func` on every item of `iterable` in parallel, and yields the results.
+
+    Items are read lazily and grouped into chunks of `chunk_size`, and each chunk is run as a
+    single task on a pool, so the cost of dispatching is paid once per chunk. At most
+    `max_in_flight` chunks are dispatched and not yet yielded at any time, so memory use doesn't
+    grow with the length of `iterable`, which may be unbounded.
+
+    If a call raises an exception, it is raised from the generator when that chunk's results are
+    reached, and no more chunks are dispatched.
+
+    :param: func - The function to call on every item. With `processes=True`, it must be defined
+                   at the top level of a module
+    :param: iterable - The items
+    :param: chunk_size [optional] - The number of items dispatched together
+    :param: max_in_flight [optional] - The maximum number of dispatched chunks whose results
+                                       haven't been yielded yet. Defaults to twice the pool's size
+    :param: ordered [optional] - If True, results are yielded in the order of `iterable`. If
+                                 False, each chunk's results are yielded as soon as it finishes
+    :param: pool [optional] - A `ThreadPool` or `ProcessPool`, or the name of a shared pool.
+                              Defaults to a shared pool called 'parallel_map'
+    :param: processes [optional] - If True, and `pool` is a name or None, a process pool is used
+                                   instead of a thread pool
+
+    :return: A generator of the results.
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1, not {0}'.format(chunk_size))
+    if max_in_flight is not None and max_in_flight < 1:
+        raise ValueError('max_in_flight must be at least 1, not {0}'.format(max_in_flight))
+
+    if not isinstance(pool, (ThreadPool, ProcessPool)):
+        name = DEFAULT_POOL if pool is None else pool
+        pool = get_process_pool(name) if processes else get_thread_pool(name)
+
+    if isinstance(pool, ProcessPool):
+        submit = functools.partial(pool.submit, _run_chunk_by_name, func.__module__, func.__name__)
+        size = pool.size or multiprocessing.cpu_count()
+    else:
+        submit = functools.partial(pool.submit, _run_chunk, func)
+        size = pool.size
+
+    if max_in_flight is None:
+        max_in_flight = 2 * size
+
+    chunks = _chunks(iterable, chunk_size)
+    if ordered:
+        return _ordered_results(submit, chunks, max_in_flight)
+    return _completed_results(submit, chunks, max_in_flight)
+
+
+def _ordered_results(submit, chunks, max_in_flight):
+    in_flight = collections.deque()
+    for chunk in itertools.islice(chunks, max_in_flight):
+        in_flight.append(submit(chunk))
+
+    while in_flight:
+        results = in_flight.popleft().result()
+        for chunk in itertools.islice(chunks, 1):
+            in_flight.append(submit(chunk))
+        for result in results:
+            yield result
+
+
+def _completed_results(submit, chunks, max_in_flight):
+    completed = queue.Queue()
+    num_in_flight = 0
+    for chunk in itertools.islice(chunks, max_in_flight):
+        submit(chunk).add_done_callback(completed.put)
+        num_in_flight += 1
+
+    while num_in_flight:
+        results = completed.get().result()
+        num_in_flight -= 1
+        for chunk in itertools.islice(chunks, 1):
+            submit(chunk).add_done_callback(completed.put)
+            num_in_flight += 1
+        for result in results:
+            yield result
+
+
+def _map_decorator(processes, func, kwargs):
+    if func is None:
+        return lambda func: _map_decorator(processes, func, kwargs)
+
+    @functools.wraps(func)
+    def wrapper(iterable):
+        return parallel_map(func, iterable, processes=processes, **kwargs)
+    if processes:
+        return _mark_process_dispatcher(wrapper, func)
+    return wrapper
+
+
+def threaded_map(func=None, **kwargs):
+    """
+    A decorator that turns a function of one item into a function of an iterable of items, which
+    returns a generator of the results and runs the calls on a thread pool. Takes the same keyword
+    arguments as `parallel_map`, e.g. `@threaded_map(chunk_size=100, ordered=False)`.
+    """
+    return _map_decorator(False, func, kwargs)
+
+
+def process_map(func=None, **kwargs):
+    """
+    Like `threaded_map`, but runs the calls on a process pool. The decorated function must be
+    defined at the top level of a module.
+    """
+    return _map_decorator(True, func, kwargs)
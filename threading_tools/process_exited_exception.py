@@ -0,0 +1,11 @@
+#
+# process_exited_exception.py
+#
+
+
+class ProcessExitedException(Exception):
+    """
+    Raised when a process exits without sending back the outcome of the function it was running,
+    for example because it was killed.
+    """
+    pass
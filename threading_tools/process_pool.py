@@ -0,0 +1,221 @@
+#
+# process_pool.py
+# A pool of warm, reusable worker processes, and a registry of named pools shared by decorators
+#
+
+import atexit
+import importlib
+import multiprocessing
+import sys
+import threading
+from .shared_memory_arguments import check_available, share_arguments, restore_arguments, \
+    close_segments, release_segments
+from .task_handle import TaskHandle
+
+# `Pool.apply_async` only accepts an `error_callback` from Python 3
+_HAS_ERROR_CALLBACK = sys.version_info[0] >= 3
+
+
+def _preload_modules(modules):
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _resolve(module, name):
+    """
+    Looks up the function `name` in `module`. A function decorated to run in another process is
+    replaced in its module by the wrapper that dispatches it, which can't be called in a worker
+    without dispatching again, so the function wrapped by that wrapper is returned instead. Other
+    decorators, above or below it, are kept.
+    """
+    func = getattr(importlib.import_module(module), name)
+    wrapper = func
+    while wrapper is not None:
+        if getattr(wrapper, '_process_dispatcher', None) is wrapper:
+            return wrapper.__wrapped__
+        wrapper = getattr(wrapper, '__wrapped__', None)
+    return func
+
+
+def _mark_process_dispatcher(wrapper, func):
+    """
+    Marks `wrapper` as a wrapper that runs `func` in another process, for `_resolve`. The marker
+    refers to the wrapper itself, because `functools.wraps` copies attributes onto the decorators
+    above it.
+    """
+    # Set by functools.wraps from Python 3.2
+    wrapper.__wrapped__ = func
+    wrapper._process_dispatcher = wrapper
+    return wrapper
+
+
+def _run_task(module, name, args, kwargs):
+    """
+    Runs in a worker process. Exceptions are returned rather than raised, so that the outcome of
+    the call always reaches the parent through the pool's result callback.
+    """
+    try:
+        return True, _resolve(module, name)(*args, **kwargs)
+    except Exception as e:
+        return False, e
+
+
+def _run_shared_task(module, name, args, kwargs):
+    """
+    Like `_run_task`, for calls with arguments in shared memory. The worker's mappings of the
+    segments are closed once the call returns; the parent destroys the segments.
+    """
+    args, kwargs, segments = restore_arguments(args, kwargs)
+    try:
+        return _run_task(module, name, args, kwargs)
+    finally:
+        # Drop the views first, or the mappings can't be closed
+        del args, kwargs
+        close_segments(segments)
+
+
+class ProcessPool(object):
+    """
+    A pool of `size` worker processes that stay alive between calls, so that each call pays for
+    pickling its arguments and result rather than for starting and importing a new interpreter.
+    The workers are started on the first submitted call.
+
+    Functions are sent to the workers by module and name, so they must be defined at the top
+    level of a module, and their arguments and return values must be picklable.
+    """
+
+    def __init__(self, size=None, name=None, start_method=None, preload=None,
+                 max_tasks_per_child=None, shared_memory_threshold=None):
+        """
+        :param: size [optional] - The number of worker processes. Defaults to the number of CPUs
+        :param: name [optional] - A name for the pool
+        :param: start_method [optional] - 'fork', 'spawn' or 'forkserver'. Uses the platform
+                                          default if None. Requires Python 3.4+
+        :param: preload [optional] - Names of modules to import in each worker before it runs
+                                     any calls. With 'forkserver' they are imported once in the
+                                     server, and every worker is forked with them loaded
+        :param: max_tasks_per_child [optional] - Replaces each worker with a fresh process after
+                                                 it has run this many calls, which bounds the
+                                                 memory a long-running worker can accumulate
+        :param: shared_memory_threshold [optional] - Arguments that are NumPy arrays or other
+                                                     buffers of at least this many bytes are
+                                                     copied into shared memory, and the worker
+                                                     gets a view of them instead of a pickled
+                                                     copy. The segments are destroyed when the
+                                                     call finishes. Requires Python 3.8+
+        """
+        if size is not None and size < 1:
+            raise ValueError('size must be at least 1, not {0}'.format(size))
+        if start_method is not None and not hasattr(multiprocessing, 'get_context'):
+            raise ValueError('start_method requires Python 3.4 or later')
+        if shared_memory_threshold is not None:
+            check_available()
+
+        self.size = size
+        self.name = name
+        self.start_method = start_method
+        self.preload = tuple(preload or ())
+        self.max_tasks_per_child = max_tasks_per_child
+        self.shared_memory_threshold = shared_memory_threshold
+        self._pool = None
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Queues `func(*args, **kwargs)` to run on a worker process.
+
+        :return: A `TaskHandle` for the call.
+        """
+        handle = TaskHandle()
+
+        def on_result(outcome):
+            succeeded, value = outcome
+            if succeeded:
+                handle._set_result(value)
+            else:
+                handle._set_exception(value)
+
+        pool = self._get_pool()
+        runner = _run_task
+        segments = []
+        if self.shared_memory_threshold is not None:
+            args, kwargs, segments = share_arguments(args, kwargs, self.shared_memory_threshold)
+            if segments:
+                runner = _run_shared_task
+                handle.add_done_callback(lambda _: release_segments(segments))
+
+        task_args = (func.__module__, func.__name__, args, kwargs)
+        try:
+            if _HAS_ERROR_CALLBACK:
+                # Catches failures the worker can't report itself, such as an unpicklable result
+                pool.apply_async(runner, task_args, callback=on_result,
+                                 error_callback=handle._set_exception)
+            else:
+                pool.apply_async(runner, task_args, callback=on_result)
+        except Exception:
+            release_segments(segments)
+            raise
+        return handle
+
+    def shutdown(self, wait=True):
+        """
+        Stops accepting new calls. Calls that are already queued still run.
+
+        :param: wait [optional] - If True, waits for the queued calls to finish and the workers
+                                  to exit
+        """
+        with self._lock:
+            self._shutdown = True
+            pool = self._pool
+        if pool is not None:
+            pool.close()
+            if wait:
+                pool.join()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError('Cannot submit to a ProcessPool that has been shut down')
+            if self._pool is None:
+                self._pool = self._create_pool()
+            return self._pool
+
+    def _create_pool(self):
+        if self.start_method is None:
+            context = multiprocessing
+        else:
+            context = multiprocessing.get_context(self.start_method)
+            if self.start_method == 'forkserver' and self.preload:
+                context.set_forkserver_preload(list(self.preload))
+        return context.Pool(self.size, _preload_modules, (self.preload,),
+                            self.max_tasks_per_child)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_process_pool(name, size=None, start_method=None, preload=None, max_tasks_per_child=None,
+                     shared_memory_threshold=None):
+    """
+    Returns the shared `ProcessPool` called `name`, creating it with the given options if it
+    doesn't exist yet. Later calls with the same name return the same pool, whatever options they
+    pass.
+    """
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = ProcessPool(size, name, start_method, preload,
+                                              max_tasks_per_child, shared_memory_threshold)
+        return pool
+
+
+def _shutdown_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.shutdown(wait=True)
+
+
+atexit.register(_shutdown_pools)
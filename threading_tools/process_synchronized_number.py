@@ -0,0 +1,39 @@
+#
+# process_synchronized_number.py
+# A SynchronizedNumber whose value is shared between processes
+#
+
+import multiprocessing
+from .synchronized_number import SynchronizedNumber
+
+
+class ProcessSynchronizedNumber(SynchronizedNumber, object):
+    """
+    A `SynchronizedNumber` that stays synchronized across processes. The value lives in shared
+    memory (an mmap'd `multiprocessing.sharedctypes.RawValue`) and is guarded by a
+    `multiprocessing.Lock`, so every method of `SynchronizedNumber` works the same way from any
+    process it is shared with.
+
+    Share it by passing it as an argument to a `process_fn` function (or any
+    `multiprocessing.Process`). Updates go straight to shared memory, with no `Manager` process
+    and no inter-process round-trip per operation.
+
+    Blocking methods such as `wait_until` are only woken by changes made from the same process.
+    """
+
+    def __init__(self, initial_value, should_block_thread=True, timeout=None, typecode='d'):
+        self.should_block_thread = should_block_thread
+        self.timeout = timeout
+        self._lock = multiprocessing.Lock()
+        self._waiters = []
+        self._instrumented = False
+        self._optimistic_reads = False
+        self._shared_value = multiprocessing.RawValue(typecode, initial_value)
+
+    @property
+    def value(self):
+        return self._shared_value.value
+
+    @value.setter
+    def value(self, new_value):
+        self._shared_value.value = new_value
@@ -0,0 +1,10 @@
+#
+# rate_limit_exceeded_exception.py
+#
+
+
+class RateLimitExceededException(Exception):
+    """
+    Raised by a `rate_limited` function when the rate limiter did not grant a call in time.
+    """
+    pass
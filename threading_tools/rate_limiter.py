@@ -0,0 +1,141 @@
+#
+# rate_limiter.py
+# A token-bucket rate limiter built on SynchronizedNumber, and a decorator that throttles calls
+#
+
+import functools
+import time
+from .lock_utils import _now
+from .rate_limit_exceeded_exception import RateLimitExceededException
+from .synchronized_number import SynchronizedNumber
+
+
+#
+# The bucket is tracked as a single number: the time at which it will next be full. Tokens are
+# never added by a timer; instead, each request works out how many have been refilled since that
+# time while it holds the lock. A request for `cost` seconds' worth of tokens is granted if the
+# bucket, after taking them, would be no more than `limit` seconds from being full.
+#
+
+def _grant(full_at, request):
+    now, cost, limit = request
+    return max(full_at, now) + cost
+
+
+def _can_grant(full_at, request):
+    now, cost, limit = request
+    # Subtract before adding, so a large clock value can't round a full bucket past `limit`
+    return max(full_at - now, 0) + cost <= limit
+
+
+class RateLimiter(object):
+    """
+    A token bucket that holds up to `capacity` tokens and refills at `rate` tokens per second. It
+    starts full. Each call takes tokens from the bucket, so up to `capacity` calls can be made at
+    once, and after that calls are granted at `rate` per second.
+
+    There is no refill thread: the refill is computed from the elapsed time whenever tokens are
+    requested, under the lock of a single `SynchronizedNumber`, so a limiter costs nothing while
+    it is idle and thousands of them can be created cheaply.
+    """
+    __slots__ = ('rate', 'capacity', '_interval', '_window', '_full_at')
+
+    def __init__(self, rate, capacity=None):
+        """
+        :param: rate - Tokens added per second
+        :param: capacity [optional] - The most tokens the bucket holds. Defaults to `rate`, or 1
+                                      if `rate` is less than 1
+        """
+        if rate <= 0:
+            raise ValueError('rate must be positive, not {0}'.format(rate))
+        if capacity is None:
+            capacity = max(rate, 1)
+        if capacity <= 0:
+            raise ValueError('capacity must be positive, not {0}'.format(capacity))
+
+        self.rate = rate
+        self.capacity = capacity
+        self._interval = 1.0 / rate
+        self._window = capacity * self._interval
+        self._full_at = SynchronizedNumber(_now())
+
+    def try_acquire(self, tokens=1):
+        """
+        Takes `tokens` tokens if they are available right now.
+
+        :return: True if the tokens were taken, False if not.
+        """
+        request = (_now(), tokens * self._interval, self._window)
+        return self._full_at._operate(_grant, request, _can_grant, request)
+
+    def acquire(self, tokens=1, timeout=None):
+        """
+        Takes `tokens` tokens, waiting for the bucket to refill if necessary. Callers are granted
+        tokens in the order they call, because a waiting caller reserves its tokens up front and
+        then sleeps until they have been refilled.
+
+        :param: tokens [optional] - The number of tokens to take
+        :param: timeout [optional] - The longest to wait, in seconds. If the tokens won't be
+                                     available in time, returns False straight away without
+                                     taking any. Waits as long as needed if None
+        :return: True once the tokens were taken, False if they could not be taken in time.
+        """
+        if tokens > self.capacity:
+            raise ValueError('Cannot acquire {0} tokens from a bucket of capacity {1}'.format(
+                tokens, self.capacity))
+
+        now = _now()
+        cost = tokens * self._interval
+        with self._full_at.transaction() as transaction:
+            full_at = max(transaction.value, now) + cost
+            wait = full_at - now - self._window
+            if timeout is not None and wait > timeout:
+                return False
+            transaction.set_value(full_at)
+
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    def available(self):
+        """
+        :return: The number of tokens in the bucket right now. Other threads may take them before
+                 the caller does.
+        """
+        return max(self.capacity - max(self._full_at.value - _now(), 0) * self.rate, 0)
+
+    def __repr__(self):
+        return 'RateLimiter({0!r}, capacity={1!r})'.format(self.rate, self.capacity)
+
+
+def rate_limited(limiter, tokens=1, timeout=None):
+    """
+    A decorator that makes each call to the function take `tokens` tokens from `limiter` first.
+
+    Callers wait for the tokens as long as needed, or at most `timeout` seconds, after which
+    `RateLimitExceededException` is raised instead of calling the function. With `timeout=0`,
+    calls are rejected as soon as the limit is reached.
+
+    To throttle calls as they are dispatched, put `@rate_limited` above `@threaded_fn`, so that
+    callers wait before a thread is started. Below it, threads are started straight away and wait
+    for the tokens themselves.
+
+    :param: limiter - A `RateLimiter`, or a rate in calls per second to create one with
+    """
+    if not isinstance(limiter, RateLimiter):
+        limiter = RateLimiter(limiter)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if timeout == 0:
+                acquired = limiter.try_acquire(tokens)
+            else:
+                acquired = limiter.acquire(tokens, timeout)
+            if not acquired:
+                raise RateLimitExceededException(
+                    'The rate limit for {0} was exceeded'.format(func.__name__))
+            return func(*args, **kwargs)
+        wrapper.limiter = limiter
+        return wrapper
+    return decorator
@@ -0,0 +1,192 @@
+#
+# result_process.py
+# A process that sends the return value or exception of the function it runs back to its parent
+#
+
+import multiprocessing
+import threading
+from .lock_utils import acquire_lock
+from .process_exited_exception import ProcessExitedException
+from .process_pool import _resolve
+from .shared_memory_arguments import check_available, share_arguments, restore_arguments, \
+    has_shared_arguments, close_segments, release_segments
+from .task_handle import TaskHandle
+from .task_timeout_exception import TaskTimeoutException
+
+
+def _uses_fork():
+    """
+    :return: True if new processes are started by forking.
+    """
+    method = multiprocessing.get_start_method(allow_none=True)
+    if method is None:
+        # The first method is the platform's default. Asking for the start method directly
+        # would fix it, so that it could no longer be changed.
+        method = multiprocessing.get_all_start_methods()[0]
+    return method == 'fork'
+
+
+class ResultProcess(multiprocessing.Process):
+    """
+    A `multiprocessing.Process` that runs `target(*args, **kwargs)` and sends its return value, or
+    the exception it raised, back to the parent over a one-way pipe created for this process. The
+    outcome can be collected with `result()` or `exception()`, or handed to callbacks registered
+    with `add_done_callback()`. Return values and exceptions must be picklable.
+
+    `join()` reads the outcome before waiting for the process to exit, since a process can't exit
+    while a large result is still waiting to be read from the pipe.
+
+    If `shared_memory_threshold` is set, and the process is started with 'spawn' or 'forkserver'
+    (which pickle the arguments), arguments that are NumPy arrays or other buffers of at least
+    that many bytes are passed through shared memory instead, and destroyed when the function
+    finishes. Forked processes already share the parent's memory, so nothing is copied for them.
+    """
+
+    def __init__(self, target, args=(), kwargs=None, name=None, shared_memory_threshold=None):
+        multiprocessing.Process.__init__(self, name=name)
+        if shared_memory_threshold is not None:
+            check_available()
+        self._func = target
+        self._func_args = args
+        self._func_kwargs = kwargs or {}
+        self._shared_memory_threshold = shared_memory_threshold
+        self._reader, self._writer = multiprocessing.Pipe(False)
+        self._handle = TaskHandle()
+        self._receive_lock = threading.Lock()
+        self._watcher = None
+        self._started = False
+
+    def __getstate__(self):
+        # Only used by the 'spawn' and 'forkserver' start methods, which pickle the process to
+        # send it to the child. The parent-side state can't be pickled, and the function is sent
+        # by module and name, so that a function decorated at the top level of a module is found
+        # again in the child.
+        state = self.__dict__.copy()
+        for key in ('_reader', '_handle', '_receive_lock', '_watcher', '_started'):
+            del state[key]
+        state['_func'] = (self._func.__module__, self._func.__name__)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._func = _resolve(*self._func)
+
+    def start(self):
+        segments = []
+        if self._shared_memory_threshold is not None and not _uses_fork():
+            self._func_args, self._func_kwargs, segments = share_arguments(
+                self._func_args, self._func_kwargs, self._shared_memory_threshold)
+
+        try:
+            multiprocessing.Process.start(self)
+        except Exception:
+            release_segments(segments)
+            raise
+        self._started = True
+        # Only the child writes. Closing the parent's copy means the reader sees EOF if the child
+        # exits without writing.
+        self._writer.close()
+        if segments:
+            self.add_done_callback(lambda _: release_segments(segments))
+
+    def run(self):
+        args, kwargs, segments = self._func_args, self._func_kwargs, []
+        if has_shared_arguments(args, kwargs):
+            args, kwargs, segments = restore_arguments(args, kwargs)
+        try:
+            outcome = (True, self._func(*args, **kwargs))
+        except Exception as e:
+            outcome = (False, e)
+        if segments:
+            # Drop the views first, or the mappings can't be closed
+            del args, kwargs
+            self._func_args = self._func_kwargs = None
+            close_segments(segments)
+        try:
+            self._writer.send(outcome)
+        except Exception as e:
+            # The return value or exception couldn't be pickled
+            self._writer.send((False, RuntimeError('Could not send the outcome of {0}: {1!r}'
+                                                   .format(self._func.__name__, e))))
+        finally:
+            self._writer.close()
+
+    def join(self, timeout=None):
+        self._receive(timeout)
+        multiprocessing.Process.join(self, timeout)
+
+    def done(self):
+        """
+        :return: True if the function has finished, successfully or not.
+        """
+        return self._receive(0)
+
+    def result(self, timeout=None):
+        """
+        Waits for the function to finish and returns its return value. If it raised an exception,
+        that exception is raised here.
+
+        :param: timeout [optional] - The maximum number of seconds to wait. Waits forever if None.
+        :return: The return value of the function.
+        """
+        if not self._receive(timeout):
+            raise TaskTimeoutException('The task did not finish within {0}s'.format(timeout))
+        return self._handle.result()
+
+    def exception(self, timeout=None):
+        """
+        Waits for the function to finish and returns the exception it raised.
+
+        :param: timeout [optional] - The maximum number of seconds to wait. Waits forever if None.
+        :return: The exception raised by the function, or None if it returned normally.
+        """
+        if not self._receive(timeout):
+            raise TaskTimeoutException('The task did not finish within {0}s'.format(timeout))
+        return self._handle.exception()
+
+    def add_done_callback(self, callback):
+        """
+        Arranges for `callback(handle)` to be called once the function finishes, where `handle`
+        is the process's `TaskHandle`. If it has already finished, `callback` is called straight
+        away on the calling thread; otherwise it is called on a thread in the parent that waits
+        for the outcome, which is started by the first call to this method.
+        """
+        with self._receive_lock:
+            if self._watcher is None and not self._handle.done():
+                self._watcher = threading.Thread(target=self._receive)
+                self._watcher.daemon = True
+                self._watcher.start()
+        self._handle.add_done_callback(callback)
+
+    def _receive(self, timeout=None):
+        """
+        Reads the outcome from the pipe, waiting at most `timeout` seconds, or forever if None.
+
+        :return: True if the outcome has been received.
+        """
+        if self._handle.done():
+            return True
+        if not self._started:
+            return False
+        if not acquire_lock(self._receive_lock, -1 if timeout is None else timeout):
+            return False
+        try:
+            if self._handle.done() or not self._reader.poll(timeout):
+                return self._handle.done()
+            try:
+                succeeded, value = self._reader.recv()
+            except EOFError:
+                self._reader.close()
+                multiprocessing.Process.join(self)
+                self._handle._set_exception(ProcessExitedException(
+                    'The process exited with exit code {0} before sending back a result'
+                    .format(self.exitcode)))
+            else:
+                self._reader.close()
+                if succeeded:
+                    self._handle._set_result(value)
+                else:
+                    self._handle._set_exception(value)
+            return True
+        finally:
+            self._receive_lock.release()
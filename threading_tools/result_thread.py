@@ -0,0 +1,62 @@
+#
+# result_thread.py
+# A thread that keeps the return value or exception of the function it runs
+#
+
+import threading
+from .task_handle import TaskHandle
+
+
+class ResultThread(threading.Thread):
+    """
+    A `threading.Thread` that runs `target(*args, **kwargs)` and records its outcome, which can be
+    collected with `result()` or `exception()`, or handed to callbacks registered with
+    `add_done_callback()`. Exceptions raised by `target` are captured rather than printed.
+    """
+
+    def __init__(self, target, args=(), kwargs=None, name=None):
+        threading.Thread.__init__(self, name=name)
+        self._func = target
+        self._func_args = args
+        self._func_kwargs = kwargs or {}
+        self._handle = TaskHandle()
+
+    def run(self):
+        try:
+            self._handle._run(self._func, self._func_args, self._func_kwargs)
+        finally:
+            # Don't keep the arguments alive for as long as the thread object is referenced
+            del self._func, self._func_args, self._func_kwargs
+
+    def done(self):
+        """
+        :return: True if the function has finished, successfully or not.
+        """
+        return self._handle.done()
+
+    def result(self, timeout=None):
+        """
+        Waits for the function to finish and returns its return value. If it raised an exception,
+        that exception is raised here.
+
+        :param: timeout [optional] - The maximum number of seconds to wait. Waits forever if None.
+        :return: The return value of the function.
+        """
+        return self._handle.result(timeout)
+
+    def exception(self, timeout=None):
+        """
+        Waits for the function to finish and returns the exception it raised.
+
+        :param: timeout [optional] - The maximum number of seconds to wait. Waits forever if None.
+        :return: The exception raised by the function, or None if it returned normally.
+        """
+        return self._handle.exception(timeout)
+
+    def add_done_callback(self, callback):
+        """
+        Arranges for `callback(handle)` to be called once the function finishes, where `handle`
+        is the thread's `TaskHandle`. If it has already finished, `callback` is called straight
+        away on the calling thread; otherwise it is called on this thread.
+        """
+        self._handle.add_done_callback(callback)
@@ -0,0 +1,15 @@
+#
+# runtime.py
+# Facts about the running interpreter that change how the package behaves
+#
+
+import sys
+
+
+def gil_enabled():
+    """
+    :return: False when running on a free-threaded build of CPython (3.13+) with the GIL disabled,
+             and True otherwise.
+    """
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return True if is_gil_enabled is None else bool(is_gil_enabled())
@@ -0,0 +1,77 @@
+#
+# sequence_lock.py
+# A lock wrapper that counts acquisitions, so readers can read without the lock and detect writes
+#
+
+from .lock_utils import acquire_lock
+from .runtime import gil_enabled
+
+# How many times an optimistic read is retried before falling back to taking the lock. With the
+# GIL, a writer can't make progress while a reader spins, so readers give up quickly. Without it,
+# the writer runs on another core and is usually done within a few retries
+OPTIMISTIC_READ_ATTEMPTS = 3 if gil_enabled() else 64
+
+
+class SequenceLock(object):
+    """
+    Wraps a lock (anything with `acquire` and `release`, such as a `threading.Lock`) and adds one
+    to `sequence` each time it is acquired and each time it is released, as in a seqlock. The
+    sequence is odd while the lock is held and even while it isn't, so a reader can read what the
+    lock guards without acquiring it: it reads an even sequence, reads the data, and checks that
+    the sequence hasn't changed, retrying otherwise (see `read_optimistically`).
+
+    Every other attribute, such as `record_rejection` on an `InstrumentedLock`, is passed through
+    to the wrapped lock.
+
+    `sequence` is only changed while the lock is held. Readers rely on attribute reads and writes
+    being atomic, which CPython guarantees with or without the GIL.
+    """
+    __slots__ = ('_lock', 'sequence')
+
+    def __init__(self, lock):
+        self._lock = lock
+        self.sequence = 0
+
+    def acquire(self, blocking=True, timeout=-1):
+        if not blocking:
+            acquired = self._lock.acquire(False)
+        else:
+            acquired = acquire_lock(self._lock, timeout)
+        if acquired:
+            self.sequence += 1
+        return acquired
+
+    def release(self):
+        self.sequence += 1
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self._lock, name)
+
+
+def read_optimistically(locks, read):
+    """
+    Calls `read()` without acquiring `locks`, a sequence of `SequenceLock`s, and checks that none
+    of them was held or acquired while it ran.
+
+    :return: A tuple of the result of `read()`, or None if every attempt overlapped a writer.
+    """
+    for _ in range(OPTIMISTIC_READ_ATTEMPTS):
+        sequences = [lock.sequence for lock in locks]
+        if any(sequence & 1 for sequence in sequences):
+            continue
+        result = read()
+        if all(lock.sequence == sequence for lock, sequence in zip(locks, sequences)):
+            return (result,)
+    return None
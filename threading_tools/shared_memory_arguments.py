@@ -0,0 +1,165 @@
+#
+# shared_memory_arguments.py
+# Passes large buffer arguments to other processes through shared memory instead of pickling them
+#
+
+import sys
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# From Python 3.13, attaching to a segment can skip registering it with the resource tracker
+_ATTACH_KWARGS = {'track': False} if sys.version_info >= (3, 13) else {}
+
+# The formats `memoryview.cast` can rebuild a buffer with in the receiving process
+_CAST_FORMATS = frozenset('bBhHiIlLqQnNfdc?')
+
+
+class _SharedArgument(object):
+    """
+    Stands in for a large argument that was copied into a shared memory segment. It is pickled
+    instead of the argument, and the receiving process rebuilds the argument as a view of the
+    segment, without copying it.
+    """
+    __slots__ = ('segment_name', 'nbytes', 'format', 'shape', 'dtype')
+
+    def __init__(self, segment_name, nbytes, format, shape, dtype):
+        self.segment_name = segment_name
+        self.nbytes = nbytes
+        self.format = format
+        self.shape = shape
+        self.dtype = dtype
+
+    def __getstate__(self):
+        return (self.segment_name, self.nbytes, self.format, self.shape, self.dtype)
+
+    def __setstate__(self, state):
+        self.segment_name, self.nbytes, self.format, self.shape, self.dtype = state
+
+
+def check_available():
+    if shared_memory is None:
+        raise ImportError('Passing arguments through shared memory requires Python 3.8+')
+
+
+def _as_buffer(value):
+    """
+    :return: A C-contiguous memoryview of `value`, or None if it doesn't support the buffer
+             protocol or can't be rebuilt from shared memory.
+    """
+    try:
+        view = memoryview(value)
+    except TypeError:
+        return None
+    if not view.c_contiguous or view.format not in _CAST_FORMATS:
+        return None
+    return view
+
+
+def _share(value, threshold, segments):
+    """
+    Copies `value` into a new shared memory segment, appended to `segments`, if it is a buffer of
+    at least `threshold` bytes.
+
+    :return: A `_SharedArgument` for the segment, or `value` itself if it isn't shared.
+    """
+    is_array = numpy is not None and isinstance(value, numpy.ndarray)
+    if is_array:
+        if value.nbytes < threshold or value.dtype.hasobject:
+            return value
+        segment = shared_memory.SharedMemory(create=True, size=max(value.nbytes, 1))
+        segments.append(segment)
+        numpy.ndarray(value.shape, value.dtype, buffer=segment.buf)[...] = value
+        return _SharedArgument(segment.name, value.nbytes, None, value.shape, value.dtype.str)
+
+    view = _as_buffer(value)
+    if view is None or view.nbytes < threshold:
+        return value
+    segment = shared_memory.SharedMemory(create=True, size=max(view.nbytes, 1))
+    segments.append(segment)
+    segment.buf[:view.nbytes] = view.cast('B')
+    return _SharedArgument(segment.name, view.nbytes, view.format, view.shape, None)
+
+
+def share_arguments(args, kwargs, threshold):
+    """
+    Replaces every argument that is a NumPy array or other C-contiguous buffer (such as `bytes`,
+    `bytearray` or `array.array`) of at least `threshold` bytes with a `_SharedArgument`,
+    copying its contents into a new shared memory segment.
+
+    :return: The new `(args, kwargs, segments)`. The caller owns the segments, and must pass them
+             to `release_segments` once the receiving process has finished with them.
+    """
+    segments = []
+    try:
+        args = tuple(_share(value, threshold, segments) for value in args)
+        kwargs = dict((key, _share(value, threshold, segments)) for key, value in kwargs.items())
+    except BaseException:
+        release_segments(segments)
+        raise
+    return args, kwargs, segments
+
+
+def _restore(value, segments):
+    if not isinstance(value, _SharedArgument):
+        return value
+    segment = shared_memory.SharedMemory(value.segment_name, **_ATTACH_KWARGS)
+    segments.append(segment)
+    if value.dtype is not None:
+        return numpy.ndarray(value.shape, numpy.dtype(value.dtype), buffer=segment.buf)
+    return segment.buf[:value.nbytes].cast(value.format, value.shape)
+
+
+def restore_arguments(args, kwargs):
+    """
+    Replaces every `_SharedArgument` with a view of its shared memory segment: a NumPy array for
+    arrays, and a `memoryview` with the original format and shape for other buffers.
+
+    :return: The new `(args, kwargs, segments)`. Pass the segments to `close_segments` once the
+             arguments are no longer used.
+    """
+    segments = []
+    args = tuple(_restore(value, segments) for value in args)
+    kwargs = dict((key, _restore(value, segments)) for key, value in kwargs.items())
+    return args, kwargs, segments
+
+
+def has_shared_arguments(args, kwargs):
+    for value in args:
+        if isinstance(value, _SharedArgument):
+            return True
+    for value in kwargs.values():
+        if isinstance(value, _SharedArgument):
+            return True
+    return False
+
+
+def close_segments(segments):
+    """
+    Closes this process's mappings of `segments`. A mapping that is still referenced, for example
+    by an array the function returned, is left open, and is closed when it is garbage collected.
+    """
+    for segment in segments:
+        try:
+            segment.close()
+        except BufferError:
+            pass
+
+
+def release_segments(segments):
+    """
+    Closes and destroys `segments`, which were created by `share_arguments`.
+    """
+    for segment in segments:
+        close_segments([segment])
+        try:
+            segment.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,165 @@
+#
+# single_flight.py
+# A decorator that coalesces concurrent identical calls into one, and optionally caches results
+#
+
+import collections
+import functools
+import threading
+from .lock_utils import _now
+from .result_process import ResultProcess
+from .result_thread import ResultThread
+from .task_handle import TaskHandle
+
+CacheStats = collections.namedtuple('CacheStats', [
+    'hits',         # Calls answered from the cache
+    'misses',       # Calls that ran the function
+    'coalesced',    # Calls that shared the result of an identical call already in flight
+    'size',         # Results in the cache now
+])
+
+# Separates positional from keyword arguments in cache keys
+_KWARGS_MARK = object()
+
+# The handles returned by `threaded_fn` and `process_fn`
+_HANDLE_TYPES = (TaskHandle, ResultThread, ResultProcess)
+
+
+def _make_key(args, kwargs):
+    if kwargs:
+        return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+    return args
+
+
+class _SingleFlight(object):
+    """
+    The state behind a `single_flight` function: the calls in flight, keyed by their arguments,
+    and the cache. Both are only changed while holding `lock`.
+    """
+
+    def __init__(self, func, cache_size, ttl):
+        self.func = func
+        self.cache_size = cache_size
+        self.ttl = ttl
+        self.caching = cache_size is not None or ttl is not None
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.cache = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __call__(self, *args, **kwargs):
+        key = _make_key(args, kwargs)
+        with self.lock:
+            if self.caching:
+                cached = self._get_cached(key)
+                if cached is not None:
+                    self.hits += 1
+                    return cached[0]
+
+            flight = self.in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.in_flight[key] = TaskHandle()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return flight.result()
+
+        try:
+            result = self.func(*args, **kwargs)
+        except Exception as e:
+            self._land(key, flight)
+            flight._set_exception(e)
+            raise
+
+        if isinstance(result, _HANDLE_TYPES):
+            # The call was dispatched to run elsewhere. Callers share its handle, and it stays in
+            # flight until it finishes.
+            flight._set_result(result)
+            result.add_done_callback(
+                lambda handle: self._land(key, flight, result, handle.exception() is None))
+        else:
+            self._land(key, flight, result, True)
+            flight._set_result(result)
+        return result
+
+    def _get_cached(self, key):
+        """
+        :return: A tuple of the cached result, or None if there isn't an unexpired one.
+        """
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        result, expires = entry
+        if expires is not None and expires <= _now():
+            del self.cache[key]
+            return None
+        # Move the entry to the end, as the most recently used
+        del self.cache[key]
+        self.cache[key] = entry
+        return (result,)
+
+    def _land(self, key, flight, result=None, cache=False):
+        """
+        Ends the call in flight for `key`, and caches `result` if `cache` is True and caching is
+        enabled.
+        """
+        with self.lock:
+            if self.in_flight.get(key) is flight:
+                del self.in_flight[key]
+            if cache and self.caching:
+                expires = None if self.ttl is None else _now() + self.ttl
+                self.cache.pop(key, None)
+                self.cache[key] = (result, expires)
+                if self.cache_size is not None and len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+
+    def stats(self):
+        """
+        :return: A `CacheStats` snapshot.
+        """
+        with self.lock:
+            return CacheStats(self.hits, self.misses, self.coalesced, len(self.cache))
+
+    def clear(self):
+        """
+        Empties the cache and resets the statistics. Calls in flight are not affected.
+        """
+        with self.lock:
+            self.cache.clear()
+            self.hits = self.misses = self.coalesced = 0
+
+
+def single_flight(func=None, cache_size=None, ttl=None):
+    """
+    A decorator that coalesces concurrent calls with identical arguments: while a call is running,
+    identical calls wait for it and return its result (or raise its exception) instead of running
+    the function again. Arguments must be hashable.
+
+    If `cache_size` or `ttl` is given, successful results are also cached, keeping at most
+    `cache_size` results (evicting the least recently used) for at most `ttl` seconds each.
+    Exceptions are never cached.
+
+    Placed above `@threaded_fn` or `@process_fn`, identical calls share one handle, which stays in
+    flight until the dispatched call finishes, and finished handles are what is cached. The
+    decorated function has `stats()`, returning `CacheStats`, and `clear()`.
+    """
+    if func is None:
+        return functools.partial(single_flight, cache_size=cache_size, ttl=ttl)
+    if cache_size is not None and cache_size < 1:
+        raise ValueError('cache_size must be at least 1, not {0}'.format(cache_size))
+
+    flights = _SingleFlight(func, cache_size, ttl)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return flights(*args, **kwargs)
+    wrapper.stats = flights.stats
+    wrapper.clear = flights.clear
+    # Set by functools.wraps from Python 3.2
+    wrapper.__wrapped__ = func
+    return wrapper
@@ -0,0 +1,189 @@
+#
+# striped_synchronized_number.py
+# A threadsafe number that spreads contended updates across several independently locked cells
+#
+
+import itertools
+import multiprocessing
+import threading
+from .lock_acquisition_exception import LockAcquisitionException
+from .synchronized_number import SynchronizedNumber
+
+# Every thread gets its own starting cell, handed out round-robin the first time it touches any
+# StripedSynchronizedNumber. Threads that collide on a cell move on to the next one.
+_probe_counter = itertools.count()
+_thread_probe = threading.local()
+
+
+def _get_probe():
+    try:
+        return _thread_probe.probe
+    except AttributeError:
+        _thread_probe.probe = next(_probe_counter)
+        return _thread_probe.probe
+
+
+def _default_num_stripes():
+    try:
+        return max(4, multiprocessing.cpu_count())
+    except NotImplementedError:
+        return 4
+
+
+class StripedSynchronizedNumber(object):
+    """
+    A threadsafe number in the spirit of Java's `LongAdder`. The value is split across
+    `num_stripes` cells, each guarded by its own lock, so threads that are incrementing at the same
+    time rarely wait on each other. Reading `value` sums all the cells, which makes reads slower
+    than on a `SynchronizedNumber`; use this class for write-heavy counters.
+
+    Striping only helps when threads run in parallel, as on free-threaded CPython. With the GIL
+    an increment is slower than on a `SynchronizedNumber` (see `benchmarks.bench_striped_number`).
+    """
+
+    def __init__(self, initial_value, num_stripes=None, should_block_thread=True):
+        if num_stripes is None:
+            num_stripes = _default_num_stripes()
+        if num_stripes < 1:
+            raise ValueError('num_stripes must be at least 1, not {0}'.format(num_stripes))
+
+        self.should_block_thread = should_block_thread
+        self._num_stripes = num_stripes
+        self._locks = [threading.Lock() for _ in range(num_stripes)]
+        self._cells = [0] * num_stripes
+        self._cells[0] = initial_value
+
+    @property
+    def num_stripes(self):
+        return self._num_stripes
+
+    @property
+    def value(self):
+        """
+        The sum of all cells. Cells are read one at a time without locking, so a read that races
+        with writers may miss updates that are still in progress; use `consistent_value` if you
+        need a point-in-time total.
+        """
+        return sum(self._cells)
+
+    def consistent_value(self):
+        """
+        Returns the value of this number while holding every cell's lock, so no update can be
+        half-applied. This blocks all writers for the duration of the read.
+
+        :return: The value of this number.
+        """
+        self._acquire_all()
+        try:
+            return sum(self._cells)
+        finally:
+            self._release_all()
+
+    def set_value(self, new_value):
+        """
+        Sets the value of this number. Every cell's lock is held while the value is replaced.
+
+        :param: new_value - The value to set
+        :return: True if value is successfully set, False if not.
+        """
+        if not self._acquire_all():
+            return False
+        try:
+            self._cells[0] = new_value
+            for i in range(1, self._num_stripes):
+                self._cells[i] = 0
+            return True
+        finally:
+            self._release_all()
+
+    def increment(self, incr_value):
+        """
+        Increments the value of this number.
+
+        :param: incr_value - The value to increment by
+        :return: True if value is incremented successfully, False if not.
+        """
+        num_stripes = self._num_stripes
+        probe = _get_probe()
+
+        # Look for an uncontended cell first, starting from this thread's own cell
+        for offset in range(num_stripes):
+            index = (probe + offset) % num_stripes
+            lock = self._locks[index]
+            if lock.acquire(False):
+                try:
+                    self._cells[index] += incr_value
+                finally:
+                    lock.release()
+                if offset:
+                    _thread_probe.probe = index
+                return True
+
+        if not self.should_block_thread:
+            return False
+
+        index = probe % num_stripes
+        lock = self._locks[index]
+        lock.acquire()
+        try:
+            self._cells[index] += incr_value
+        finally:
+            lock.release()
+        return True
+
+    def decrement(self, decr_value):
+        """
+        Decrements the value of this number.
+
+        :param: decr_value - The value to decremented by
+        :return: True if value is decremented successfully, False if not.
+        """
+        return self.increment(-decr_value)
+
+    def _acquire_all(self):
+        # Locks are always taken in index order, so two threads doing this can't deadlock
+        for i, lock in enumerate(self._locks):
+            if not lock.acquire(self.should_block_thread):
+                for acquired_lock in self._locks[:i]:
+                    acquired_lock.release()
+                return False
+        return True
+
+    def _release_all(self):
+        for lock in self._locks:
+            lock.release()
+
+    def __str__(self):
+        return str(self.value)
+
+    def __repr__(self):
+        return str(self.value)
+
+    def __eq__(self, other):
+        if isinstance(other, (SynchronizedNumber, StripedSynchronizedNumber)):
+            return self.value == other.value
+        else:
+            return self.value == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    #
+    # Default functions that modify existing StripedSynchronizedNumber object
+    #
+
+    def __iadd__(self, other):
+        add_value = other.value if isinstance(other, (SynchronizedNumber,
+                                                      StripedSynchronizedNumber)) else other
+        success = self.increment(add_value)
+        if not success:
+            raise LockAcquisitionException('Unable to acquire lock, so += operation failed')
+        return self
+
+    def __isub__(self, other):
+        sub_value = other.value if isinstance(other, (SynchronizedNumber,
+                                                      StripedSynchronizedNumber)) else other
+        success = self.decrement(sub_value)
+        if not success:
+            raise LockAcquisitionException('Unable to acquire lock, so -= operation failed')
+        return self
@@ -3,79 +3,147 @@
 # An implementation of a thread-safe number in Python
 #
 
+import operator
 import threading
-from lock_acquisition_exception import LockAcquisitionException
+from .instrumented_lock import InstrumentedLock
+from .lock_acquisition_exception import LockAcquisitionException
+from .lock_utils import acquire_lock, _now
+from .sequence_lock import SequenceLock, OPTIMISTIC_READ_ATTEMPTS
 
+#
+# Module-level operators and checks used by `SynchronizedNumber._operate`. They are created once at
+# import time, so the common operations don't build new closures on every call.
+#
+
+_add = operator.add
+_sub = operator.sub
+_mul = operator.mul
+_div = getattr(operator, 'div', operator.truediv)
+
+
+def _replace(current_value, new_value):
+    return new_value
+
+
+def _apply(current_value, unary_operator):
+    return unary_operator(current_value)
+
+
+def _satisfies(current_value, satisfaction_condition):
+    return satisfaction_condition(current_value)
 
-class SynchronizedNumber:
+
+class _Waiter(object):
+    """
+    A thread blocked in one of the `*_when_*` methods or in `wait_until`, waiting for
+    `check(value, check_arg)` to become True. Exclusive waiters intend to change the value once
+    they wake, so only one of them is woken at a time. A waiter is woken by calling `event.set()`,
+    so coroutines can wait by passing an `event` that schedules them on their event loop instead.
+    """
+    __slots__ = ('check', 'check_arg', 'exclusive', 'event')
+
+    def __init__(self, check, check_arg, exclusive, event=None):
+        self.check = check
+        self.check_arg = check_arg
+        self.exclusive = exclusive
+        self.event = threading.Event() if event is None else event
+
+
+class SynchronizedNumber(object):
     """
     An implementation of a threadsafe, synchronized number in Python
+
+    By default every operation waits as long as it takes to acquire the lock. If
+    `should_block_thread` is False, operations fail straight away when the lock is taken. If
+    `timeout` is set, operations wait at most `timeout` seconds for the lock instead, whatever
+    `should_block_thread` says. Each mutating method also takes a `timeout` argument that overrides
+    the default for that call; a per-call timeout of -1 waits forever.
+
+    If `instrument` is True, the lock records how often it is acquired, how long threads wait for
+    it and hold it, and how many operations are rejected by their condition; see `stats()`. With
+    instrumentation off (the default) none of this bookkeeping is done.
+
+    If `optimistic_reads` is True, the number is optimized for being read far more often than it
+    is written: `get()`, `==` and `str()` read the value without acquiring the lock, checking a
+    sequence counter that writers bump instead, so readers don't contend with each other or with
+    writers. Writes cost slightly more.
     """
 
-    def __init__(self, initial_value, should_block_thread=True):
+    __slots__ = ('should_block_thread', 'timeout', 'value', '_lock', '_waiters', '_instrumented',
+                 '_optimistic_reads')
+
+    def __init__(self, initial_value, should_block_thread=True, timeout=None, instrument=False,
+                 optimistic_reads=False):
         self.should_block_thread = should_block_thread
+        self.timeout = timeout
         self._lock = threading.Lock()
+        self._instrumented = instrument
+        self._optimistic_reads = optimistic_reads
+        if instrument:
+            self._lock = InstrumentedLock(self._lock)
+        if optimistic_reads:
+            self._lock = SequenceLock(self._lock)
+        self._waiters = []
         self.value = 0
         self.set_value(initial_value)
 
-    def set_value(self, new_value):
+    def set_value(self, new_value, timeout=None):
         """
         Sets the value of this number.
 
         :param: new_value - The value to set
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
         :return: True if value is successfully set, False if not.
         """
-        return self.operate_if_satisfies_condition(lambda x: new_value, lambda x: True)
+        return self._operate(_replace, new_value, timeout=timeout)
 
-    def increment(self, incr_value):
+    def increment(self, incr_value, timeout=None):
         """
         Increments the value of this number.
 
         :param: incr_value - The value to increment by
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
         :return: True if value is incremented successfully, False if not.
         """
-        return self.increment_if_satisfies_condition(incr_value, lambda x: True)
+        return self._operate(_add, incr_value, timeout=timeout)
 
-    def decrement(self, decr_value):
+    def decrement(self, decr_value, timeout=None):
         """
         Decrements the value of this number.
 
         :param: decr_value - The value to decremented by
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
         :return: True if value is decremented successfully, False if not.
         """
-        return self.increment(-decr_value)
+        return self._operate(_sub, decr_value, timeout=timeout)
 
-    def increment_if_less_than(self, incr_value, limit, eq_ok=False):
+    def increment_if_less_than(self, incr_value, limit, eq_ok=False, timeout=None):
         """
         Increments the value of this number only if this number is less than `limit`.
 
         :param: incr_value - The value to increment by
         :param: eq_ok [optional] - If set to True, the function also allows incrementation if this
                                    number was equal to the `limit`
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
         :return: True if value is incremented successfully, False if not.
         """
+        return self._operate(_add, incr_value, operator.le if eq_ok else operator.lt, limit,
+                             timeout=timeout)
 
-        def does_satisfy(val):
-            return val < limit or (eq_ok and val == limit)
-
-        return self.increment_if_satisfies_condition(incr_value, does_satisfy)
-
-    def decrement_if_greater_than(self, decr_value, limit, eq_ok=False):
+    def decrement_if_greater_than(self, decr_value, limit, eq_ok=False, timeout=None):
         """
         Increments the value of this number only if this number is greater than `limit`.
 
         :param: decr_value - The value to increment by
         :param: eq_ok [optional] - If set to True, the function also allows incrementation if this
                                    number was equal to the `limit`
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
         :return: True if value is incremented successfully, False if not.
         """
+        return self._operate(_sub, decr_value, operator.ge if eq_ok else operator.gt, limit,
+                             timeout=timeout)
 
-        def does_satisfy(val):
-            return val > limit or (eq_ok and val == limit)
-
-        return self.decrement_if_satisfies_condition(decr_value, does_satisfy)
-
-    def increment_if_satisfies_condition(self, incr_value, satisfaction_condition):
+    def increment_if_satisfies_condition(self, incr_value, satisfaction_condition, timeout=None):
         """
         Increments the value of this number only if this number satisfies `satisfaction_condition`.
 
@@ -84,14 +152,12 @@ class SynchronizedNumber:
                                          True if the condition you want is satisfied, and False
                                          otherwise
 
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
         :return: True if value is incremented successfully, False if not.
         """
-        def iadd_operator(val):
-            return val + incr_value
+        return self._operate(_add, incr_value, _satisfies, satisfaction_condition, timeout=timeout)
 
-        return self.operate_if_satisfies_condition(iadd_operator, satisfaction_condition)
-
-    def decrement_if_satisfies_condition(self, decr_value, satisfaction_condition):
+    def decrement_if_satisfies_condition(self, decr_value, satisfaction_condition, timeout=None):
         """
         Decrements the value of this number only if this number satisfies `satisfaction_condition`.
 
@@ -100,11 +166,12 @@ class SynchronizedNumber:
                                          True if the condition you want is satisfied, and False
                                          otherwise
 
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
         :return: True if value is decremented successfully, False if not.
         """
-        return self.increment_if_satisfies_condition(-decr_value, satisfaction_condition)
+        return self._operate(_sub, decr_value, _satisfies, satisfaction_condition, timeout=timeout)
 
-    def imultiply_if_satisfies_condition(self, mul_value, satisfaction_condition):
+    def imultiply_if_satisfies_condition(self, mul_value, satisfaction_condition, timeout=None):
         """
         Multiplies the value of this number by `mul_value` only if this number satisfies
         `satisfaction_condition`. Mutuates this `SynchronizedNumber`; does NOT return a new object.
@@ -114,14 +181,12 @@ class SynchronizedNumber:
                                          True if the condition you want is satisfied, and False
                                          otherwise
 
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
         :return: True if value is multipled successfully, False if not.
         """
-        def imul_operator(val):
-            return val * mul_value
-
-        return self.operate_if_satisfies_condition(imul_operator, satisfaction_condition)
+        return self._operate(_mul, mul_value, _satisfies, satisfaction_condition, timeout=timeout)
 
-    def idivide_if_satisfies_condition(self, div_value, satisfaction_condition):
+    def idivide_if_satisfies_condition(self, div_value, satisfaction_condition, timeout=None):
         """
         Divides the value of this number by `div_value` only if this number satisfies
         `satisfaction_condition`. Mutuates this `SynchronizedNumber`; does NOT return a new object.
@@ -131,14 +196,12 @@ class SynchronizedNumber:
                                          True if the condition you want is satisfied, and False
                                          otherwise
 
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
         :return: True if value is divided successfully, False if not.
         """
-        def idiv_operator(val):
-            return val / div_value
-
-        return self.operate_if_satisfies_condition(idiv_operator, satisfaction_condition)
+        return self._operate(_div, div_value, _satisfies, satisfaction_condition, timeout=timeout)
 
-    def operate_if_satisfies_condition(self, operator, satisfaction_condition):
+    def operate_if_satisfies_condition(self, operator, satisfaction_condition, timeout=None):
         """
         Mutuates the value of this number according the the `operator` function that is passed in,
         only if this number satisfies `satisfaction_condition`. Mutuates this `SynchronizedNumber`;
@@ -150,134 +213,722 @@ class SynchronizedNumber:
                                          True if the condition you want is satisfied, and False
                                          otherwise
 
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
         :return: True if value is multipled successfully, False if not.
         """
-        if self._lock.acquire(self.should_block_thread):
-            try:
-                if satisfaction_condition(self.value):
+        return self._operate(_apply, operator, _satisfies, satisfaction_condition, timeout=timeout)
+
+    #
+    # Atomic functions that return the value, acquiring the lock once. They raise a
+    # `LockAcquisitionException` if the lock cannot be acquired
+    #
+
+    def get(self, timeout=None):
+        """
+        Returns the value of this number, read while holding the lock, so it is never seen part
+        way through a transaction or `apply_many`. With `optimistic_reads`, the value is read
+        without the lock and the read is retried if a writer held the lock meanwhile, so the lock
+        is only taken when reads keep overlapping writes.
+
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
+        :return: The value of this number.
+        """
+        if self._optimistic_reads:
+            lock = self._lock
+            for _ in range(OPTIMISTIC_READ_ATTEMPTS):
+                sequence = lock.sequence
+                if not sequence & 1:
+                    value = self.value
+                    if lock.sequence == sequence:
+                        return value
+
+        if not self._acquire(timeout):
+            raise self._lock_failure('get', timeout)
+        try:
+            return self.value
+        finally:
+            self._lock.release()
+
+    def get_and_add(self, incr_value, timeout=None):
+        """
+        Increments the value of this number by `incr_value`.
+
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
+        :return: The value before it was incremented.
+        """
+        return self._exchange(_add, incr_value, 'get_and_add', False, timeout)
+
+    def add_and_get(self, incr_value, timeout=None):
+        """
+        Increments the value of this number by `incr_value`.
+
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
+        :return: The value after it was incremented.
+        """
+        return self._exchange(_add, incr_value, 'add_and_get', True, timeout)
+
+    def get_and_set(self, new_value, timeout=None):
+        """
+        Sets the value of this number to `new_value`.
+
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
+        :return: The value before it was set.
+        """
+        return self._exchange(_replace, new_value, 'get_and_set', False, timeout)
+
+    def update_and_get(self, operator, timeout=None):
+        """
+        Sets the value of this number to `operator(value)`.
+
+        :param: operator - A function that takes in the current value and returns the new value
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
+        :return: The value after it was updated.
+        """
+        return self._exchange(_apply, operator, 'update_and_get', True, timeout)
+
+    def compare_and_set(self, expected_value, new_value, timeout=None):
+        """
+        Sets the value of this number to `new_value` only if it is equal to `expected_value`.
+
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
+        :return: True if the value was set, False if it was not equal to `expected_value`.
+        """
+        if not self._acquire(timeout):
+            raise self._lock_failure('compare_and_set', timeout)
+        try:
+            if self.value != expected_value:
+                if self._instrumented:
+                    self._lock.record_rejection()
+                return False
+            self.value = new_value
+            if self._waiters:
+                self._notify_waiters()
+            return True
+        finally:
+            self._lock.release()
+
+    #
+    # Blocking functions that wait until their condition is satisfied
+    #
+
+    def wait_until(self, satisfaction_condition, timeout=None):
+        """
+        Blocks until the value of this number satisfies `satisfaction_condition`, without polling.
+        The condition is re-checked only after changes to this number made from this process.
+
+        :param: satisfaction_condition - A function that takes in the current value and returns
+                                         True if the condition you want is satisfied, and False
+                                         otherwise
+        :param: timeout [optional] - The maximum number of seconds to wait. Waits forever if None.
+
+        :return: True if the condition was satisfied, False if the timeout expired first.
+        """
+        return self._operate_when(None, None, _satisfies, satisfaction_condition, timeout)
+
+    def increment_when_less_than(self, incr_value, limit, eq_ok=False, timeout=None):
+        """
+        Blocking version of `increment_if_less_than`. Waits until this number is less than `limit`
+        (or equal to it, if `eq_ok` is True) and then increments it by `incr_value`.
+
+        :param: timeout [optional] - The maximum number of seconds to wait. Waits forever if None.
+        :return: True if value is incremented successfully, False if the timeout expired first.
+        """
+        return self._operate_when(_add, incr_value, operator.le if eq_ok else operator.lt, limit,
+                                  timeout)
+
+    def decrement_when_greater_than(self, decr_value, limit, eq_ok=False, timeout=None):
+        """
+        Blocking version of `decrement_if_greater_than`. Waits until this number is greater than
+        `limit` (or equal to it, if `eq_ok` is True) and then decrements it by `decr_value`.
+
+        :param: timeout [optional] - The maximum number of seconds to wait. Waits forever if None.
+        :return: True if value is decremented successfully, False if the timeout expired first.
+        """
+        return self._operate_when(_sub, decr_value, operator.ge if eq_ok else operator.gt, limit,
+                                  timeout)
+
+    def increment_when_satisfies_condition(self, incr_value, satisfaction_condition,
+                                           timeout=None):
+        """
+        Blocking version of `increment_if_satisfies_condition`.
+
+        :param: timeout [optional] - The maximum number of seconds to wait. Waits forever if None.
+        :return: True if value is incremented successfully, False if the timeout expired first.
+        """
+        return self._operate_when(_add, incr_value, _satisfies, satisfaction_condition, timeout)
+
+    def decrement_when_satisfies_condition(self, decr_value, satisfaction_condition,
+                                           timeout=None):
+        """
+        Blocking version of `decrement_if_satisfies_condition`.
+
+        :param: timeout [optional] - The maximum number of seconds to wait. Waits forever if None.
+        :return: True if value is decremented successfully, False if the timeout expired first.
+        """
+        return self._operate_when(_sub, decr_value, _satisfies, satisfaction_condition, timeout)
+
+    def operate_when_satisfies_condition(self, operator, satisfaction_condition, timeout=None):
+        """
+        Blocking version of `operate_if_satisfies_condition`.
+
+        :param: timeout [optional] - The maximum number of seconds to wait. Waits forever if None.
+        :return: True if value is changed successfully, False if the timeout expired first.
+        """
+        return self._operate_when(_apply, operator, _satisfies, satisfaction_condition, timeout)
+
+    def apply_many(self, operations, timeout=None):
+        """
+        Applies a sequence of operations while holding the lock once. Each operation is an
+        `(operator, satisfaction_condition)` pair, as for `operate_if_satisfies_condition`; the
+        condition may be None to apply the operator unconditionally. Each condition sees the value
+        left by the operations before it. If any operator or condition raises, the value is rolled
+        back to what it was before the first operation and the exception is re-raised.
+
+        :param: operations - An iterable of `(operator, satisfaction_condition)` pairs
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
+
+        :return: A list with one bool per operation that is True if that operation was applied,
+                 or None if the lock could not be acquired.
+        """
+        if not self._acquire(timeout):
+            return None
+
+        original_value = self.value
+        try:
+            results = []
+            for operator, satisfaction_condition in operations:
+                if satisfaction_condition is None or satisfaction_condition(self.value):
                     self.value = operator(self.value)
+                    results.append(True)
+                else:
+                    if self._instrumented:
+                        self._lock.record_rejection()
+                    results.append(False)
+            if self._waiters and True in results:
+                self._notify_waiters()
+            return results
+        except BaseException:
+            self.value = original_value
+            raise
+        finally:
+            self._lock.release()
+
+    def transaction(self, timeout=None):
+        """
+        Returns a context manager that holds the lock of this number for the duration of a `with`
+        block, so that several operations are applied as one atomic step:
+
+            with sync_num.transaction() as tx:
+                tx.increment(5)
+                tx.decrement_if_greater_than(2, 0)
+
+        If the block raises, the value is rolled back to what it was when the block was entered.
+        The success of each operation is recorded, in order, in `tx.results`.
+
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
+        :return: A `SynchronizedNumberTransaction` for this number. Entering it raises a
+                 `LockAcquisitionException` if the lock cannot be acquired.
+        """
+        return SynchronizedNumberTransaction(self, timeout)
+
+    def stats(self):
+        """
+        Returns the lock statistics of this number, if it was created with `instrument=True`.
+
+        :return: A `LockStats` snapshot with the number of acquisitions and failed acquisitions,
+                 the total time spent waiting for and holding the lock, the longest single hold
+                 and the number of operations rejected by their condition; or None if this
+                 number is not instrumented.
+        """
+        return self._lock.stats() if self._instrumented else None
+
+    def reset_stats(self):
+        """
+        Resets the lock statistics of this number to zero, if it is instrumented.
+        """
+        if self._instrumented:
+            self._lock.reset_stats()
+
+    def _operate(self, binary_operator, operand, check=None, check_arg=None, timeout=None):
+        """
+        The single place, outside of transactions, where the value of this number is changed.
+        Sets the value to `binary_operator(value, operand)` if `check` is None or
+        `check(value, check_arg)` is True. Callers pass module-level functions here rather than
+        closures, so no objects are created per call and the lock is acquired exactly once.
+
+        :return: True if the value was changed, False if the lock could not be acquired or the
+                 check failed.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        if timeout is None:
+            acquired = self._lock.acquire(self.should_block_thread)
+        else:
+            acquired = acquire_lock(self._lock, timeout)
+
+        if acquired:
+            try:
+                if check is None or check(self.value, check_arg):
+                    self.value = binary_operator(self.value, operand)
+                    if self._waiters:
+                        self._notify_waiters()
                     return True
                 else:
+                    if self._instrumented:
+                        self._lock.record_rejection()
                     return False
             finally:
                 self._lock.release()
 
         return False
 
+    def _exchange(self, binary_operator, operand, operation, return_new, timeout=None):
+        """
+        Sets the value to `binary_operator(value, operand)`, as `_operate` does without a check,
+        and returns the value from before the change, or after it if `return_new` is True.
+        `operation` names the caller in the exception raised if the lock cannot be acquired.
+        """
+        if not self._acquire(timeout):
+            raise self._lock_failure(operation, timeout)
+        try:
+            old_value = self.value
+            self.value = binary_operator(old_value, operand)
+            if self._waiters:
+                self._notify_waiters()
+            # Read the value back, as a subclass may store it converted
+            return self.value if return_new else old_value
+        finally:
+            self._lock.release()
+
+    def _acquire(self, timeout=None):
+        """
+        Acquires the lock of this number, honouring `should_block_thread` and the default timeout
+        unless a `timeout` is given.
+
+        :return: True if the lock was acquired, False if not.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        if timeout is None:
+            return self._lock.acquire(self.should_block_thread)
+        return acquire_lock(self._lock, timeout)
+
+    def _lock_failure(self, operation, timeout=None):
+        """
+        Builds the `LockAcquisitionException` raised when `operation` could not get the lock.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        if timeout is None:
+            waited = None if self.should_block_thread else 0
+        else:
+            waited = max(timeout, 0)
+        return LockAcquisitionException(
+            'Unable to acquire lock, so {0} failed'.format(operation), waited=waited)
+
+    def _operate_when(self, binary_operator, operand, check, check_arg, timeout):
+        """
+        The blocking counterpart of `_operate`. Waits until `check(value, check_arg)` is True and
+        then applies `binary_operator`, or only waits if `binary_operator` is None.
+
+        :return: True once the value was changed (or the check was satisfied), False if `timeout`
+                 seconds passed first.
+        """
+        deadline = None if timeout is None else _now() + timeout
+        exclusive = binary_operator is not None
+        woken = False
+
+        while True:
+            remaining = -1 if deadline is None else max(deadline - _now(), 0)
+            if not acquire_lock(self._lock, remaining):
+                if woken and exclusive:
+                    # We were woken but timed out before we could act on it. Pass the wake-up on
+                    # to another waiter, or it would sleep although the value satisfies it
+                    self._lock.acquire()
+                    try:
+                        if self._waiters:
+                            self._notify_waiters()
+                    finally:
+                        self._lock.release()
+                return False
+            try:
+                if check(self.value, check_arg):
+                    if exclusive:
+                        self.value = binary_operator(self.value, operand)
+                        if self._waiters:
+                            self._notify_waiters()
+                    return True
+
+                waiter = _Waiter(check, check_arg, exclusive)
+                self._add_waiter(waiter)
+            finally:
+                self._lock.release()
+
+            remaining = None if deadline is None else max(deadline - _now(), 0)
+            if waiter.event.wait(remaining):
+                woken = True
+                continue
+
+            self._lock.acquire()
+            try:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    return False
+                # We were woken just as we timed out. Pass the wake-up on to another waiter
+                if self._waiters:
+                    self._notify_waiters()
+            finally:
+                self._lock.release()
+            return False
+
+    def _add_waiter(self, waiter):
+        """
+        Registers `waiter`. Must be called with the lock held. `_waiters` may be an empty tuple,
+        which compact numbers share instead of each holding an empty list.
+        """
+        if self._waiters:
+            self._waiters.append(waiter)
+        else:
+            self._waiters = [waiter]
+
+    def _notify_waiters(self):
+        """
+        Wakes the waiters whose check is satisfied by the current value. Must be called with the
+        lock held. Only the first satisfied exclusive waiter is woken: it changes the value when
+        it runs, which wakes the next one, so a single change doesn't wake every waiter at once.
+        """
+        value = self.value
+        woke_exclusive = False
+        still_waiting = []
+        for waiter in self._waiters:
+            if waiter.exclusive and woke_exclusive:
+                still_waiting.append(waiter)
+                continue
+            try:
+                satisfied = waiter.check(value, waiter.check_arg)
+            except Exception:
+                # Let the waiting thread re-run the check and see the exception itself
+                satisfied = True
+            if satisfied:
+                waiter.event.set()
+                woke_exclusive = woke_exclusive or waiter.exclusive
+            else:
+                still_waiting.append(waiter)
+        self._waiters = still_waiting
+
     def __str__(self):
-        return str(self.value)
+        return str(self.get())
 
     def __repr__(self):
+        # Read without the lock, so that debuggers and tracebacks can always show the number
         return str(self.value)
 
     def __eq__(self, other):
         if isinstance(other, SynchronizedNumber):
-            return self.value == other.value
-        else:
-            return self.value == other
+            # Read one number at a time, so comparing two numbers never holds both locks
+            other = other.get()
+        elif isinstance(other, NumberSnapshot):
+            other = other.value
+        return self.get() == other
+
+    def snapshot(self, timeout=None):
+        """
+        Returns the value of this number, read with `get()`, as an immutable `NumberSnapshot`.
+
+        :param: timeout [optional] - Seconds to wait for the lock, overriding the default timeout
+        :return: A `NumberSnapshot` of the value.
+        """
+        return NumberSnapshot(self.get(timeout))
 
     #
     # Default functions that modify existing SynchronizedNumber object
     #
 
     def __iadd__(self, other):
-        add_value = other if not isinstance(other, SynchronizedNumber) else other.value
-        success = self.increment(add_value)
+        success = self._operate(_add, _operand(other))
         if not success:
-            raise LockAcquisitionException('Unable to acquire lock, so += operation failed')
+            raise self._lock_failure('+= operation')
         return self
 
     def __isub__(self, other):
-        sub_value = other if not isinstance(other, SynchronizedNumber) else other.value
-        success = self.decrement(sub_value)
+        success = self._operate(_sub, _operand(other))
         if not success:
-            raise LockAcquisitionException('Unable to acquire lock, so -= operation failed')
+            raise self._lock_failure('-= operation')
         return self
 
     def __imul__(self, other):
-        mul_value = other if not isinstance(other, SynchronizedNumber) else other.value
-        success = self.imultiply_if_satisfies_condition(mul_value, lambda x: True)
+        success = self._operate(_mul, _operand(other))
         if not success:
-            raise LockAcquisitionException('Unable to acquire lock, so *= operation failed')
+            raise self._lock_failure('*= operation')
         return self
 
     def __idiv__(self, other):
-        div_value = other if not isinstance(other, SynchronizedNumber) else other.value
-        success = self.idivide_if_satisfies_condition(div_value, lambda x: True)
+        success = self._operate(_div, _operand(other))
         if not success:
-            raise LockAcquisitionException('Unable to acquire lock, so /= operation failed')
+            raise self._lock_failure('/= operation')
         return self
 
+    __itruediv__ = __idiv__
+
     #
-    # Default functions that return a new SynchronizedNumber object
+    # Default functions that return a new NumberSnapshot object. The value of this number is read
+    # without the lock, as with `value`
     #
 
     def __add__(self, other):
-        if isinstance(other, SynchronizedNumber):
-            return SynchronizedNumber(self.value + other.value)
-        else:
-            return SynchronizedNumber(self.value + other)
+        return NumberSnapshot(self.value + _operand(other))
 
     def __sub__(self, other):
-        if isinstance(other, SynchronizedNumber):
-            return SynchronizedNumber(self.value - other.value)
-        else:
-            return SynchronizedNumber(self.value - other)
+        return NumberSnapshot(self.value - _operand(other))
 
     def __mul__(self, other):
-        if isinstance(other, SynchronizedNumber):
-            return SynchronizedNumber(self.value * other.value)
-        else:
-            return SynchronizedNumber(self.value * other)
+        return NumberSnapshot(self.value * _operand(other))
 
     def __div__(self, other):
-        if isinstance(other, SynchronizedNumber):
-            return SynchronizedNumber(self.value / other.value)
-        else:
-            return SynchronizedNumber(self.value / other)
+        return NumberSnapshot(_div(self.value, _operand(other)))
+
+    __truediv__ = __div__
 
     def __neg__(self):
-        return SynchronizedNumber(-self.value)
+        return NumberSnapshot(-self.value)
 
     def __pow__(self, other):
-        if isinstance(other, SynchronizedNumber):
-            return SynchronizedNumber(self.value ** other.value)
-        else:
-            return SynchronizedNumber(self.value ** other)
+        return NumberSnapshot(self.value ** _operand(other))
 
     def __mod__(self, other):
-        if isinstance(other, SynchronizedNumber):
-            return SynchronizedNumber(self.value % other.value)
-        else:
-            return SynchronizedNumber(self.value % other)
+        return NumberSnapshot(self.value % _operand(other))
 
     #
     # Reverse Operations
     #
 
+    def __radd__(self, other):
+        return NumberSnapshot(_operand(other) + self.value)
+
     def __rsub__(self, other):
-        return -self + other
+        return NumberSnapshot(_operand(other) - self.value)
+
+    def __rmul__(self, other):
+        return NumberSnapshot(_operand(other) * self.value)
+
+    def __rdiv__(self, other):
+        return NumberSnapshot(_div(_operand(other), self.value))
+
+    __rtruediv__ = __rdiv__
+
+    def __rpow__(self, other):
+        return NumberSnapshot(_operand(other) ** self.value)
+
+    def __rmod__(self, other):
+        return NumberSnapshot(_operand(other) % self.value)
+
+
+class NumberSnapshot(object):
+    """
+    An immutable number returned by the arithmetic operators of `SynchronizedNumber`, such as
+    `sync_num * 2`. It has no lock, so building one costs one small object, and it supports the
+    same arithmetic (returning new snapshots), comparisons and conversions as a plain number.
+    Call `promote()` to turn it into a `SynchronizedNumber` that can be shared between threads.
+    """
+    __slots__ = ('_value',)
+
+    def __init__(self, value):
+        self._value = value
+
+    @property
+    def value(self):
+        return self._value
+
+    def promote(self, should_block_thread=True, timeout=None, instrument=False,
+                optimistic_reads=False):
+        """
+        :return: A new `SynchronizedNumber` with this value, created with the given options.
+        """
+        return SynchronizedNumber(self._value, should_block_thread, timeout, instrument,
+                                  optimistic_reads)
+
+    def __str__(self):
+        return str(self._value)
+
+    def __repr__(self):
+        return str(self._value)
+
+    def __hash__(self):
+        return hash(self._value)
+
+    def __eq__(self, other):
+        return self._value == _operand(other)
+
+    def __ne__(self, other):
+        return self._value != _operand(other)
+
+    def __lt__(self, other):
+        return self._value < _operand(other)
+
+    def __le__(self, other):
+        return self._value <= _operand(other)
+
+    def __gt__(self, other):
+        return self._value > _operand(other)
+
+    def __ge__(self, other):
+        return self._value >= _operand(other)
+
+    def __bool__(self):
+        return bool(self._value)
+
+    __nonzero__ = __bool__
+
+    def __int__(self):
+        return int(self._value)
+
+    def __float__(self):
+        return float(self._value)
+
+    def __abs__(self):
+        return NumberSnapshot(abs(self._value))
+
+    def __neg__(self):
+        return NumberSnapshot(-self._value)
+
+    def __add__(self, other):
+        return NumberSnapshot(self._value + _operand(other))
+
+    def __sub__(self, other):
+        return NumberSnapshot(self._value - _operand(other))
+
+    def __mul__(self, other):
+        return NumberSnapshot(self._value * _operand(other))
+
+    def __div__(self, other):
+        return NumberSnapshot(_div(self._value, _operand(other)))
+
+    __truediv__ = __div__
+
+    def __pow__(self, other):
+        return NumberSnapshot(self._value ** _operand(other))
+
+    def __mod__(self, other):
+        return NumberSnapshot(self._value % _operand(other))
 
     def __radd__(self, other):
-        return self + other
+        return NumberSnapshot(_operand(other) + self._value)
+
+    def __rsub__(self, other):
+        return NumberSnapshot(_operand(other) - self._value)
 
     def __rmul__(self, other):
-        return self * other
+        return NumberSnapshot(_operand(other) * self._value)
 
     def __rdiv__(self, other):
-        if isinstance(other, SynchronizedNumber):
-            return SynchronizedNumber(other.value / self.value)
-        else:
-            return SynchronizedNumber(other / self.value)
+        return NumberSnapshot(_div(_operand(other), self._value))
+
+    __rtruediv__ = __rdiv__
 
     def __rpow__(self, other):
-        if isinstance(other, SynchronizedNumber):
-            return SynchronizedNumber(other.value ** self.value)
-        else:
-            return SynchronizedNumber(other ** self.value)
+        return NumberSnapshot(_operand(other) ** self._value)
 
     def __rmod__(self, other):
-        if isinstance(other, SynchronizedNumber):
-            return SynchronizedNumber(other.value % self.value)
-        else:
-            return SynchronizedNumber(other % self.value)
+        return NumberSnapshot(_operand(other) % self._value)
+
+
+def _operand(other):
+    """
+    :return: The value of `other` if it is a `SynchronizedNumber` or `NumberSnapshot`, read
+             without the lock, or `other` itself.
+    """
+    if isinstance(other, (SynchronizedNumber, NumberSnapshot)):
+        return other.value
+    return other
+
+
+class SynchronizedNumberTransaction:
+    """
+    A batch of operations on a `SynchronizedNumber` that are applied while holding its lock once.
+    Create one with `SynchronizedNumber.transaction()`; the operations can only be used inside the
+    `with` block.
+    """
+
+    def __init__(self, number, timeout=None):
+        self._number = number
+        self._timeout = timeout
+        self._original_value = None
+        self._active = False
+        self.results = []
+
+    def __enter__(self):
+        if not self._number._acquire(self._timeout):
+            raise self._number._lock_failure('the transaction', self._timeout)
+        self._begin()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._end(rollback=exc_type is not None)
+        self._number._lock.release()
+        return False
+
+    def _begin(self):
+        # The caller must already hold the number's lock
+        self._original_value = self._number.value
+        self._active = True
+
+    def _end(self, rollback):
+        self._active = False
+        if rollback:
+            self._number.value = self._original_value
+        elif self._number._waiters and True in self.results:
+            self._number._notify_waiters()
+
+    @property
+    def value(self):
+        """
+        The current value of the number, including the operations applied so far.
+        """
+        return self._number.value
+
+    def set_value(self, new_value):
+        return self._operate(_replace, new_value)
+
+    def increment(self, incr_value):
+        return self._operate(_add, incr_value)
+
+    def decrement(self, decr_value):
+        return self._operate(_sub, decr_value)
+
+    def increment_if_less_than(self, incr_value, limit, eq_ok=False):
+        return self._operate(_add, incr_value, operator.le if eq_ok else operator.lt, limit)
+
+    def decrement_if_greater_than(self, decr_value, limit, eq_ok=False):
+        return self._operate(_sub, decr_value, operator.ge if eq_ok else operator.gt, limit)
+
+    def increment_if_satisfies_condition(self, incr_value, satisfaction_condition):
+        return self._operate(_add, incr_value, _satisfies, satisfaction_condition)
+
+    def decrement_if_satisfies_condition(self, decr_value, satisfaction_condition):
+        return self._operate(_sub, decr_value, _satisfies, satisfaction_condition)
+
+    def imultiply_if_satisfies_condition(self, mul_value, satisfaction_condition):
+        return self._operate(_mul, mul_value, _satisfies, satisfaction_condition)
+
+    def idivide_if_satisfies_condition(self, div_value, satisfaction_condition):
+        return self._operate(_div, div_value, _satisfies, satisfaction_condition)
+
+    def operate_if_satisfies_condition(self, operator, satisfaction_condition):
+        return self._operate(_apply, operator, _satisfies, satisfaction_condition)
+
+    def _operate(self, binary_operator, operand, check=None, check_arg=None):
+        """
+        The transactional counterpart of `SynchronizedNumber._operate`. The lock is already held,
+        so this only checks, applies and records the result.
+        """
+        if not self._active:
+            raise RuntimeError('Transaction operations can only be used inside the with block')
+
+        number = self._number
+        success = check is None or bool(check(number.value, check_arg))
+        if success:
+            number.value = binary_operator(number.value, operand)
+        elif number._instrumented:
+            number._lock.record_rejection()
+        self.results.append(success)
+        return success
@@ -0,0 +1,245 @@
+#
+# synchronized_number_array.py
+# A fixed-size array of threadsafe numbers stored in one contiguous buffer
+#
+
+import array
+import numbers
+import threading
+from .sequence_lock import SequenceLock, read_optimistically
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# The typecodes of `array.array` that hold integers, and so only accept integer amounts
+_INTEGER_TYPECODES = frozenset('bBhHiIlLqQ')
+
+
+class SynchronizedNumberArray(object):
+    """
+    A fixed-size array of threadsafe numbers. The values live in one contiguous `array.array`
+    buffer and are guarded by `num_stripes` locks, with element `i` guarded by lock
+    `i % num_stripes`. This takes far less memory than a list of `SynchronizedNumber` objects, and
+    bulk operations acquire each lock they need only once.
+
+    Indices must be non-negative. Bulk operations take either a single index or a sequence of
+    indices, and either a single amount applied to every index or a sequence of amounts of the
+    same length. Arrays of an integer typecode only accept integer amounts, and raise a
+    `TypeError` before changing anything otherwise.
+
+    If `optimistic_reads` is True, `snapshot` copies the values without acquiring any lock, and
+    retries if an update was in progress, so frequent snapshots don't stall writers.
+    """
+
+    def __init__(self, size, initial_value=0, typecode='d', num_stripes=16,
+                 should_block_thread=True, optimistic_reads=False):
+        if num_stripes < 1:
+            raise ValueError('num_stripes must be at least 1, not {0}'.format(num_stripes))
+
+        self.should_block_thread = should_block_thread
+        self.optimistic_reads = optimistic_reads
+        self._values = array.array(typecode, [initial_value]) * size
+        self._num_stripes = num_stripes
+        self._locks = [threading.Lock() for _ in range(num_stripes)]
+        if optimistic_reads:
+            self._locks = [SequenceLock(lock) for lock in self._locks]
+        self._view = numpy.frombuffer(self._values, dtype=typecode) if numpy and size else None
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, index):
+        return self._values[index]
+
+    @property
+    def typecode(self):
+        return self._values.typecode
+
+    def set_value(self, index, new_value):
+        """
+        Sets the value of the number at `index`.
+
+        :param: index - The index of the number to set
+        :param: new_value - The value to set
+        :return: True if value is successfully set, False if not.
+        """
+        lock = self._locks[self._check_index(index) % self._num_stripes]
+        if lock.acquire(self.should_block_thread):
+            try:
+                self._values[index] = new_value
+                return True
+            finally:
+                lock.release()
+        return False
+
+    def increment(self, indices, amounts):
+        """
+        Increments the numbers at `indices` by `amounts`. All of the updates are applied while
+        holding every lock they need, so other threads see either none or all of them. Repeated
+        indices are incremented once per occurrence.
+
+        :param: indices - An index, or a sequence of indices, of the numbers to increment
+        :param: amounts - The value to increment by, or a sequence of values, one per index
+        :return: True if the values are incremented successfully, False if not.
+        """
+        indices, amounts = self._normalize(indices, amounts)
+        locks = self._locks_for(indices)
+        if not self._acquire(locks):
+            return False
+        try:
+            if self._view is not None and len(indices) > 1:
+                # A tuple of indices would be taken as one multi-dimensional index
+                numpy.add.at(self._view, numpy.asarray(indices, dtype=numpy.intp), amounts)
+            else:
+                values = self._values
+                for index, amount in zip(indices, amounts):
+                    values[index] += amount
+            return True
+        finally:
+            self._release(locks)
+
+    def decrement(self, indices, amounts):
+        """
+        Decrements the numbers at `indices` by `amounts`. See `increment`.
+
+        :return: True if the values are decremented successfully, False if not.
+        """
+        indices, amounts = self._normalize(indices, amounts)
+        return self.increment(indices, [-amount for amount in amounts])
+
+    def increment_if_less_than(self, indices, amounts, limit, eq_ok=False):
+        """
+        Increments each number at `indices` by its amount only if that number is less than
+        `limit`, or equal to it when `eq_ok` is True. Updates are applied in order while holding
+        every lock they need, so a repeated index sees the result of its earlier updates.
+
+        :param: indices - An index, or a sequence of indices, of the numbers to increment
+        :param: amounts - The value to increment by, or a sequence of values, one per index
+        :param: limit - The value each number must be below to be incremented
+        :param: eq_ok [optional] - If set to True, numbers equal to `limit` are also incremented
+        :return: A list with one bool per index that is True if that number was incremented, or
+                 None if the locks could not be acquired.
+        """
+        indices, amounts = self._normalize(indices, amounts)
+        locks = self._locks_for(indices)
+        if not self._acquire(locks):
+            return None
+        try:
+            values = self._values
+            results = []
+            for index, amount in zip(indices, amounts):
+                value = values[index]
+                if value < limit or (eq_ok and value == limit):
+                    values[index] = value + amount
+                    results.append(True)
+                else:
+                    results.append(False)
+            return results
+        finally:
+            self._release(locks)
+
+    def decrement_if_greater_than(self, indices, amounts, limit, eq_ok=False):
+        """
+        Decrements each number at `indices` by its amount only if that number is greater than
+        `limit`, or equal to it when `eq_ok` is True. See `increment_if_less_than`.
+
+        :return: A list with one bool per index that is True if that number was decremented, or
+                 None if the locks could not be acquired.
+        """
+        indices, amounts = self._normalize(indices, amounts)
+        locks = self._locks_for(indices)
+        if not self._acquire(locks):
+            return None
+        try:
+            values = self._values
+            results = []
+            for index, amount in zip(indices, amounts):
+                value = values[index]
+                if value > limit or (eq_ok and value == limit):
+                    values[index] = value - amount
+                    results.append(True)
+                else:
+                    results.append(False)
+            return results
+        finally:
+            self._release(locks)
+
+    def snapshot(self):
+        """
+        Returns a copy of all the values, taken while holding every lock so that no bulk update
+        is half-applied in it. With `optimistic_reads`, the copy is taken without the locks, and
+        they are only acquired if every attempt overlapped an update.
+
+        :return: An `array.array` with the same typecode as this array, or None if the locks could
+                 not be acquired.
+        """
+        if self.optimistic_reads:
+            values = read_optimistically(self._locks, self._values.__copy__)
+            if values is not None:
+                return values[0]
+
+        if not self._acquire(self._locks):
+            return None
+        try:
+            return self._values[:]
+        finally:
+            self._release(self._locks)
+
+    def numpy_snapshot(self):
+        """
+        Same as `snapshot`, but returns a NumPy array. Requires NumPy to be installed.
+
+        :return: A NumPy array of the values, or None if the locks could not be acquired.
+        """
+        if numpy is None:
+            raise ImportError('numpy_snapshot requires NumPy to be installed')
+
+        values = self.snapshot()
+        return None if values is None else numpy.frombuffer(values, dtype=values.typecode)
+
+    #
+    # Helpers
+    #
+
+    def _check_index(self, index):
+        if not 0 <= index < len(self._values):
+            raise IndexError('SynchronizedNumberArray index {0} out of range'.format(index))
+        return index
+
+    def _normalize(self, indices, amounts):
+        if isinstance(indices, numbers.Integral):
+            indices = [indices]
+        if isinstance(amounts, numbers.Number):
+            amounts = [amounts] * len(indices)
+        elif len(amounts) != len(indices):
+            raise ValueError('Got {0} indices but {1} amounts'.format(len(indices), len(amounts)))
+        if self._values.typecode in _INTEGER_TYPECODES:
+            for amount in amounts:
+                if not isinstance(amount, numbers.Integral):
+                    raise TypeError('An array of typecode {0!r} needs integer amounts, not {1!r}'
+                                    .format(self._values.typecode, amount))
+        return indices, amounts
+
+    def _locks_for(self, indices):
+        # Locks are returned in stripe order, so threads acquiring overlapping sets can't deadlock
+        num_stripes = self._num_stripes
+        if len(indices) == 1:
+            return [self._locks[self._check_index(indices[0]) % num_stripes]]
+
+        stripes = set()
+        for index in indices:
+            stripes.add(self._check_index(index) % num_stripes)
+        return [self._locks[stripe] for stripe in sorted(stripes)]
+
+    def _acquire(self, locks):
+        for i, lock in enumerate(locks):
+            if not lock.acquire(self.should_block_thread):
+                self._release(locks[:i])
+                return False
+        return True
+
+    def _release(self, locks):
+        for lock in locks:
+            lock.release()
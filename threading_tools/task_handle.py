@@ -0,0 +1,105 @@
+#
+# task_handle.py
+# A future-like handle to a function call running on another thread or process
+#
+
+import threading
+import traceback
+from .task_timeout_exception import TaskTimeoutException
+
+
+class TaskHandle(object):
+    """
+    A handle to a function call that was dispatched to run elsewhere, such as on a worker pool.
+    It can be used to wait for the call to finish and to collect its return value or exception.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self._result = None
+        self._exception = None
+
+    def done(self):
+        """
+        :return: True if the call has finished, successfully or not.
+        """
+        return self._event.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Waits for the call to finish.
+
+        :param: timeout [optional] - The maximum number of seconds to wait. Waits forever if None.
+        :return: True if the call has finished, False if the timeout expired first.
+        """
+        return self._event.wait(timeout)
+
+    def result(self, timeout=None):
+        """
+        Waits for the call to finish and returns its return value. If the call raised an
+        exception, that exception is raised here.
+
+        :param: timeout [optional] - The maximum number of seconds to wait. Waits forever if None.
+        :return: The return value of the call.
+        """
+        if not self._event.wait(timeout):
+            raise TaskTimeoutException('The task did not finish within {0}s'.format(timeout))
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def exception(self, timeout=None):
+        """
+        Waits for the call to finish and returns the exception it raised.
+
+        :param: timeout [optional] - The maximum number of seconds to wait. Waits forever if None.
+        :return: The exception raised by the call, or None if it returned normally.
+        """
+        if not self._event.wait(timeout):
+            raise TaskTimeoutException('The task did not finish within {0}s'.format(timeout))
+        return self._exception
+
+    def add_done_callback(self, callback):
+        """
+        Arranges for `callback(handle)` to be called once the call finishes. If it has already
+        finished, `callback` is called straight away on the calling thread; otherwise it is called
+        on the thread that completes the call.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def _set_result(self, result):
+        self._result = result
+        self._finish()
+
+    def _set_exception(self, exception):
+        self._exception = exception
+        self._finish()
+
+    def _finish(self):
+        with self._lock:
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:
+                # A failing callback must not stop the others or kill the worker that ran the task,
+                # so report it the way an uncaught exception in a thread is reported
+                traceback.print_exc()
+
+    def _run(self, func, args, kwargs):
+        """
+        Calls `func(*args, **kwargs)` and records its outcome on this handle.
+        """
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self._set_exception(e)
+        else:
+            self._set_result(result)
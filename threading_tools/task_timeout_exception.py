@@ -0,0 +1,10 @@
+#
+# task_timeout_exception.py
+#
+
+
+class TaskTimeoutException(Exception):
+    """
+    Raised when waiting for the result of a task takes longer than the given timeout.
+    """
+    pass
@@ -0,0 +1,121 @@
+#
+# thread_pool.py
+# A bounded pool of reusable worker threads, and a registry of named pools shared by decorators
+#
+
+import atexit
+import multiprocessing
+import threading
+from .task_handle import TaskHandle
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+def default_pool_size():
+    try:
+        return min(32, multiprocessing.cpu_count() + 4)
+    except NotImplementedError:
+        return 8
+
+
+class ThreadPool(object):
+    """
+    A pool of at most `size` worker threads that run submitted calls one after another. Workers
+    are started only when a call is submitted and no worker is idle, so a pool that is rarely
+    busy stays small. Workers are daemon threads; pools are shut down, after finishing their
+    queued calls, when the interpreter exits.
+    """
+
+    def __init__(self, size=None, name=None):
+        if size is None:
+            size = default_pool_size()
+        if size < 1:
+            raise ValueError('size must be at least 1, not {0}'.format(size))
+
+        self.size = size
+        self.name = name
+        self._tasks = queue.Queue()
+        self._threads = []
+        self._idle = threading.Semaphore(0)
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Queues `func(*args, **kwargs)` to run on a worker thread.
+
+        :return: A `TaskHandle` for the call.
+        """
+        handle = TaskHandle()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError('Cannot submit to a ThreadPool that has been shut down')
+            self._tasks.put((handle, func, args, kwargs))
+            if not self._idle.acquire(False) and len(self._threads) < self.size:
+                self._start_worker()
+        return handle
+
+    def shutdown(self, wait=True):
+        """
+        Stops accepting new calls. Calls that are already queued still run.
+
+        :param: wait [optional] - If True, waits for the queued calls to finish and the workers
+                                  to exit
+        """
+        with self._lock:
+            if self._shutdown:
+                threads = []
+            else:
+                self._shutdown = True
+                threads = list(self._threads)
+                for _ in threads:
+                    self._tasks.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _start_worker(self):
+        thread_name = '{0}-worker-{1}'.format(self.name or 'ThreadPool', len(self._threads))
+        thread = threading.Thread(target=self._work, name=thread_name)
+        thread.daemon = True
+        thread.start()
+        self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            handle, func, args, kwargs = task
+            handle._run(func, args, kwargs)
+            del task, handle, func, args, kwargs
+            self._idle.release()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_thread_pool(name, size=None):
+    """
+    Returns the shared `ThreadPool` called `name`, creating it with `size` workers if it doesn't
+    exist yet. Later calls with the same name return the same pool, whatever `size` they pass.
+    """
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = ThreadPool(size, name)
+        return pool
+
+
+def _shutdown_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.shutdown(wait=True)
+
+
+atexit.register(_shutdown_pools)
@@ -1,24 +1,127 @@
-import threading
-import multiprocessing
+import functools
+from .concurrency_limiter import ConcurrencyLimiter, _start_thread
+from .result_process import ResultProcess
+from .result_thread import ResultThread
+from .shared_memory_arguments import check_available
+from .thread_pool import ThreadPool, get_thread_pool
+from .process_pool import ProcessPool, get_process_pool, _mark_process_dispatcher
+from .work_stealing_pool import WorkStealingPool, get_work_stealing_pool
 
+# The name of the shared pool used for calls with a priority when no pool is given
+DEFAULT_PRIORITY_POOL = 'threaded_fn'
 
-def threaded_fn(func):
+
+def threaded_fn(func=None, pool=None, pool_size=None, max_in_flight=None, overflow='block',
+                queue_size=None, priority=None):
     """
     A decorator for any function that needs to be run on a separate thread
+
+    Used as `@threaded_fn`, every call starts a new thread, and returns it as a `ResultThread`: a
+    `threading.Thread` whose `result()` gives the function's return value.
+
+    Used as `@threaded_fn(pool='name', pool_size=N)`, calls are instead queued onto a shared pool
+    of at most N reusable worker threads, and each call returns a `TaskHandle` whose `result()`
+    gives the function's return value. Decorators that name the same pool share its workers.
+    `pool` may also be a `ThreadPool` instance.
+
+    Used as `@threaded_fn(max_in_flight=N, overflow=...)`, at most N calls run at once, and each
+    call returns a `TaskHandle`. `overflow` decides what happens to calls over the limit: 'block'
+    waits for a running call to finish, 'reject' raises `ConcurrencyLimitExceededException`, and
+    'queue' keeps up to `queue_size` calls waiting. The `ConcurrencyLimiter` is available as the
+    `limiter` attribute of the decorated function.
+
+    Used as `@threaded_fn(priority=N)`, calls are queued onto a shared `WorkStealingPool`, named
+    by `pool` or 'threaded_fn' by default, and run before queued calls with a lower priority.
     """
+    if func is None:
+        return functools.partial(threaded_fn, pool=pool, pool_size=pool_size,
+                                 max_in_flight=max_in_flight, overflow=overflow,
+                                 queue_size=queue_size, priority=priority)
+
+    if priority is not None and not isinstance(pool, WorkStealingPool):
+        if isinstance(pool, ThreadPool):
+            raise ValueError('priority requires a WorkStealingPool, not {0}'.format(pool))
+        pool = get_work_stealing_pool(DEFAULT_PRIORITY_POOL if pool is None else pool, pool_size)
+    elif pool is not None and not isinstance(pool, ThreadPool):
+        pool = get_thread_pool(pool, pool_size)
+
+    submit = None
+    if isinstance(pool, WorkStealingPool):
+        submit = functools.partial(pool.submit_with_priority, priority)
+    elif pool is not None:
+        submit = pool.submit
+
+    if max_in_flight is not None:
+        start = _start_thread if pool is None else submit
+        limiter = ConcurrencyLimiter(max_in_flight, overflow, queue_size, start=start)
+        wrapper = _submitting_wrapper(func, limiter.submit)
+        wrapper.limiter = limiter
+        return wrapper
+
+    if pool is not None:
+        return _pooled_wrapper(func, pool, submit)
+
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        thread = threading.Thread(target=func, args=args, kwargs=kwargs)
+        thread = ResultThread(target=func, args=args, kwargs=kwargs)
         thread.start()
         return thread
     return wrapper
 
 
-def process_fn(func):
+def _pooled_wrapper(func, pool, submit=None):
+    wrapper = _submitting_wrapper(func, pool.submit if submit is None else submit)
+    wrapper.pool = pool
+    return wrapper
+
+
+def _submitting_wrapper(func, submit):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return submit(func, *args, **kwargs)
+    # Set by functools.wraps from Python 3.2
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def process_fn(func=None, pool=None, pool_size=None, start_method=None, preload=None,
+               max_tasks_per_child=None, shared_memory_threshold=None):
     """
     A decorator for any function that needs to be run on a separate process
+
+    Used as `@process_fn`, every call starts a new process, and returns it as a `ResultProcess`:
+    a `multiprocessing.Process` whose `result()` gives the function's return value, which is sent
+    back over a pipe.
+
+    Used as `@process_fn(pool='name', ...)`, calls are instead sent to a shared pool of warm
+    worker processes, and each call returns a `TaskHandle` whose `result()` gives the function's
+    return value. The other options are passed to `ProcessPool` when the named pool is first
+    created. `pool` may also be a `ProcessPool` instance. Pooled functions must be defined at the
+    top level of a module.
+
+    With `shared_memory_threshold=N`, arguments that are NumPy arrays or other buffers of at least
+    N bytes are passed through shared memory rather than pickled, and the function receives
+    views of them (a `memoryview` for buffers other than arrays). Requires Python 3.8+.
     """
+    if func is None:
+        return functools.partial(process_fn, pool=pool, pool_size=pool_size,
+                                 start_method=start_method, preload=preload,
+                                 max_tasks_per_child=max_tasks_per_child,
+                                 shared_memory_threshold=shared_memory_threshold)
+
+    if pool is not None:
+        if not isinstance(pool, ProcessPool):
+            pool = get_process_pool(pool, pool_size, start_method, preload, max_tasks_per_child,
+                                    shared_memory_threshold)
+        return _mark_process_dispatcher(_pooled_wrapper(func, pool), func)
+
+    if shared_memory_threshold is not None:
+        check_available()
+
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        process = multiprocessing.Process(target=func, args=args, kwargs=kwargs)
+        process = ResultProcess(target=func, args=args, kwargs=kwargs,
+                                shared_memory_threshold=shared_memory_threshold)
         process.start()
         return process
-    return wrapper
+    return _mark_process_dispatcher(wrapper, func)
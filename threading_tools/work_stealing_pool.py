@@ -0,0 +1,272 @@
+#
+# work_stealing_pool.py
+# A thread pool that runs calls by priority, with a deque per worker and work stealing
+#
+
+import atexit
+import collections
+import heapq
+import itertools
+import threading
+from .lock_utils import _now
+from .task_handle import TaskHandle
+from .thread_pool import ThreadPool
+
+# The priority of calls submitted without one
+DEFAULT_PRIORITY = 0
+
+# How long `gather` waits for a handle before looking for queued calls to run again
+_HELP_INTERVAL = 0.005
+
+
+class _WorkDeque(object):
+    """
+    The calls queued on one worker, in a deque per priority. The owning worker takes calls from
+    the left, where its own subtasks are pushed, so it runs them newest first. Calls submitted
+    from outside the pool are appended on the right, and other workers steal from the right.
+    """
+    __slots__ = ('lock', 'levels', 'priorities', 'top')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # priority -> deque of (handle, func, args, kwargs, priority)
+        self.levels = {}
+        # A heap of the negated priorities that have a non-empty deque
+        self.priorities = []
+        # The highest priority queued, or None if the deque is empty. Read without the lock by
+        # workers deciding where to look for work, so it is only a hint
+        self.top = None
+
+    def push(self, task, priority, left):
+        level = self.levels.get(priority)
+        if level is None:
+            level = self.levels[priority] = collections.deque()
+            heapq.heappush(self.priorities, -priority)
+        if left:
+            level.appendleft(task)
+        else:
+            level.append(task)
+        self.top = -self.priorities[0]
+
+    def pop(self, left):
+        """
+        :return: The next call of the highest priority, or None if the deque is empty.
+        """
+        if not self.priorities:
+            return None
+        priority = -self.priorities[0]
+        level = self.levels[priority]
+        task = level.popleft() if left else level.pop()
+        if not level:
+            del self.levels[priority]
+            heapq.heappop(self.priorities)
+            self.top = -self.priorities[0] if self.priorities else None
+        return task
+
+
+class WorkStealingPool(ThreadPool):
+    """
+    A pool of `size` worker threads that runs calls in order of priority. Each worker has its own
+    deque of calls. A worker runs the highest priority call it can find, taking it from its own
+    deque, or stealing it from another worker's deque if that holds a more urgent call or its own
+    is empty. Calls submitted from outside the pool are spread over the workers' deques, and calls
+    submitted by a running call (subtasks) go onto the deque of the worker running it, which runs
+    them next unless another worker steals them first.
+
+    A running call is never interrupted, so a high priority call waits at most until a worker
+    finishes the call it is running. Workers are started on the first call; pools are shut down,
+    after finishing their queued calls, when the interpreter exits.
+    """
+
+    def __init__(self, size=None, name=None):
+        ThreadPool.__init__(self, size, name)
+        self._deques = [_WorkDeque() for _ in range(self.size)]
+        self._next_deque = itertools.count()
+        self._local = threading.local()
+        # The number of queued calls, the number of workers waiting for one, and the condition
+        # they wait on. Both counts are only changed while holding `_lock`
+        self._pending = 0
+        self._num_idle = 0
+        self._work_available = threading.Condition(self._lock)
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Queues `func(*args, **kwargs)` to run on a worker thread. Called from a running call, the
+        new call is a subtask with the same priority; otherwise its priority is 0.
+
+        :return: A `TaskHandle` for the call.
+        """
+        return self.submit_with_priority(None, func, *args, **kwargs)
+
+    def submit_with_priority(self, priority, func, *args, **kwargs):
+        """
+        Queues `func(*args, **kwargs)` to run on a worker thread before any queued call with a
+        lower priority. Calls with the same priority submitted from outside the pool run in
+        roughly the order they were submitted.
+
+        :param: priority - A number; higher runs sooner. If None, a subtask takes the priority of
+                           the call that submits it, and other calls take 0
+
+        :return: A `TaskHandle` for the call.
+        """
+        own = getattr(self._local, 'deque', None)
+        if priority is None:
+            priority = DEFAULT_PRIORITY if own is None else self._local.priority
+
+        handle = TaskHandle()
+        task = (handle, func, args, kwargs, priority)
+        target = own
+        if target is None:
+            target = self._deques[next(self._next_deque) % self.size]
+
+        with target.lock:
+            with self._lock:
+                if self._shutdown:
+                    raise RuntimeError('Cannot submit to a ThreadPool that has been shut down')
+                target.push(task, priority, own is not None)
+                self._pending += 1
+                if not self._threads:
+                    for _ in range(self.size):
+                        self._start_worker()
+                elif self._num_idle:
+                    self._work_available.notify()
+        return handle
+
+    def gather(self, handles, timeout=None):
+        """
+        Waits for every handle and returns their results, re-raising the first exception. Called
+        from a running call, e.g. to wait for its subtasks, the worker runs queued calls while it
+        waits instead of sitting idle, so waiting on subtasks can't use up every worker.
+
+        :param: timeout [optional] - The maximum number of seconds to wait. Waits forever if None
+        :return: A list of the results.
+        """
+        deadline = None if timeout is None else _now() + timeout
+        own = getattr(self._local, 'deque', None)
+        results = []
+        for handle in handles:
+            while own is not None and not handle.done():
+                if deadline is not None and _now() >= deadline:
+                    break
+                task = self._take(own)
+                if task is None:
+                    handle.wait(_HELP_INTERVAL)
+                else:
+                    self._run(task)
+            remaining = None if deadline is None else max(0, deadline - _now())
+            results.append(handle.result(remaining))
+        return results
+
+    def shutdown(self, wait=True):
+        """
+        Stops accepting new calls. Calls that are already queued still run.
+
+        :param: wait [optional] - If True, waits for the queued calls to finish and the workers
+                                  to exit
+        """
+        with self._lock:
+            threads = [] if self._shutdown else list(self._threads)
+            self._shutdown = True
+            self._work_available.notify_all()
+        if wait:
+            for thread in threads:
+                if thread is not threading.current_thread():
+                    thread.join()
+
+    def _start_worker(self):
+        index = len(self._threads)
+        thread_name = '{0}-worker-{1}'.format(self.name or 'WorkStealingPool', index)
+        thread = threading.Thread(target=self._work, args=(self._deques[index],),
+                                  name=thread_name)
+        thread.daemon = True
+        thread.start()
+        self._threads.append(thread)
+
+    def _work(self, own):
+        self._local.deque = own
+        while True:
+            task = self._take(own)
+            if task is not None:
+                self._run(task)
+                continue
+            with self._lock:
+                while not self._pending and not self._shutdown:
+                    self._num_idle += 1
+                    self._work_available.wait()
+                    self._num_idle -= 1
+                if not self._pending:
+                    return
+
+    def _run(self, task):
+        handle, func, args, kwargs, priority = task
+        previous = getattr(self._local, 'priority', None)
+        self._local.priority = priority
+        try:
+            handle._run(func, args, kwargs)
+        finally:
+            self._local.priority = previous
+
+    def _take(self, own):
+        """
+        Takes the most urgent call that `own`'s worker should run next: the first call of its own
+        deque, unless another deque holds a call with a higher priority, in which case one is
+        stolen from the far end of that deque.
+
+        :return: The call, or None if every deque is empty.
+        """
+        best = own.top
+        victim = None
+        for work_deque in self._deques:
+            top = work_deque.top
+            if top is not None and (best is None or top > best):
+                best = top
+                victim = work_deque
+
+        if victim is not None:
+            task = self._pop(victim, False)
+            if task is not None:
+                return task
+        task = self._pop(own, True)
+        if task is not None:
+            return task
+        # The hints were stale, so look at every deque under its lock
+        for work_deque in self._deques:
+            task = self._pop(work_deque, False)
+            if task is not None:
+                return task
+        return None
+
+    def _pop(self, work_deque, left):
+        with work_deque.lock:
+            task = work_deque.pop(left)
+            if task is not None:
+                with self._lock:
+                    self._pending -= 1
+        return task
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_work_stealing_pool(name, size=None):
+    """
+    Returns the shared `WorkStealingPool` called `name`, creating it with `size` workers if it
+    doesn't exist yet. Later calls with the same name return the same pool, whatever `size` they
+    pass. The names are separate from those of `get_thread_pool`.
+    """
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = WorkStealingPool(size, name)
+        return pool
+
+
+def _shutdown_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.shutdown(wait=True)
+
+
+atexit.register(_shutdown_pools)